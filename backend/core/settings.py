@@ -36,13 +36,15 @@ INSTALLED_APPS = [
 AUTH_USER_MODEL = 'registry.User'
 
 MIDDLEWARE = [
+    'registry.instrumentation.RequestInstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'oauth2_provider.middleware.OAuth2TokenMiddleware',
+    'registry.authentication.CachedOAuth2TokenMiddleware',
+    'registry.profiling.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -66,6 +68,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'core.wsgi.application'
+ASGI_APPLICATION = 'core.asgi.application'
 
 DATABASES = {
     'default': {
@@ -96,16 +99,47 @@ USE_TZ = True
 STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Shared cache behind token lookups, catalog version counters and the read
+# cache. Local memory is per process: with several workers point this at a
+# shared backend (e.g. django.core.cache.backends.redis.RedisCache or
+# django.core.cache.backends.filebased.FileBasedCache)
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'gapt'),
+    }
+}
+
+# A process-local cache cannot carry invalidations (token revokes, version
+# bumps) to other workers, so the caches that rely on them switch off and
+# `manage.py check` fails on one unless the site runs a single process
+# (runserver, tests)
+REGISTRY_SINGLE_PROCESS = os.getenv('REGISTRY_SINGLE_PROCESS', str(DEBUG)) == 'True'
+
+# Two-tier read cache for catalog responses (registry.caching): an in-process
+# LRU in front of the CACHES alias below, which also holds the per-model
+# version counters behind ETags (registry.versioning)
+READ_CACHE_ALIAS = os.getenv('READ_CACHE_ALIAS', 'default')
+READ_CACHE_LOCAL_ENTRIES = int(os.getenv('READ_CACHE_LOCAL_ENTRIES', '256'))
+READ_CACHE_LOCAL_TTL = int(os.getenv('READ_CACHE_LOCAL_TTL', '30'))
+READ_CACHE_TTL = int(os.getenv('READ_CACHE_TTL', '3600'))
+
 # DRF Config
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'oauth2_provider.contrib.rest_framework.OAuth2Authentication',
+        'registry.authentication.CachedOAuth2Authentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # Cursor pagination is opt-in per request (?page_size= / ?cursor=)
+    'DEFAULT_PAGINATION_CLASS': 'registry.pagination.RegistryCursorPagination',
+    'PAGE_SIZE': int(os.getenv('REGISTRY_PAGE_SIZE', '100')),
 }
 
+# Upper bound for ?page_size=; unset means clients may ask for any size
+REGISTRY_MAX_PAGE_SIZE = int(os.getenv('REGISTRY_MAX_PAGE_SIZE', '1000')) or None
+
 # OAuth2 Config
 AUTHENTICATION_BACKENDS = (
     'django.contrib.auth.backends.ModelBackend',
@@ -118,8 +152,60 @@ OAUTH2_PROVIDER = {
         'read': 'Read scope',
         'write': 'Write scope',
         'groups': 'Access to your groups'
-    }
+    },
+    'OAUTH2_VALIDATOR_CLASS': 'registry.authentication.CachedOAuth2Validator',
 }
 
+# Seconds a validated access token is cached (never beyond the token's expiry);
+# 0 turns token caching off
+OAUTH2_TOKEN_CACHE_TTL = int(os.getenv('OAUTH2_TOKEN_CACHE_TTL', '300'))
+OAUTH2_TOKEN_CACHE_ALIAS = os.getenv('OAUTH2_TOKEN_CACHE_ALIAS', 'default')
+
 # CORS Config
 CORS_ALLOW_ALL_ORIGINS = True # Change in production
+
+# Notification push stream (served under ASGI)
+NOTIFICATION_BROKER = os.getenv('NOTIFICATION_BROKER', 'registry.pubsub.LocalBroker')
+NOTIFICATION_STREAM_HEARTBEAT = int(os.getenv('NOTIFICATION_STREAM_HEARTBEAT', '15'))
+NOTIFICATION_RETENTION_DAYS = int(os.getenv('NOTIFICATION_RETENTION_DAYS', '90'))
+
+# Request instrumentation (registry.instrumentation): per view/action metrics
+# at /api/registry/metrics/, Server-Timing headers and a JSON slow log on the
+# 'registry.slow' logger
+SERVER_TIMING = os.getenv('SERVER_TIMING', 'True') == 'True'
+SLOW_REQUEST_MS = int(os.getenv('SLOW_REQUEST_MS', '500'))
+SLOW_QUERY_MS = int(os.getenv('SLOW_QUERY_MS', '100'))
+
+# Opt-in profiling (registry.profiling): admins send `X-Profile: 1` or
+# ?profile=1, or a share of requests is sampled; PROFILING=False removes the
+# middleware entirely
+PROFILING = os.getenv('PROFILING', 'True') == 'True'
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_DIR = os.getenv('PROFILE_DIR', str(BASE_DIR / 'profiles'))
+PROFILE_KEEP = int(os.getenv('PROFILE_KEEP', '50'))
+
+# Processes hashing passwords in the provision_users command (registry.provisioning);
+# 0 uses every core. The bulk_provision endpoint always hashes in-process
+PROVISION_HASH_WORKERS = int(os.getenv('PROVISION_HASH_WORKERS', '0'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'registry.slow': {'handlers': ['console'], 'level': os.getenv('SLOW_LOG_LEVEL', 'WARNING'), 'propagate': False},
+    },
+}
+
+# Start and end of each timetable hour (period), used to resolve hour-level
+# leave; the default matches the seven hours the attendance and timetable
+# pages show. e.g. PERIOD_TIMES="09:00-09:50,09:50-10:40,..."
+PERIOD_TIMES = [
+    tuple(period.split('-'))
+    for period in os.getenv(
+        'PERIOD_TIMES',
+        '09:00-10:00,10:00-11:00,11:00-12:00,12:00-13:00,14:00-15:00,15:00-16:00,16:00-17:00',
+    ).split(',')
+]
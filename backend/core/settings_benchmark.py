@@ -0,0 +1,17 @@
+from .settings import *  # noqa: F401,F403
+
+# In-process API benchmarks (manage.py benchmark_api) run against a local
+# SQLite file so they need no database server; with --keepdb the generated
+# dataset is reused between runs.
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'benchmark.sqlite3',
+        'TEST': {'NAME': BASE_DIR / 'benchmark_test.sqlite3'},
+    }
+}
+
+DEBUG = False
+
+# The benchmark and test client run in this one process
+REGISTRY_SINGLE_PROCESS = True
@@ -0,0 +1,152 @@
+from collections import defaultdict
+
+from django.db.models import Avg, Count, ExpressionWrapper, F, FloatField, Max, Min, Q
+from django.db.models.functions import Floor
+
+from .models import User, AttendanceRecord, MarkRecord
+
+PERCENTILES = (25, 50, 75, 90)
+
+
+def _percentage():
+    return ExpressionWrapper(F('marks') * 100.0 / F('max_marks'), output_field=FloatField())
+
+
+def _class_key(row, prefix):
+    return row[f'{prefix}department'], row[f'{prefix}study_year']
+
+
+def _percentiles(fine_histogram, total):
+    """
+    Interpolates percentiles from a histogram with 1-point buckets
+    ({floor(percentage): count}), so the error is below one mark percent.
+    """
+    result = {}
+    if not total:
+        return {f'p{p}': None for p in PERCENTILES}
+    buckets = sorted(fine_histogram.items())
+    for p in PERCENTILES:
+        target = total * p / 100
+        cumulative = 0
+        for bucket, count in buckets:
+            if cumulative + count >= target:
+                value = bucket + (target - cumulative) / count
+                result[f'p{p}'] = round(min(value, 100.0), 2)
+                break
+            cumulative += count
+    return result
+
+
+def _histogram(fine_histogram, width):
+    bins = [{'from': start, 'to': min(start + width, 100), 'count': 0} for start in range(0, 100, width)]
+    for bucket, count in fine_histogram.items():
+        index = min(max(int(bucket), 0) // width, len(bins) - 1)
+        bins[index]['count'] += count
+    return bins
+
+
+def _distribution(row, fine_histogram, width):
+    return {
+        'count': row['count'],
+        'mean': round(row['mean'], 2) if row['mean'] is not None else None,
+        'min': round(row['low'], 2) if row['low'] is not None else None,
+        'max': round(row['high'], 2) if row['high'] is not None else None,
+        'below_threshold': row['below'],
+        'percentiles': _percentiles(fine_histogram, row['count']),
+        'histogram': _histogram(fine_histogram, width),
+    }
+
+
+def cohort_analytics(department=None, study_year=None, mark_batch=None, date_from=None, date_to=None,
+                     attendance_threshold=75, pass_mark=40, bucket_width=10):
+    """
+    Department/year analytics for HOD and Dean dashboards.
+
+    Every figure comes from grouped aggregates, so the query count is fixed
+    (five queries) whatever the number of students in scope. Marks are
+    normalised to a percentage of `max_marks` before aggregation.
+    """
+    students = Q(role=User.Role.STUDENT)
+    if department:
+        students &= Q(department=department)
+    if study_year:
+        students &= Q(study_year=study_year)
+    scope = User.objects.filter(students).values('id')
+
+    # --- Attendance per class ---
+    attendance = AttendanceRecord.objects.filter(user__in=scope)
+    if date_from:
+        attendance = attendance.filter(date__gte=date_from)
+    if date_to:
+        attendance = attendance.filter(date__lte=date_to)
+
+    classes = {}
+    for row in (
+        attendance.values('user__department', 'user__study_year')
+        .annotate(students=Count('user', distinct=True), total=Count('id'), present=Count('id', filter=Q(is_present=True)))
+    ):
+        classes[_class_key(row, 'user__')] = {
+            'department': row['user__department'],
+            'study_year': row['user__study_year'],
+            'students': row['students'],
+            'present': row['present'],
+            'total': row['total'],
+            'percentage': round(row['present'] * 100 / row['total'], 2) if row['total'] else 0,
+            'below_threshold': 0,
+        }
+
+    # Students under the threshold; only the offending rows leave the database
+    below = (
+        attendance.values('user', 'user__department', 'user__study_year')
+        .annotate(total=Count('id'), present=Count('id', filter=Q(is_present=True)))
+        .filter(present__lt=F('total') * attendance_threshold / 100.0)
+    )
+    for row in below:
+        classes[_class_key(row, 'user__')]['below_threshold'] += 1
+
+    # --- Mark distributions per subject and per class ---
+    marks = MarkRecord.objects.filter(student__in=scope, max_marks__gt=0)
+    if mark_batch:
+        marks = marks.filter(batch=mark_batch)
+    marks = marks.annotate(percentage=_percentage())
+    stats = dict(
+        count=Count('id'), mean=Avg('percentage'), low=Min('percentage'), high=Max('percentage'),
+        below=Count('id', filter=Q(percentage__lt=pass_mark)),
+    )
+
+    subject_fine = defaultdict(lambda: defaultdict(int))
+    class_fine = defaultdict(lambda: defaultdict(int))
+    for row in (
+        marks.annotate(bucket=Floor('percentage'))
+        .values('subject_id', 'student__department', 'student__study_year', 'bucket')
+        .annotate(n=Count('id'))
+    ):
+        subject_fine[row['subject_id']][row['bucket']] += row['n']
+        class_fine[_class_key(row, 'student__')][row['bucket']] += row['n']
+
+    subjects = [
+        {'subject': row['subject_id'], 'code': row['subject__code'], 'name': row['subject__name'],
+         **_distribution(row, subject_fine[row['subject_id']], bucket_width)}
+        for row in marks.values('subject_id', 'subject__code', 'subject__name').annotate(**stats).order_by('subject__code')
+    ]
+    mark_classes = [
+        {'department': row['student__department'], 'study_year': row['student__study_year'],
+         **_distribution(row, class_fine[_class_key(row, 'student__')], bucket_width)}
+        for row in marks.values('student__department', 'student__study_year').annotate(**stats)
+        .order_by('student__department', 'student__study_year')
+    ]
+
+    return {
+        'scope': {
+            'department': department,
+            'study_year': study_year,
+            'mark_batch': mark_batch,
+            'from': date_from,
+            'to': date_to,
+            'attendance_threshold': attendance_threshold,
+            'pass_mark': pass_mark,
+            'bucket_width': bucket_width,
+        },
+        'attendance': sorted(classes.values(), key=lambda c: (c['department'] or '', c['study_year'] or '')),
+        'marks': {'subjects': subjects, 'classes': mark_classes},
+    }
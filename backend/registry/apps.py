@@ -3,3 +3,6 @@ from django.apps import AppConfig
 class RegistryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'registry'
+
+    def ready(self):
+        from . import checks, instrumentation, signals  # noqa: F401
@@ -0,0 +1,119 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import JsonResponse, StreamingHttpResponse
+from oauth2_provider.oauth2_backends import get_oauthlib_core
+
+from .dashboards import DASHBOARDS, dashboard_for
+from .models import Notification
+from .notifications import unread_count
+from .pubsub import get_broker
+from .serializers import NotificationSerializer, UserSerializer
+
+STREAM_BACKLOG_LIMIT = 100
+
+
+def _authenticate(request):
+    # EventSource cannot send headers, so ?access_token= is accepted as well
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user
+    valid, oauth_request = get_oauthlib_core().verify_request(request, scopes=[])
+    return oauth_request.user if valid else None
+
+
+def _sse(event, data, event_id=None):
+    message = f'event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n'
+    return f'id: {event_id}\n{message}' if event_id is not None else message
+
+
+def _initial_state(user, last_event_id):
+    visible = Notification.objects.filter(Q(user=user) | Q(user__isnull=True))
+    unread = unread_count(user)
+    backlog = []
+    if last_event_id is not None:
+        backlog = NotificationSerializer(
+            visible.filter(id__gt=last_event_id).order_by('id')[:STREAM_BACKLOG_LIMIT], many=True
+        ).data
+    return unread, backlog
+
+
+async def _event_stream(user_id, queue, unread, backlog):
+    broker = get_broker()
+    heartbeat = getattr(settings, 'NOTIFICATION_STREAM_HEARTBEAT', 15)
+    last_sent = 0
+    try:
+        yield 'retry: 5000\n\n'
+        yield _sse('unread', {'unread': unread})
+        for notification in backlog:
+            last_sent = notification['id']
+            yield _sse('notification', {'notification': notification, 'unread': unread}, notification['id'])
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ': keep-alive\n\n'
+                continue
+            notification = event['notification']
+            if notification['id'] <= last_sent:
+                continue  # already delivered from the backlog
+            if not notification['read']:
+                unread += 1
+            yield _sse('notification', {'notification': notification, 'unread': unread}, notification['id'])
+    finally:
+        broker.unsubscribe(user_id, queue)
+
+
+async def notification_stream(request):
+    """
+    Server-Sent Events stream of the caller's personal and broadcast
+    notifications. Sends the unread count on connect, replays anything newer
+    than Last-Event-ID after a reconnect, then pushes new notifications as they
+    are created. Idle connections cost a parked coroutine, not a poll.
+    """
+    user = await sync_to_async(_authenticate)(request)
+    if user is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    last_event_id = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+
+    # Subscribe before reading the backlog so nothing created in between is lost
+    queue = get_broker().subscribe(user.pk)
+    try:
+        unread, backlog = await sync_to_async(_initial_state)(user, last_event_id)
+    except Exception:
+        get_broker().unsubscribe(user.pk, queue)
+        raise
+
+    response = StreamingHttpResponse(
+        _event_stream(user.pk, queue, unread, backlog), content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+async def dashboard(request, role=None):
+    """
+    One composed payload per dashboard (student, staff, hod, dean) in place of
+    separate profile/tasks/attendance/marks/notification calls. Independent
+    sections are awaited together on the async ORM. Without `role` the
+    caller's own dashboard is returned.
+    """
+    if role is not None and role not in DASHBOARDS:
+        return JsonResponse({'detail': 'Not found.'}, status=404)
+    user = await sync_to_async(_authenticate)(request)
+    if user is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+
+    role, sections = dashboard_for(user, role, department=request.GET.get('department'))
+    if sections is None:
+        return JsonResponse({'detail': 'You do not have permission to perform this action.'}, status=403)
+    payload = {'role': role, 'profile': UserSerializer(user).data, **await sections}
+    return JsonResponse(payload, encoder=DjangoJSONEncoder)
+
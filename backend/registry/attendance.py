@@ -0,0 +1,179 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+
+from .leaves import overlapping, period_times
+from .models import User, AttendanceRecord, HourAttendance, LeaveRequest
+from .serializers import AttendanceBulkRowSerializer
+from .summary import rebuild_summaries
+from .upserts import upsert_options
+
+BULK_BATCH_SIZE = 1000
+
+
+def validate_attendance_rows(rows):
+    """
+    Validates a bulk attendance payload without touching the database per row.
+
+    Returns `(valid, errors)` where `valid` maps payload index to validated data
+    and `errors` maps payload index to serializer-style error dicts. User ids
+    are resolved with one set-based query and duplicate (user, date) pairs
+    inside the payload are rejected.
+    """
+    valid, errors = {}, {}
+    if not isinstance(rows, list):
+        return valid, {None: {'non_field_errors': ['Expected a list of records.']}}
+
+    for index, row in enumerate(rows):
+        serializer = AttendanceBulkRowSerializer(data=row)
+        if serializer.is_valid():
+            valid[index] = serializer.validated_data
+        else:
+            errors[index] = serializer.errors
+
+    user_ids = {data['user'] for data in valid.values()}
+    user_ids |= {data['marked_by'] for data in valid.values() if data.get('marked_by')}
+    known = set(User.objects.filter(id__in=user_ids).values_list('id', flat=True))
+
+    seen = set()
+    for index, data in list(valid.items()):
+        key = (data['user'], data['date'])
+        if data['user'] not in known:
+            errors[index] = {'user': [f'Invalid pk "{data["user"]}" - object does not exist.']}
+        elif data.get('marked_by') and data['marked_by'] not in known:
+            errors[index] = {'marked_by': [f'Invalid pk "{data["marked_by"]}" - object does not exist.']}
+        elif key in seen:
+            errors[index] = {'non_field_errors': ['Duplicate user and date in payload.']}
+        else:
+            seen.add(key)
+            continue
+        del valid[index]
+    return valid, errors
+
+
+@transaction.atomic
+def upsert_attendance(valid, marked_by=None, fill_leaves=True):
+    """
+    Writes validated rows (from `validate_attendance_rows`) in one transaction.
+
+    Records are upserted on the (user, date) unique constraint. Rows that carry
+    `hours` have their hour entries replaced; rows without `hours` keep theirs.
+    With `fill_leaves`, hours still unmarked are then filled from approved
+    leaves (see `fill_leave_hours`).
+    Returns a dict of payload index -> (status, record id).
+    """
+    if not valid:
+        return {}
+
+    keys = {(data['user'], data['date']) for data in valid.values()}
+    user_ids = {user_id for user_id, _ in keys}
+    dates = {day for _, day in keys}
+
+    existing = set(
+        AttendanceRecord.objects.filter(user_id__in=user_ids, date__in=dates).values_list('user_id', 'date')
+    )
+
+    AttendanceRecord.objects.bulk_create(
+        [
+            AttendanceRecord(
+                user_id=data['user'],
+                date=data['date'],
+                is_present=data.get('is_present', False),
+                marked_by_id=data.get('marked_by') or getattr(marked_by, 'pk', None),
+            )
+            for data in valid.values()
+        ],
+        batch_size=BULK_BATCH_SIZE,
+        **upsert_options(AttendanceRecord, ['user', 'date'], ['is_present', 'marked_by']),
+    )
+
+    # bulk_create does not return primary keys on MySQL, so read them back once
+    ids = {
+        (user_id, day): pk
+        for pk, user_id, day in AttendanceRecord.objects.filter(
+            user_id__in=user_ids, date__in=dates
+        ).values_list('id', 'user_id', 'date')
+        if (user_id, day) in keys
+    }
+
+    replaced = [ids[(data['user'], data['date'])] for data in valid.values() if 'hours' in data]
+    if replaced:
+        HourAttendance.objects.filter(record_id__in=replaced).delete()
+        HourAttendance.objects.bulk_create(
+            [
+                HourAttendance(record_id=ids[(data['user'], data['date'])], **hour)
+                for data in valid.values() if 'hours' in data
+                for hour in data['hours']
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+    if fill_leaves:
+        fill_leave_hours(ids)
+
+    # bulk_create bypasses the model signals that keep summaries current
+    rebuild_summaries(user_ids)
+
+    results = {}
+    for index, data in valid.items():
+        key = (data['user'], data['date'])
+        results[index] = ('updated' if key in existing else 'created', ids[key])
+    return results
+
+
+# --- Leave auto-fill stage ---
+
+def leave_hours(user_ids, date_from, date_to):
+    """
+    Resolves approved leaves for `user_ids` (None for everyone) between two
+    dates with one query. Returns {(user_id, date): {hour: leave type}} for
+    every timetable hour a leave covers.
+    """
+    queryset = LeaveRequest.objects.filter(status=LeaveRequest.LeaveStatus.APPROVED)
+    if user_ids is not None:
+        queryset = queryset.filter(student_id__in=user_ids)
+    leaves = overlapping(queryset, date_from, date_to).values_list(
+        'student_id', 'type', 'start_date', 'start_time', 'end_date', 'end_time'
+    )
+    periods = [(hour, *period_times(hour)) for hour in range(1, len(settings.PERIOD_TIMES) + 1)]
+
+    covered = {}
+    for student_id, leave_type, start_date, start_time, end_date, end_time in leaves:
+        day = max(start_date, date_from)
+        while day <= min(end_date, date_to):
+            for hour, period_start, period_end in periods:
+                if day == start_date and start_time is not None and start_time >= period_end:
+                    continue
+                if day == end_date and end_time is not None and end_time <= period_start:
+                    continue
+                covered.setdefault((student_id, day), {})[hour] = leave_type
+            day += timedelta(days=1)
+    return covered
+
+
+def fill_leave_hours(records):
+    """
+    Batch stage that marks hours covered by approved leave as OTHER, with the
+    leave type in `detail`. `records` maps (user_id, date) -> record id. Hours
+    already marked are left alone, so staff entries win. Runs a constant
+    three queries however many records are passed; returns the rows written.
+    """
+    if not records:
+        return 0
+    days = [day for _, day in records]
+    covered = leave_hours({user_id for user_id, _ in records}, min(days), max(days))
+    targets = {records[key]: hours for key, hours in covered.items() if key in records}
+    if not targets:
+        return 0
+
+    marked = set(HourAttendance.objects.filter(record_id__in=targets).values_list('record_id', 'hour'))
+    labels = dict(LeaveRequest.LeaveType.choices)
+    rows = [
+        HourAttendance(record_id=record_id, hour=hour, status='OTHER', detail=f'{labels.get(leave_type, leave_type)} leave')
+        for record_id, hours in targets.items()
+        for hour, leave_type in sorted(hours.items())
+        if (record_id, hour) not in marked
+    ]
+    HourAttendance.objects.bulk_create(rows, batch_size=BULK_BATCH_SIZE)
+    return len(rows)
@@ -0,0 +1,149 @@
+import hashlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from oauth2_provider.contrib.rest_framework import OAuth2Authentication
+from oauth2_provider.oauth2_backends import get_oauthlib_core
+from oauth2_provider.oauth2_validators import OAuth2Validator
+
+from .caching import shared_cache
+
+TOKEN_KEY = 'oauth2:token:{}'
+USER_GENERATION_KEY = 'oauth2:user-generation:{}'
+
+
+def token_cache():
+    """The token cache, or None when caching is off (TTL 0 or no cache shared by all workers)."""
+    if getattr(settings, 'OAUTH2_TOKEN_CACHE_TTL', 300) <= 0:
+        return None
+    return shared_cache(getattr(settings, 'OAUTH2_TOKEN_CACHE_ALIAS', 'default'))
+
+
+def token_cache_key(token):
+    # Hash so raw bearer tokens never appear in cache keys
+    return TOKEN_KEY.format(hashlib.sha256(token.encode()).hexdigest())
+
+
+def _user_generation(cache, user_id):
+    return cache.get(USER_GENERATION_KEY.format(user_id), 0)
+
+
+def invalidate_token(token):
+    cache = token_cache()
+    if cache is not None:
+        cache.delete(token_cache_key(token))
+
+
+def invalidate_user_tokens(user_id):
+    """Makes every cached token of `user_id` stale, e.g. after a role change or deactivation."""
+    cache = token_cache()
+    if cache is None:
+        return
+    key = USER_GENERATION_KEY.format(user_id)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+class CachedOAuth2Validator(OAuth2Validator):
+    """
+    Loads access tokens (with their user and application) from the cache.
+
+    Entries live for OAUTH2_TOKEN_CACHE_TTL seconds but never past the token's
+    own expiry. They are dropped when the token is saved or deleted (revoke,
+    logout, cleartokens) and go stale when the owning user is saved; see
+    registry.signals. Every lookup goes to the database when the cache is
+    process-local, since a revoke would only reach the worker handling it.
+    """
+
+    def _load_access_token(self, token):
+        cache = token_cache()
+        if cache is None:
+            return super()._load_access_token(token)
+
+        key = token_cache_key(token)
+        cached = cache.get(key)
+        if cached is not None:
+            access_token, generation = cached
+            if generation == _user_generation(cache, access_token.user_id):
+                return access_token
+            cache.delete(key)
+
+        access_token = super()._load_access_token(token)
+        if access_token is not None and access_token.expires:
+            ttl = min(
+                settings.OAUTH2_TOKEN_CACHE_TTL,
+                int((access_token.expires - timezone.now()).total_seconds()),
+            )
+            if ttl > 0:
+                cache.set(key, (access_token, _user_generation(cache, access_token.user_id)), ttl)
+        return access_token
+
+
+class CachedOAuth2TokenMiddleware:
+    """
+    Replacement for oauth2_provider's OAuth2TokenMiddleware that validates the
+    bearer token once and leaves the result on the request, so
+    CachedOAuth2Authentication does not repeat the lookup.
+
+    Sync and async capable, so ASGI requests are not bounced through a thread
+    adapter; only requests that carry a bearer token hop to a thread for the
+    token lookup.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if self.has_bearer(request):
+            self.check_token(request)
+        response = self.get_response(request)
+        patch_vary_headers(response, ('Authorization',))
+        return response
+
+    async def __acall__(self, request):
+        if self.has_bearer(request):
+            await sync_to_async(self.check_token)(request)
+        response = await self.get_response(request)
+        patch_vary_headers(response, ('Authorization',))
+        return response
+
+    @staticmethod
+    def has_bearer(request):
+        return request.META.get('HTTP_AUTHORIZATION', '').startswith('Bearer')
+
+    @staticmethod
+    def check_token(request):
+        if not hasattr(request, 'user') or request.user.is_anonymous:
+            valid, oauth_request = get_oauthlib_core().verify_request(request, scopes=[])
+            request.oauth2_checked = True
+            if valid:
+                request.user = request._cached_user = oauth_request.user
+                request.oauth2_access_token = oauth_request.access_token
+            else:
+                request.oauth2_error = getattr(oauth_request, 'oauth2_error', {})
+
+
+class CachedOAuth2Authentication(OAuth2Authentication):
+    """Reuses the middleware's token check when present, else validates through the cache."""
+
+    def authenticate(self, request):
+        django_request = request._request
+        if getattr(django_request, 'oauth2_checked', False):
+            access_token = getattr(django_request, 'oauth2_access_token', None)
+            if access_token is not None:
+                return access_token.user, access_token
+            request.oauth2_error = getattr(django_request, 'oauth2_error', {})
+            return None
+        return super().authenticate(request)
@@ -0,0 +1,159 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+_MISSING = object()
+
+# Backends whose data other worker processes cannot see
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def is_process_local(alias):
+    return settings.CACHES[alias]['BACKEND'] in PROCESS_LOCAL_BACKENDS
+
+
+def shared_cache(alias):
+    """
+    `caches[alias]` if invalidations written there reach every worker, else
+    None. A process-local backend only qualifies with REGISTRY_SINGLE_PROCESS
+    (runserver, tests, benchmarks); registry.checks reports it otherwise.
+    """
+    if is_process_local(alias) and not getattr(settings, 'REGISTRY_SINGLE_PROCESS', False):
+        return None
+    return caches[alias]
+
+
+class LocalCache:
+    """Thread-safe in-process LRU with a per-entry TTL."""
+
+    def __init__(self, max_entries=256, ttl=30):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class TwoTierCache:
+    """
+    Reads go to the process-local LRU first, then to the shared CACHES
+    backend (promoting hits locally). Keys are expected to embed the version
+    counters of the data they hold (see registry.versioning), so a model
+    save/delete invalidates every process at once by making old keys
+    unreachable; the local TTL only bounds memory held by dead entries.
+    When `alias` is process-local on a multi-worker site (see shared_cache)
+    those counters cannot be trusted, and both tiers are bypassed.
+    """
+
+    def __init__(self, alias='default', prefix='read', local_entries=256, local_ttl=30, ttl=3600):
+        self.alias = alias
+        self.prefix = prefix
+        self.ttl = ttl
+        self.local = LocalCache(local_entries, local_ttl)
+        self._stats = {'local_hits': 0, 'shared_hits': 0, 'misses': 0, 'sets': 0}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def shared(self):
+        return shared_cache(self.alias)
+
+    def _count(self, name):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def _key(self, key):
+        return f'{self.prefix}:{key}'
+
+    def get(self, key, default=None):
+        shared = self.shared
+        if shared is None:
+            self._count('misses')
+            return default
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            self._count('local_hits')
+            return value
+        value = shared.get(self._key(key), _MISSING)
+        if value is not _MISSING:
+            self._count('shared_hits')
+            self.local.set(key, value)
+            return value
+        self._count('misses')
+        return default
+
+    def set(self, key, value):
+        shared = self.shared
+        if shared is None:
+            return
+        self._count('sets')
+        self.local.set(key, value)
+        shared.set(self._key(key), value, self.ttl)
+
+    def delete(self, key):
+        self.local.delete(key)
+        if self.shared is not None:
+            self.shared.delete(self._key(key))
+
+    def clear(self):
+        """Empties this process's LRU and the whole shared alias."""
+        self.local.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats['local_hits'] + stats['shared_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['local_hits'] + stats['shared_hits']) / lookups, 4) if lookups else None
+        stats['local_entries'] = len(self.local)
+        stats['backend'] = self.alias
+        stats['shared'] = self.shared is not None
+        return stats
+
+    def reset_stats(self):
+        with self._stats_lock:
+            for name in self._stats:
+                self._stats[name] = 0
+
+
+read_cache = TwoTierCache(
+    alias=getattr(settings, 'READ_CACHE_ALIAS', 'default'),
+    local_entries=getattr(settings, 'READ_CACHE_LOCAL_ENTRIES', 256),
+    local_ttl=getattr(settings, 'READ_CACHE_LOCAL_TTL', 30),
+    ttl=getattr(settings, 'READ_CACHE_TTL', 3600),
+)
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from .caching import is_process_local
+
+
+@register(Tags.caches)
+def shared_caches_check(app_configs, **kwargs):
+    """Caches that carry invalidations between workers must not be per process."""
+    if getattr(settings, 'REGISTRY_SINGLE_PROCESS', False):
+        return []
+    errors = []
+    alias = getattr(settings, 'OAUTH2_TOKEN_CACHE_ALIAS', 'default')
+    if getattr(settings, 'OAUTH2_TOKEN_CACHE_TTL', 300) > 0 and is_process_local(alias):
+        errors.append(Error(
+            f'OAUTH2_TOKEN_CACHE_ALIAS "{alias}" is process-local, so a revoked token stays valid '
+            'in every other worker until OAUTH2_TOKEN_CACHE_TTL runs out; token caching is off.',
+            hint='Point it at a shared cache (Redis, Memcached, database), set OAUTH2_TOKEN_CACHE_TTL=0, '
+                 'or set REGISTRY_SINGLE_PROCESS=True when running a single worker.',
+            id='registry.E001',
+        ))
+    alias = getattr(settings, 'READ_CACHE_ALIAS', 'default')
+    if is_process_local(alias):
+        errors.append(Error(
+            f'READ_CACHE_ALIAS "{alias}" is process-local, so a version bump in one worker leaves the '
+            'others serving 304s and cached bodies for old data; ETags and the read cache are off.',
+            hint='Point it at a shared cache (Redis, Memcached, database), '
+                 'or set REGISTRY_SINGLE_PROCESS=True when running a single worker.',
+            id='registry.E002',
+        ))
+    return errors
@@ -0,0 +1,180 @@
+import asyncio
+from datetime import date, timedelta
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .analytics import cohort_analytics
+from .models import (
+    User, Subject, AcademicTask, AttendanceRecord, AttendanceEditRequest, MarkRecord, LeaveRequest,
+    Timetable, HourAssignment, Notification, CurriculumEditRequest, StudentAcademicSummary
+)
+from .notifications import broadcast_cursor, unread_count
+from .serializers import (
+    SubjectSerializer, AcademicTaskSerializer, AttendanceRecordSerializer,
+    AttendanceEditRequestSerializer, MarkRecordSerializer, LeaveRequestSerializer, TimetableSerializer,
+    NotificationSerializer, CurriculumEditRequestSerializer
+)
+from .summary import academic_figures
+
+SECTION_LIMIT = 20
+ATTENDANCE_DAYS = 30
+LEADS = (User.Role.DEAN, User.Role.ADMIN)
+TEACHING_STAFF = (User.Role.STAFF, User.Role.ASSOC_PROF_I, User.Role.ASSOC_PROF_II, User.Role.ASSOC_PROF_III)
+DASHBOARDS = ('student', 'staff', 'hod', 'dean')
+
+
+async def _rows(queryset):
+    return [row async for row in queryset]
+
+
+async def _serialized(serializer_class, queryset, **context):
+    # Querysets select/prefetch everything their serializer reads, so
+    # serializing the fetched rows runs no further (synchronous) queries
+    return serializer_class(await _rows(queryset), many=True, context=context).data
+
+
+async def _compose(**sections):
+    """Awaits the named section coroutines together and returns {name: result}."""
+    results = await asyncio.gather(*sections.values())
+    return dict(zip(sections, results))
+
+
+async def _notifications(user):
+    notifications = Notification.objects.filter(Q(user=user) | Q(user__isnull=True)).order_by('-id')
+    unread, cursor, latest = await asyncio.gather(
+        sync_to_async(unread_count)(user),
+        sync_to_async(broadcast_cursor)(user),
+        _rows(notifications[:SECTION_LIMIT]),
+    )
+    return {
+        'unread': unread,
+        'latest': NotificationSerializer(latest, many=True, context={'broadcast_read_id': cursor}).data,
+    }
+
+
+async def _timetable(department, study_year):
+    timetable = await Timetable.objects.prefetch_related('assignments').filter(
+        department=department, study_year=study_year
+    ).afirst()
+    return TimetableSerializer(timetable).data if timetable else None
+
+
+async def _academic(user):
+    summary = await StudentAcademicSummary.objects.filter(user=user).afirst()
+    return academic_figures(summary or StudentAcademicSummary(user=user))
+
+
+async def _counts(queryset, **aggregates):
+    return await queryset.aaggregate(**aggregates)
+
+
+def _pending_attendance_requests(**approvals):
+    return AttendanceEditRequest.objects.filter(**approvals).order_by('-timestamp')
+
+
+async def student_dashboard(user):
+    since = date.today() - timedelta(days=ATTENDANCE_DAYS)
+    tasks = AcademicTask.objects.select_related('staff', 'subject').filter(
+        department=user.department, study_year=user.study_year, due_date__gte=timezone.now()
+    ).order_by('due_date')
+    attendance = AttendanceRecord.objects.prefetch_related('hours').filter(user=user, date__gte=since).order_by('-date')
+    return await _compose(
+        academic=_academic(user),
+        tasks=_serialized(AcademicTaskSerializer, tasks[:SECTION_LIMIT]),
+        attendance=_serialized(AttendanceRecordSerializer, attendance),
+        marks=_serialized(MarkRecordSerializer, MarkRecord.objects.filter(student=user).order_by('-updated_at')),
+        leaves=_serialized(
+            LeaveRequestSerializer,
+            LeaveRequest.objects.select_related('student').filter(student=user).order_by('-start_date')[:SECTION_LIMIT],
+        ),
+        timetable=_timetable(user.department, user.study_year),
+        notifications=_notifications(user),
+    )
+
+
+async def staff_dashboard(user):
+    tasks = AcademicTask.objects.select_related('staff', 'subject').filter(
+        staff=user, due_date__gte=timezone.now()
+    ).order_by('due_date')
+    pending_leaves = LeaveRequest.objects.select_related('student').filter(
+        mentor=user, status=LeaveRequest.LeaveStatus.PENDING
+    ).order_by('start_date')
+    return await _compose(
+        subjects=_serialized(SubjectSerializer, Subject.objects.prefetch_related('assigned_staff').filter(assigned_staff=user)),
+        tasks=_serialized(AcademicTaskSerializer, tasks[:SECTION_LIMIT]),
+        mentees=User.objects.filter(mentor=user).acount(),
+        pending_leaves=_serialized(LeaveRequestSerializer, pending_leaves[:SECTION_LIMIT]),
+        schedule=_rows(
+            HourAssignment.objects.filter(staff=user).order_by('hour')
+            .values('hour', 'timetable__department', 'timetable__study_year')
+        ),
+        notifications=_notifications(user),
+    )
+
+
+async def hod_dashboard(user, department):
+    in_department = Q(department=department)
+    pending_leaves = LeaveRequest.objects.select_related('student').filter(
+        student__department=department, status=LeaveRequest.LeaveStatus.PENDING
+    ).order_by('start_date')
+    payload = await _compose(
+        counts=_counts(
+            User.objects.filter(in_department),
+            students=Count('id', filter=Q(role=User.Role.STUDENT)),
+            staff=Count('id', filter=Q(role__in=[*TEACHING_STAFF, User.Role.HOD])),
+        ),
+        analytics=sync_to_async(cohort_analytics)(department=department),
+        pending_leaves=_serialized(LeaveRequestSerializer, pending_leaves[:SECTION_LIMIT]),
+        attendance_requests=_serialized(
+            AttendanceEditRequestSerializer,
+            _pending_attendance_requests(requester__department=department, hod_approved=False)[:SECTION_LIMIT],
+        ),
+        curriculum_requests=_serialized(
+            CurriculumEditRequestSerializer, CurriculumEditRequest.objects.filter(hod=user).order_by('-timestamp')[:SECTION_LIMIT]
+        ),
+        notifications=_notifications(user),
+    )
+    return {'department': department, **payload}
+
+
+async def dean_dashboard(user):
+    return await _compose(
+        roles=_rows(User.objects.values('role').annotate(count=Count('id')).order_by('role')),
+        leaves=_rows(LeaveRequest.objects.values('status').annotate(count=Count('id')).order_by('status')),
+        analytics=sync_to_async(cohort_analytics)(),
+        attendance_requests=_serialized(
+            AttendanceEditRequestSerializer, _pending_attendance_requests(dean_approved=False)[:SECTION_LIMIT]
+        ),
+        curriculum_requests=_serialized(
+            CurriculumEditRequestSerializer,
+            CurriculumEditRequest.objects.filter(status='PENDING').order_by('-timestamp')[:SECTION_LIMIT],
+        ),
+        notifications=_notifications(user),
+    )
+
+
+def dashboard_for(user, role=None, department=None):
+    """
+    Picks the dashboard for `role` (default: the one matching the user's role)
+    and returns `(role, coroutine)`, the coroutine being None when the user may
+    not see it. Students and teaching staff (associate professors included)
+    get their own; HODs their department's (deans and admins may name a
+    ?department=); deans and admins the institution's.
+    """
+    is_lead = user.is_superuser or user.role in LEADS
+    role = role or {
+        User.Role.STUDENT: 'student', User.Role.HOD: 'hod', **dict.fromkeys(TEACHING_STAFF, 'staff'),
+    }.get(user.role, 'dean' if is_lead else None)
+
+    if role == 'student' and user.role == User.Role.STUDENT:
+        return role, student_dashboard(user)
+    if role == 'staff' and user.role in (*TEACHING_STAFF, User.Role.HOD):
+        return role, staff_dashboard(user)
+    if role == 'hod' and (user.role == User.Role.HOD or is_lead):
+        department = user.department if user.role == User.Role.HOD else department
+        return role, (hod_dashboard(user, department) if department else None)
+    if role == 'dean' and is_lead:
+        return role, dean_dashboard(user)
+    return role, None
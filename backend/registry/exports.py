@@ -0,0 +1,135 @@
+import csv
+import tempfile
+
+from django.db.models import Q, Value
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
+
+from .models import HourAttendance, MarkRecord
+
+EXPORT_CHUNK_SIZE = 2000
+FILE_TYPES = ('csv', 'xlsx')
+
+MARK_SHEET_COLUMNS = [
+    ('student__reg_no', 'reg_no'),
+    ('student__username', 'username'),
+    ('student__department', 'department'),
+    ('student__study_year', 'study_year'),
+    ('subject__code', 'subject_code'),
+    ('subject__name', 'subject_name'),
+    ('marks', 'marks'),
+    ('max_marks', 'max_marks'),
+]
+
+ATTENDANCE_COLUMNS = [
+    ('record__date', 'date'),
+    ('record__user__reg_no', 'reg_no'),
+    ('record__user__username', 'username'),
+    ('record__user__department', 'department'),
+    ('record__user__study_year', 'study_year'),
+    ('record__is_present', 'is_present'),
+    ('hour', 'hour'),
+    ('status', 'status'),
+    ('detail', 'detail'),
+]
+
+
+def iter_keyset(queryset, fields, order=(), chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yields `values_list(*fields)` rows sorted by `order` and then primary key,
+    one bounded query per chunk. Each chunk resumes after the previous chunk's
+    last sort key, so unlike `.iterator()` memory stays flat on MySQL too,
+    where the driver buffers an entire result set client-side. `order` fields
+    must not be NULL (coalesce them in an annotation).
+    """
+    keys = [*order, 'pk']
+    last = None
+    while True:
+        chunk = queryset.order_by(*keys)
+        if last is not None:
+            chunk = chunk.filter(_after(keys, last))
+        rows = list(chunk.values_list(*keys, *fields)[:chunk_size])
+        if not rows:
+            return
+        for row in rows:
+            yield row[len(keys):]
+        if len(rows) < chunk_size:
+            return
+        last = rows[-1][:len(keys)]
+
+
+def _after(keys, values):
+    # Rows sorting strictly after `values`: a > x, or a = x and b > y, and so on
+    condition = Q()
+    for position, key in enumerate(keys):
+        condition |= Q(**dict(zip(keys[:position], values[:position])), **{f'{key}__gt': values[position]})
+    return condition
+
+
+class _Echo:
+    # csv.writer target that hands each formatted line straight back
+    def write(self, value):
+        return value
+
+
+def _csv_stream(header, rows):
+    writer = csv.writer(_Echo())
+    yield '\ufeff' + writer.writerow(header)  # BOM so spreadsheet apps detect UTF-8
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _xlsx_stream(header, rows, sheet_title):
+    # XLSX is a zip archive written once the rows are complete, so rows go to a
+    # write-only workbook spooled on disk and the file is then streamed out
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=sheet_title[:31])
+    sheet.append(header)
+    for row in rows:
+        sheet.append(list(row))
+    with tempfile.TemporaryFile() as handle:
+        workbook.save(handle)
+        handle.seek(0)
+        while True:
+            data = handle.read(64 * 1024)
+            if not data:
+                break
+            yield data
+
+
+def streaming_export(columns, rows, filename, file_type='csv'):
+    header = [label for _, label in columns]
+    if file_type == 'xlsx':
+        response = StreamingHttpResponse(
+            _xlsx_stream(header, rows, filename),
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
+    else:
+        response = StreamingHttpResponse(_csv_stream(header, rows), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{file_type}"'
+    return response
+
+
+def export_mark_sheet(batch, file_type='csv'):
+    # Register order: by reg_no, each student's subjects by code
+    queryset = MarkRecord.objects.filter(batch=batch).annotate(sort_reg_no=Coalesce('student__reg_no', Value('')))
+    rows = iter_keyset(
+        queryset, [field for field, _ in MARK_SHEET_COLUMNS], order=['sort_reg_no', 'student_id', 'subject__code']
+    )
+    return streaming_export(MARK_SHEET_COLUMNS, rows, f'marks-{batch.pk}', file_type)
+
+
+def export_attendance_register(date_from, date_to, department=None, study_year=None, file_type='csv'):
+    queryset = HourAttendance.objects.filter(record__date__gte=date_from, record__date__lte=date_to)
+    if department:
+        queryset = queryset.filter(record__user__department=department)
+    if study_year:
+        queryset = queryset.filter(record__user__study_year=study_year)
+    # Register order: by date, then reg_no, then hour
+    queryset = queryset.annotate(sort_reg_no=Coalesce('record__user__reg_no', Value('')))
+    rows = iter_keyset(
+        queryset, [field for field, _ in ATTENDANCE_COLUMNS], order=['record__date', 'sort_reg_no', 'record_id', 'hour']
+    )
+    return streaming_export(ATTENDANCE_COLUMNS, rows, f'attendance-{date_from}-{date_to}', file_type)
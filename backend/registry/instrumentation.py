@@ -0,0 +1,243 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+slow_log = logging.getLogger('registry.slow')
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SQL_LOG_LENGTH = 500
+
+
+class RequestMetrics:
+    """
+    Thread-safe in-process aggregates per (view, action, method), exported in
+    the Prometheus text format. Like the read cache statistics, counters are
+    per worker process; a scraper sums them across workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._requests = {}
+            self._series = {}
+
+    def record(self, labels, status, duration, queries, db_time, render_time, size, slow):
+        with self._lock:
+            key = labels + (str(status),)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = {
+                    'count': 0, 'duration': 0.0, 'buckets': [0] * len(DURATION_BUCKETS), 'queries': 0,
+                    'db': 0.0, 'render': 0.0, 'bytes': 0, 'slow': 0,
+                }
+            series['count'] += 1
+            series['duration'] += duration
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    series['buckets'][index] += 1
+            series['queries'] += queries
+            series['db'] += db_time
+            series['render'] += render_time
+            series['bytes'] += size
+            series['slow'] += slow
+
+    def export(self):
+        with self._lock:
+            requests = dict(self._requests)
+            series = {labels: dict(values, buckets=list(values['buckets'])) for labels, values in self._series.items()}
+
+        def label_text(values, names=('view', 'action', 'method', 'status')):
+            return ','.join(f'{name}="{value}"' for name, value in zip(names, values))
+
+        lines = [
+            '# HELP registry_requests_total Requests handled, by view, action, method and status.',
+            '# TYPE registry_requests_total counter',
+        ]
+        lines += [f'registry_requests_total{{{label_text(key)}}} {count}' for key, count in sorted(requests.items())]
+
+        lines += [
+            '# HELP registry_request_duration_seconds Time from the first middleware to the rendered response.',
+            '# TYPE registry_request_duration_seconds histogram',
+        ]
+        for labels, values in sorted(series.items()):
+            for bound, count in zip(DURATION_BUCKETS, values['buckets']):
+                lines.append(f'registry_request_duration_seconds_bucket{{{label_text(labels)},le="{bound}"}} {count}')
+            lines.append(f'registry_request_duration_seconds_bucket{{{label_text(labels)},le="+Inf"}} {values["count"]}')
+            lines.append(f'registry_request_duration_seconds_sum{{{label_text(labels)}}} {values["duration"]:.6f}')
+            lines.append(f'registry_request_duration_seconds_count{{{label_text(labels)}}} {values["count"]}')
+
+        for name, field, kind, help_text in [
+            ('registry_db_queries_total', 'queries', 'counter', 'Database queries executed.'),
+            ('registry_db_duration_seconds_total', 'db', 'counter', 'Time spent executing database queries.'),
+            ('registry_render_duration_seconds_total', 'render', 'counter', 'Time spent rendering response bodies.'),
+            ('registry_response_bytes_total', 'bytes', 'counter', 'Response body bytes (streamed bodies excluded).'),
+            ('registry_slow_requests_total', 'slow', 'counter', 'Requests over SLOW_REQUEST_MS.'),
+        ]:
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+            for labels, values in sorted(series.items()):
+                value = values[field]
+                lines.append(f'{name}{{{label_text(labels)}}} {value:.6f}' if isinstance(value, float)
+                             else f'{name}{{{label_text(labels)}}} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+metrics = RequestMetrics()
+
+# Hooks for the queries of the current request. A context variable rather
+# than connection.execute_wrapper(), which only reaches the calling thread's
+# connections: async views run their queries in sync_to_async threads, and
+# those copy the context.
+_query_hooks = ContextVar('registry_query_hooks', default=())
+
+
+def _dispatch_query(execute, sql, params, many, context):
+    for hook in reversed(_query_hooks.get()):
+        execute = partial(hook, execute)
+    return execute(sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_dispatch(sender, connection, **kwargs):
+    if _dispatch_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _dispatch_query)
+
+
+@contextmanager
+def recording_queries(hook):
+    """Passes every query run in this context, on any connection or thread, through `hook`."""
+    for connection in connections.all(initialized_only=True):
+        install_query_dispatch(None, connection)
+    token = _query_hooks.set(_query_hooks.get() + (hook,))
+    try:
+        yield hook
+    finally:
+        _query_hooks.reset(token)
+
+
+class QueryRecorder:
+    """connection.execute_wrapper hook counting queries and their time, keeping the slow ones."""
+
+    def __init__(self, slow_threshold):
+        self.slow_threshold = slow_threshold
+        self.count = 0
+        self.duration = 0.0
+        self.slow = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            if elapsed >= self.slow_threshold:
+                self.slow.append((elapsed, sql[:SQL_LOG_LENGTH]))
+
+
+def view_labels(view_func, method):
+    """(view, action, method) for a resolved view: the viewset class and action, or the function name."""
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        return (view_func.__name__, '', method)
+    actions = getattr(view_func, 'actions', None) or {}
+    return (view_class.__name__, actions.get(method.lower(), method.lower()), method)
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Measures every request: total time, query count and database time
+    (through an execute wrapper, so DEBUG is not needed), response rendering
+    time and body size. Rendering is the renderer turning response.data into
+    bytes; serializer.data runs inside the view and counts as "app". Results
+    are aggregated in `metrics`, announced in a Server-Timing header and
+    written to the 'registry.slow' logger as JSON when a request or query
+    crosses SLOW_REQUEST_MS / SLOW_QUERY_MS.
+
+    Installed first in MIDDLEWARE so the timings cover the whole stack. Sync
+    and async capable, so ASGI requests stay on the event loop.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        recorder, started = self.start(request)
+        with recording_queries(recorder):
+            response = self.get_response(request)
+        return self.finish(request, response, recorder, started)
+
+    async def __acall__(self, request):
+        recorder, started = self.start(request)
+        with recording_queries(recorder):
+            response = await self.get_response(request)
+        return self.finish(request, response, recorder, started)
+
+    def start(self, request):
+        request._instrumentation = {'labels': ('unmatched', '', request.method), 'render': 0.0}
+        return QueryRecorder(settings.SLOW_QUERY_MS / 1000), time.perf_counter()
+
+    def finish(self, request, response, recorder, started):
+        duration = time.perf_counter() - started
+        state = request._instrumentation
+        size = 0 if response.streaming else len(response.content)
+        slow = duration * 1000 >= settings.SLOW_REQUEST_MS
+        metrics.record(
+            state['labels'], response.status_code, duration, recorder.count, recorder.duration,
+            state['render'], size, slow,
+        )
+
+        if settings.SERVER_TIMING:
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries"',
+                f'render;dur={state["render"] * 1000:.1f}',
+                f'app;dur={(duration - recorder.duration - state["render"]) * 1000:.1f}',
+                f'total;dur={duration * 1000:.1f}',
+            ])
+
+        view, action, method = state['labels']
+        context = {'view': view, 'action': action, 'method': method, 'path': request.path}
+        for elapsed, sql in recorder.slow:
+            slow_log.warning(json.dumps({'event': 'slow_query', **context, 'ms': round(elapsed * 1000, 1), 'sql': sql}))
+        if slow:
+            slow_log.warning(json.dumps({
+                'event': 'slow_request', **context, 'status': response.status_code,
+                'ms': round(duration * 1000, 1), 'queries': recorder.count, 'db_ms': round(recorder.duration * 1000, 1),
+                'render_ms': round(state['render'] * 1000, 1), 'bytes': size, 'slow_queries': len(recorder.slow),
+            }))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._instrumentation['labels'] = view_labels(view_func, request.method)
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered (response.data to JSON) right after the
+        # template response hooks; time it up to the post-render callback
+        state = request._instrumentation
+        started = time.perf_counter()
+
+        def rendered(response):
+            state['render'] += time.perf_counter() - started
+        response.add_post_render_callback(rendered)
+        return response
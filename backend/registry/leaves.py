@@ -0,0 +1,59 @@
+from datetime import time
+
+from django.conf import settings
+from django.db.models import Q
+
+from .models import User, LeaveRequest
+
+
+def overlapping(queryset, date_from, date_to):
+    """
+    Leaves in `queryset` sharing at least one day with [date_from, date_to].
+    The end_date bound is the range scan on leave_status_end_idx; start_date
+    is checked from the same index entries.
+    """
+    return queryset.filter(end_date__gte=date_from, start_date__lte=date_to)
+
+
+def period_times(hour):
+    start, end = settings.PERIOD_TIMES[hour - 1]
+    return time.fromisoformat(start), time.fromisoformat(end)
+
+
+def on_leave(queryset, day, hour=None):
+    """
+    Approved leaves in `queryset` covering `day`, or only its timetable `hour`
+    when given. Part-day leaves (start_time on the first day, end_time on the
+    last) cover the hours whose period overlaps them.
+    """
+    queryset = overlapping(queryset.filter(status=LeaveRequest.LeaveStatus.APPROVED), day, day)
+    if hour is not None:
+        period_start, period_end = period_times(hour)
+        queryset = queryset.filter(
+            Q(start_date__lt=day) | Q(start_time__isnull=True) | Q(start_time__lt=period_end),
+            Q(end_date__gt=day) | Q(end_time__isnull=True) | Q(end_time__gt=period_start),
+        )
+    return queryset
+
+
+def students_on_leave(day, hour=None, student_ids=None):
+    """Set of student ids on approved leave on `day` (and `hour`), in one indexed query."""
+    queryset = LeaveRequest.objects.all()
+    if student_ids is not None:
+        queryset = queryset.filter(student_id__in=student_ids)
+    return set(on_leave(queryset, day, hour).values_list('student_id', flat=True))
+
+
+def scope_leaves(queryset, user):
+    """
+    Role-scoped leave visibility: students see their own, HODs their
+    department's and the ones they mentor, other staff the ones they mentor,
+    deans and admins everything.
+    """
+    if user.is_superuser or user.role in (User.Role.ADMIN, User.Role.DEAN):
+        return queryset
+    if user.role == User.Role.STUDENT:
+        return queryset.filter(student=user)
+    if user.role == User.Role.HOD and user.department:
+        return queryset.filter(Q(mentor=user) | Q(student__department=user.department))
+    return queryset.filter(mentor=user)
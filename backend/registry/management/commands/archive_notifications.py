@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from registry.models import Notification
+from registry.notifications import archive_notifications
+
+
+class Command(BaseCommand):
+    help = 'Moves notifications past the retention window into the archive table in short chunked transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=getattr(settings, 'NOTIFICATION_RETENTION_DAYS', 90),
+                            help='Keep notifications newer than this many days')
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--pause', type=float, default=0, help='Seconds to sleep between chunks')
+        parser.add_argument('--purge', action='store_true', help='Delete without copying to the archive')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows would move')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        if options['dry_run']:
+            count = Notification.objects.filter(timestamp__lt=cutoff).count()
+            self.stdout.write(f'{count} notifications older than {cutoff:%Y-%m-%d} would be moved')
+            return
+
+        moved = 0
+        for chunk in archive_notifications(
+            cutoff, chunk_size=options['chunk_size'], pause=options['pause'], archive=not options['purge']
+        ):
+            moved += chunk
+            if options['verbosity'] > 1:
+                self.stdout.write(f'  {moved} moved')
+        verb = 'Purged' if options['purge'] else 'Archived'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {moved} notifications older than {cutoff:%Y-%m-%d}'))
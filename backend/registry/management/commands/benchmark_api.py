@@ -0,0 +1,182 @@
+import json
+import statistics
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from rest_framework.test import APIClient
+
+from registry.models import User
+from registry.synthetic import SyntheticDataset
+
+API = '/api/registry'
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'api_baseline.json'
+SCALE_OPTIONS = ('departments', 'students_per_year', 'staff_per_department', 'days', 'seed')
+
+# name -> (method, path, client role); {student} is replaced per iteration
+SCENARIOS = {
+    'users': ('get', '/users/', 'admin'),
+    'users-academic-data': ('get', '/users/{student}/academic_data/', 'admin'),
+    'attendance': ('get', '/attendance/', 'admin'),
+    'attendance-bulk-create': ('post', '/attendance/bulk_create/', 'staff'),
+    'mark-batches': ('get', '/mark-batches/', 'admin'),
+    'leaves': ('get', '/leaves/', 'admin'),
+    'notifications': ('get', '/notifications/', 'student'),
+    'tasks': ('get', '/tasks/', 'admin'),
+}
+
+
+def percentile(samples, pct):
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method='inclusive')[pct - 1]
+
+
+class Command(BaseCommand):
+    help = ('Benchmarks the hot registry endpoints in-process on a synthetic dataset and compares '
+            'latency percentiles, query counts and response sizes against a stored baseline. '
+            'Run with --settings=core.settings_benchmark to use a local SQLite database. '
+            'Latencies depend on the machine, so no baseline is committed: CI checks out the base '
+            'branch and runs --save-baseline, then checks out the PR branch and runs the comparison '
+            'on the same runner with the same scale options.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--departments', type=int, default=4)
+        parser.add_argument('--students-per-year', type=int, default=100)
+        parser.add_argument('--staff-per-department', type=int, default=15)
+        parser.add_argument('--days', type=int, default=30)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--iterations', type=int, default=30, help='Timed requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed requests per endpoint first')
+        parser.add_argument('--only', nargs='*', choices=sorted(SCENARIOS), help='Benchmark only these endpoints')
+        parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+        parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Allowed p95 latency growth over the baseline (0.25 = 25%%)')
+        parser.add_argument('--size-tolerance', type=float, default=0.10,
+                            help='Allowed response size growth over the baseline')
+        parser.add_argument('--keepdb', action='store_true', help='Reuse the test database and its generated data')
+
+    def handle(self, *args, **options):
+        # Checked before the run so a missing baseline fails fast rather than passing silently
+        if not options['save_baseline'] and not options['baseline'].exists():
+            raise CommandError(f'No baseline at {options["baseline"]}; run with --save-baseline to record one')
+        runner = DiscoverRunner(verbosity=0, keepdb=options['keepdb'])
+        setup_test_environment()
+        old_config = runner.setup_databases()
+        try:
+            self.prepare(options)
+            results = self.run_scenarios(options)
+        finally:
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+        self.report(results)
+        scale = {name: options[name] for name in SCALE_OPTIONS}
+        if options['save_baseline']:
+            options['baseline'].parent.mkdir(parents=True, exist_ok=True)
+            options['baseline'].write_text(json.dumps({'scale': scale, 'results': results}, indent=2) + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Baseline written to {options["baseline"]}'))
+            return
+        self.compare(results, scale, options)
+
+    def prepare(self, options):
+        dataset = SyntheticDataset(
+            departments=options['departments'],
+            students_per_year=options['students_per_year'],
+            staff_per_department=options['staff_per_department'],
+            days=options['days'],
+            seed=options['seed'],
+            prefix='bench',
+            log=lambda message: self.stdout.write(f'  {message}'),
+        )
+        if not dataset.exists():
+            self.stdout.write('Generating benchmark dataset...')
+            dataset.generate()
+
+        admin, _ = User.objects.get_or_create(
+            username='bench_admin', defaults={'role': 'ADMIN', 'is_staff': True, 'is_superuser': True}
+        )
+        students = User.objects.filter(username__startswith='bench_', role='STUDENT').order_by('id')
+        self.students = list(students.values_list('id', flat=True))
+        self.clients = {'admin': APIClient(), 'staff': APIClient(), 'student': APIClient()}
+        self.clients['admin'].force_authenticate(admin)
+        self.clients['staff'].force_authenticate(User.objects.get(id=students.first().mentor_id))
+        self.clients['student'].force_authenticate(students.first())
+
+        # One class of students re-marked for the last generated day (updates after the first run)
+        first = students.first()
+        day = dataset.school_days()[-1].isoformat()
+        self.attendance_payload = [
+            {
+                'user': student_id, 'date': day, 'is_present': True,
+                'hours': [{'hour': hour, 'status': 'PRESENT'} for hour in range(1, len(settings.PERIOD_TIMES) + 1)],
+            }
+            for student_id in students.filter(
+                department=first.department, study_year=first.study_year
+            ).values_list('id', flat=True)
+        ]
+
+    def run_scenarios(self, options):
+        results = {}
+        for name, (method, path, role) in SCENARIOS.items():
+            if options['only'] and name not in options['only']:
+                continue
+            client = self.clients[role]
+            timings, queries, sizes = [], [], []
+            for iteration in range(options['warmup'] + options['iterations']):
+                url = API + path.format(student=self.students[iteration % len(self.students)])
+                kwargs = {'data': self.attendance_payload, 'format': 'json'} if method == 'post' else {}
+                with CaptureQueriesContext(connection) as ctx:
+                    started = time.perf_counter()
+                    response = getattr(client, method)(url, **kwargs)
+                    elapsed = time.perf_counter() - started
+                if response.status_code != 200:
+                    raise CommandError(f'{url} returned {response.status_code}')
+                if iteration >= options['warmup']:
+                    timings.append(elapsed * 1000)
+                    queries.append(len(ctx.captured_queries))
+                    sizes.append(len(response.content))
+            results[name] = {
+                'p50': round(percentile(timings, 50), 2),
+                'p95': round(percentile(timings, 95), 2),
+                'p99': round(percentile(timings, 99), 2),
+                'queries': max(queries),
+                'bytes': max(sizes),
+            }
+        return results
+
+    def report(self, results):
+        self.stdout.write(f'{"endpoint":<24} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"queries":>8} {"bytes":>9}')
+        for name, row in results.items():
+            self.stdout.write(
+                f'{name:<24} {row["p50"]:>9.2f} {row["p95"]:>9.2f} {row["p99"]:>9.2f} {row["queries"]:>8} {row["bytes"]:>9}'
+            )
+
+    def compare(self, results, scale, options):
+        baseline = json.loads(options['baseline'].read_text())
+        if baseline['scale'] != scale:
+            raise CommandError(f'Baseline was recorded at a different scale: {baseline["scale"]}')
+
+        failures = []
+        for name, row in results.items():
+            expected = baseline['results'].get(name)
+            if expected is None:
+                failures.append(f'{name}: not in the baseline; run with --save-baseline to record it')
+                continue
+            if row['queries'] > expected['queries']:
+                failures.append(f'{name}: {row["queries"]} queries, baseline {expected["queries"]}')
+            if row['p95'] > expected['p95'] * (1 + options['tolerance']):
+                failures.append(f'{name}: p95 {row["p95"]:.2f} ms, baseline {expected["p95"]:.2f} ms')
+            if row['bytes'] > expected['bytes'] * (1 + options['size_tolerance']):
+                failures.append(f'{name}: {row["bytes"]} bytes, baseline {expected["bytes"]}')
+
+        if failures:
+            for failure in failures:
+                self.stderr.write(f'REGRESSION {failure}')
+            raise CommandError(f'{len(failures)} regression(s) against {options["baseline"]}')
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
@@ -0,0 +1,134 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+from django.test.runner import DiscoverRunner
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from registry.models import (
+    User, AcademicTask, AttendanceRecord, MarkRecord, LeaveRequest, Timetable, Notification
+)
+from registry.synthetic import SyntheticDataset
+
+
+class Command(BaseCommand):
+    help = 'Loads a synthetic dataset into the test database and compares hot registry queries with and without the access-path indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--departments', type=int, default=8)
+        parser.add_argument('--students-per-year', type=int, default=50, help='Students per department and year')
+        parser.add_argument('--days', type=int, default=60, help='School days of attendance per student')
+        parser.add_argument('--repeat', type=int, default=25, help='Timed runs per query')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--keepdb', action='store_true', help='Reuse the test database between runs')
+        parser.add_argument('--no-plans', action='store_true', help='Only print latencies, not query plans')
+
+    def handle(self, *args, **options):
+        runner = DiscoverRunner(verbosity=0, keepdb=options['keepdb'])
+        setup_test_environment()
+        old_config = runner.setup_databases()
+        try:
+            self.run(options)
+        finally:
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+    def run(self, options):
+        started = time.perf_counter()
+        dataset = SyntheticDataset(
+            departments=options['departments'], students_per_year=options['students_per_year'],
+            days=options['days'], seed=options['seed'], prefix='bench',
+        )
+        dataset.generate()
+        sample = self.sample(dataset)
+        self.stdout.write(f'Loaded dataset in {time.perf_counter() - started:.1f}s')
+
+        queries = self.queries(sample)
+        indexed_models = [AcademicTask, AttendanceRecord, MarkRecord, LeaveRequest, Timetable, Notification]
+
+        with connection.schema_editor() as editor:
+            for model in indexed_models:
+                for index in model._meta.indexes:
+                    editor.remove_index(model, index)
+        self.analyze(indexed_models)
+        before = self.measure(queries, options)
+
+        with connection.schema_editor() as editor:
+            for model in indexed_models:
+                for index in model._meta.indexes:
+                    editor.add_index(model, index)
+        self.analyze(indexed_models)
+        after = self.measure(queries, options)
+
+        self.stdout.write('')
+        self.stdout.write(f'{"query":<28} {"rows":>6} {"before ms":>10} {"after ms":>10} {"speedup":>8}')
+        for name in queries:
+            (rows, before_ms, before_plan), (_, after_ms, after_plan) = before[name], after[name]
+            speedup = before_ms / after_ms if after_ms else float('inf')
+            self.stdout.write(f'{name:<28} {rows:>6} {before_ms:>10.3f} {after_ms:>10.3f} {speedup:>7.1f}x')
+            if not options['no_plans']:
+                self.stdout.write(f'    before: {before_plan}')
+                self.stdout.write(f'    after:  {after_plan}')
+
+    def analyze(self, models):
+        # Refresh planner statistics the way a long-running database would have them
+        with connection.cursor() as cursor:
+            if connection.vendor == 'mysql':
+                cursor.execute('ANALYZE TABLE ' + ', '.join(connection.ops.quote_name(m._meta.db_table) for m in models))
+            elif connection.vendor in ('sqlite', 'postgresql'):
+                cursor.execute('ANALYZE')
+
+    def queries(self, sample):
+        student, mentor, subject, batch, day, department = (
+            sample['student'], sample['mentor'], sample['subject'], sample['batch'], sample['day'], sample['department']
+        )
+        return {
+            'task_dept_year': lambda: AcademicTask.objects.filter(department=department, study_year='1st Year'),
+            'attendance_date': lambda: AttendanceRecord.objects.filter(date=day),
+            'attendance_user_range': lambda: AttendanceRecord.objects.filter(
+                user_id=student, date__range=(day - timedelta(days=30), day)
+            ),
+            'marks_student_subject': lambda: MarkRecord.objects.filter(student_id=student, subject_id=subject),
+            'marks_batch_subject': lambda: MarkRecord.objects.filter(batch_id=batch, subject_id=subject),
+            'notifications_unread': lambda: Notification.objects.filter(
+                user_id=student, read=False
+            ).order_by('-timestamp')[:20],
+            'leaves_mentor_pending': lambda: LeaveRequest.objects.filter(mentor_id=mentor, status='PENDING'),
+            'leaves_student_upcoming': lambda: LeaveRequest.objects.filter(student_id=student, start_date__gte=day),
+            'timetable_dept_year': lambda: Timetable.objects.filter(department=department, study_year='1st Year'),
+        }
+
+    def measure(self, queries, options):
+        results = {}
+        for name, build in queries.items():
+            # Time the raw SQL so model instantiation does not hide the index effect
+            sql, params = build().query.sql_with_params()
+            timings = []
+            with connection.cursor() as cursor:
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    cursor.execute(sql, params)
+                    rows = len(cursor.fetchall())
+                    timings.append((time.perf_counter() - started) * 1000)
+            plan = '' if options['no_plans'] else ' | '.join(build().explain().splitlines())
+            results[name] = (rows, statistics.median(timings), plan)
+        return results
+
+    def sample(self, dataset):
+        # A student from the middle of the generated rows, and the mentor with the most pending leaves
+        students = [user_id for user_ids in dataset.students.values() for user_id in user_ids]
+        student = students[len(students) // 2]
+        record = MarkRecord.objects.filter(student_id=student).order_by('batch_id', 'subject_id').first()
+        days = dataset.school_days()
+        return {
+            'student': student,
+            'mentor': LeaveRequest.objects.filter(status='PENDING').values('mentor_id').annotate(n=Count('id'))
+            .order_by('-n').values_list('mentor_id', flat=True).first(),
+            'subject': record.subject_id,
+            'batch': record.batch_id,
+            'day': days[len(days) // 2],
+            'department': User.objects.get(pk=student).department,
+        }
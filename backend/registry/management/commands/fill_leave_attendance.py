@@ -0,0 +1,72 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from registry.attendance import BULK_BATCH_SIZE, fill_leave_hours, leave_hours
+from registry.models import User, AttendanceRecord
+from registry.summary import rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = 'Back-fills HourAttendance from approved leaves for attendance records in a date range'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='date_from', type=date.fromisoformat, required=True, help='YYYY-MM-DD')
+        parser.add_argument('--to', dest='date_to', type=date.fromisoformat, required=True, help='YYYY-MM-DD')
+        parser.add_argument('--department')
+        parser.add_argument('--study-year')
+        parser.add_argument('--create-records', action='store_true',
+                            help='Also create absent attendance records for leave days that have none')
+        parser.add_argument('--chunk-size', type=int, default=BULK_BATCH_SIZE, help='Records per transaction')
+
+    def handle(self, *args, **options):
+        date_from, date_to = options['date_from'], options['date_to']
+        if date_from > date_to:
+            raise CommandError('--to must not be before --from')
+
+        records = AttendanceRecord.objects.filter(date__gte=date_from, date__lte=date_to)
+        if options['department']:
+            records = records.filter(user__department=options['department'])
+        if options['study_year']:
+            records = records.filter(user__study_year=options['study_year'])
+
+        if options['create_records']:
+            created = self.create_records(records, date_from, date_to, options)
+            self.stdout.write(f'Created {created} attendance records for leave days')
+
+        written, last_pk = 0, 0
+        while True:
+            chunk = list(
+                records.filter(pk__gt=last_pk).order_by('pk')
+                .values_list('pk', 'user_id', 'date')[:options['chunk_size']]
+            )
+            if not chunk:
+                break
+            with transaction.atomic():
+                written += fill_leave_hours({(user_id, day): pk for pk, user_id, day in chunk})
+            last_pk = chunk[-1][0]
+        self.stdout.write(self.style.SUCCESS(f'Filled {written} leave hours between {date_from} and {date_to}'))
+
+    @transaction.atomic
+    def create_records(self, records, date_from, date_to, options):
+        student_ids = None
+        if options['department'] or options['study_year']:
+            students = User.objects.all()
+            if options['department']:
+                students = students.filter(department=options['department'])
+            if options['study_year']:
+                students = students.filter(study_year=options['study_year'])
+            student_ids = list(students.values_list('id', flat=True))
+
+        covered = leave_hours(student_ids, date_from, date_to)
+        existing = set(records.values_list('user_id', 'date'))
+        missing = [key for key in covered if key not in existing]
+        AttendanceRecord.objects.bulk_create(
+            [AttendanceRecord(user_id=user_id, date=day, is_present=False) for user_id, day in missing],
+            batch_size=BULK_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        # bulk_create bypasses the model signals that keep summaries current
+        rebuild_summaries({user_id for user_id, _ in missing})
+        return len(missing)
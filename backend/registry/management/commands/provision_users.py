@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from registry.provisioning import hash_workers, provision_users, read_user_file, validate_user_rows
+
+
+class Command(BaseCommand):
+    help = 'Creates users from a .csv, .xlsx or .json file, hashing passwords across worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--workers', type=int, default=None, help='Hashing processes (default PROVISION_HASH_WORKERS)')
+        parser.add_argument('--atomic', action='store_true', help='Create nothing if any row is invalid')
+        parser.add_argument('--dry-run', action='store_true', help='Only validate')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], 'rb') as upload:
+                rows = read_user_file(upload)
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        started = time.perf_counter()
+        valid, errors = validate_user_rows(rows)
+        created = {}
+        if not options['dry_run'] and not (options['atomic'] and errors):
+            created, conflicts = provision_users(valid, workers=hash_workers(options['workers']), atomic=options['atomic'])
+            errors.update(conflicts)
+
+        for index, row_errors in sorted(errors.items(), key=lambda item: -1 if item[0] is None else item[0]):
+            self.stderr.write(f'Row {index}: {row_errors}')
+        if options['atomic'] and errors:
+            raise CommandError(f'{len(errors)} invalid rows; no users were created')
+        verb = 'Validated' if options['dry_run'] else 'Created'
+        count = len(valid) if options['dry_run'] else len(created)
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {count} users, {len(errors)} errors in {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from registry.summary import rebuild_summaries, verify_summaries
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds or verifies the per-student academic summaries behind academic_data'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', nargs='+', type=int, help='Only these user ids (default: every student with records)')
+        parser.add_argument('--verify', action='store_true', help='Report drifted summaries without writing')
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        user_ids, chunk_size = options['users'], options['chunk_size']
+
+        if options['verify']:
+            drifted = 0
+            for user_id, stored, expected in verify_summaries(user_ids, chunk_size=chunk_size):
+                drifted += 1
+                self.stdout.write(f'user {user_id}: stored={stored} expected={expected}')
+            if drifted:
+                raise CommandError(f'{drifted} summaries out of date; run without --verify to rebuild')
+            self.stdout.write(self.style.SUCCESS('All summaries match the source tables'))
+            return
+
+        written = rebuild_summaries(user_ids, chunk_size=chunk_size)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} summaries'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from registry.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the user typeahead index (needed after bulk user writes, which skip signals)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        indexed = rebuild_search_index(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} users'))
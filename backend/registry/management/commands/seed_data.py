@@ -1,7 +1,8 @@
 import os
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 from datetime import date, timedelta, time
+from registry.synthetic import SyntheticDataset
 from registry.models import (
     User, Course, Subject, AcademicTask, AttendanceRecord, HourAttendance,
     MarkBatch, MarkRecord, LeaveRequest, Timetable, HourAssignment, SiteSettings,
@@ -12,9 +13,61 @@ from django.contrib.auth import get_user_model
 User = get_user_model()
 
 class Command(BaseCommand):
-    help = 'Seeds full institutional data for parity with frontend'
+    help = 'Seeds full institutional data for parity with frontend, optionally with a generated load-test dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--no-demo', action='store_true', help='Skip the demo accounts and records.')
+        parser.add_argument('--departments', type=int, default=0,
+                            help='Generate this many departments of synthetic data (0 disables generation).')
+        parser.add_argument('--students-per-year', type=int, default=60)
+        parser.add_argument('--staff-per-department', type=int, default=15)
+        parser.add_argument('--days', type=int, default=60, help='School days of attendance, ending at --end-date.')
+        parser.add_argument('--hours', type=int, default=None, help='Hours per day, default one per PERIOD_TIMES entry.')
+        parser.add_argument('--subjects-per-semester', type=int, default=5)
+        parser.add_argument('--leaves-per-student', type=int, default=2)
+        parser.add_argument('--tasks-per-subject', type=int, default=2)
+        parser.add_argument('--notifications-per-user', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; the same seed yields the same data.')
+        parser.add_argument('--end-date', type=date.fromisoformat, default=None, help='YYYY-MM-DD, default today.')
+        parser.add_argument('--prefix', default='gen', help='Username prefix marking generated rows.')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert transaction.')
+        parser.add_argument('--reset', action='store_true', help='Delete a previous run with the same prefix first.')
 
     def handle(self, *args, **options):
+        if not options['no_demo']:
+            self.seed_demo()
+        if options['departments'] > 0:
+            self.generate(options)
+
+    def generate(self, options):
+        dataset = SyntheticDataset(
+            departments=options['departments'],
+            students_per_year=options['students_per_year'],
+            staff_per_department=options['staff_per_department'],
+            days=options['days'],
+            hours=options['hours'],
+            subjects_per_semester=options['subjects_per_semester'],
+            leaves_per_student=options['leaves_per_student'],
+            tasks_per_subject=options['tasks_per_subject'],
+            notifications_per_user=options['notifications_per_user'],
+            seed=options['seed'],
+            end_date=options['end_date'],
+            prefix=options['prefix'],
+            batch_size=options['batch_size'],
+            log=self.stdout.write,
+        )
+        if dataset.exists():
+            if not options['reset']:
+                raise CommandError(f'Generated data with prefix "{options["prefix"]}" exists; pass --reset to replace it.')
+            self.stdout.write(f'Deleted {dataset.delete()} rows from the previous run')
+
+        self.stdout.write('Generating synthetic data...')
+        counts = dataset.generate()
+        for model_name, count in counts.items():
+            self.stdout.write(f'  {model_name:<24} {count:>10}')
+        self.stdout.write(self.style.SUCCESS(f'Generated {sum(counts.values())} rows'))
+
+    def seed_demo(self):
         self.stdout.write('Seeding full data...')
 
         # 1. Site Settings
@@ -32,7 +85,7 @@ class Command(BaseCommand):
             username='admin',
             email='admin@bitsathy.ac.in',
             defaults={
-                'name': 'CHIEF ADMINISTRATOR',
+                'first_name': 'CHIEF ADMINISTRATOR',
                 'role': 'ADMIN',
                 'department': 'System Governance',
                 'is_staff': True,
@@ -46,7 +99,7 @@ class Command(BaseCommand):
             username='dean_saravanan',
             email='dean.bits@bitsathy.ac.in',
             defaults={
-                'name': 'DR. K. SARAVANAN',
+                'first_name': 'DR. K. SARAVANAN',
                 'role': 'DEAN',
                 'designation': 'Dean / Academic Director',
                 'experience': '22'
@@ -59,7 +112,7 @@ class Command(BaseCommand):
             username='prakash_raj',
             email='prakash.stf.ad@bitsathy.ac.in',
             defaults={
-                'name': 'MR. PRAKASH RAJ',
+                'first_name': 'MR. PRAKASH RAJ',
                 'role': 'STAFF',
                 'department': 'Artificial Intelligence & Data Science (B.Tech)',
                 'designation': 'Assistant Professor',
@@ -73,7 +126,7 @@ class Command(BaseCommand):
             username='jai_akash',
             email='jai.std.ad@bitsathy.ac.in',
             defaults={
-                'name': 'JAI AKASH S R',
+                'first_name': 'JAI AKASH S R',
                 'role': 'STUDENT',
                 'department': 'Artificial Intelligence & Data Science (B.Tech)',
                 'study_year': '1st Year',
@@ -0,0 +1,181 @@
+from itertools import islice
+
+from django.db import transaction
+
+from .models import User, Subject, MarkBatch, MarkRecord
+from .serializers import MarkBulkRowSerializer
+from .sheets import read_sheet
+from .summary import rebuild_summaries
+from .upserts import upsert_options
+
+BULK_BATCH_SIZE = 1000
+LOCKED_BATCH_STATUSES = MarkBatch.LOCKED_STATUSES
+
+
+def validate_mark_rows(rows, start=0):
+    """
+    Validates bulk mark rows with set-based lookups (one query per referenced
+    table). Rows for FROZEN/BLOCKED batches and duplicate (batch, student,
+    subject) triples are rejected. `start` offsets the returned indexes so
+    chunks of a larger upload keep their position.
+
+    Returns `(valid, errors)` keyed by row index.
+    """
+    valid, errors = {}, {}
+    for offset, row in enumerate(rows):
+        serializer = MarkBulkRowSerializer(data=row)
+        if serializer.is_valid():
+            valid[start + offset] = serializer.validated_data
+        else:
+            errors[start + offset] = serializer.errors
+
+    batches = dict(
+        MarkBatch.objects.filter(id__in={data['batch'] for data in valid.values()}).values_list('id', 'status')
+    )
+    students = set(User.objects.filter(id__in={data['student'] for data in valid.values()}).values_list('id', flat=True))
+    subjects = set(Subject.objects.filter(id__in={data['subject'] for data in valid.values()}).values_list('id', flat=True))
+
+    seen = set()
+    for index, data in list(valid.items()):
+        key = (data['batch'], data['student'], data['subject'])
+        if data['batch'] not in batches:
+            errors[index] = {'batch': [f'Invalid pk "{data["batch"]}" - object does not exist.']}
+        elif batches[data['batch']] in LOCKED_BATCH_STATUSES:
+            errors[index] = {'batch': [f'Mark batch is {batches[data["batch"]].lower()}; marks cannot be changed.']}
+        elif data['student'] not in students:
+            errors[index] = {'student': [f'Invalid pk "{data["student"]}" - object does not exist.']}
+        elif data['subject'] not in subjects:
+            errors[index] = {'subject': [f'Invalid pk "{data["subject"]}" - object does not exist.']}
+        elif key in seen:
+            errors[index] = {'non_field_errors': ['Duplicate batch, student and subject in payload.']}
+        else:
+            seen.add(key)
+            continue
+        del valid[index]
+    return valid, errors
+
+
+@transaction.atomic
+def upsert_marks(valid, updated_by=None):
+    """
+    Upserts validated rows on the (batch, student, subject) constraint.
+    Returns a dict of row index -> (status, record id).
+    """
+    if not valid:
+        return {}
+
+    keys = {(data['batch'], data['student'], data['subject']) for data in valid.values()}
+    lookup = dict(
+        batch_id__in={key[0] for key in keys},
+        student_id__in={key[1] for key in keys},
+        subject_id__in={key[2] for key in keys},
+    )
+    existing = set(MarkRecord.objects.filter(**lookup).values_list('batch_id', 'student_id', 'subject_id'))
+
+    MarkRecord.objects.bulk_create(
+        [
+            MarkRecord(
+                batch_id=data['batch'],
+                student_id=data['student'],
+                subject_id=data['subject'],
+                marks=data['marks'],
+                max_marks=data['max_marks'],
+                updated_by=updated_by,
+            )
+            for data in valid.values()
+        ],
+        batch_size=BULK_BATCH_SIZE,
+        **upsert_options(
+            MarkRecord, ['batch', 'student', 'subject'], ['marks', 'max_marks', 'updated_by', 'updated_at']
+        ),
+    )
+
+    # bulk_create does not return primary keys on MySQL, so read them back once
+    ids = {
+        (batch_id, student_id, subject_id): pk
+        for pk, batch_id, student_id, subject_id in MarkRecord.objects.filter(**lookup).values_list(
+            'id', 'batch_id', 'student_id', 'subject_id'
+        )
+        if (batch_id, student_id, subject_id) in keys
+    }
+
+    # bulk_create bypasses the model signals that keep summaries current
+    rebuild_summaries(lookup['student_id__in'])
+
+    results = {}
+    for index, data in valid.items():
+        key = (data['batch'], data['student'], data['subject'])
+        results[index] = ('updated' if key in existing else 'created', ids[key])
+    return results
+
+
+# --- Spreadsheet import ---
+
+def read_mark_sheet(upload):
+    """Rows of an uploaded CSV or XLSX mark sheet, read lazily (see sheets.read_sheet)."""
+    return read_sheet(upload, 'mark sheet')
+
+
+def _resolve_sheet_rows(rows, batch_id):
+    """
+    Maps sheet columns (reg_no or student, subject_code or subject, marks,
+    max_marks, optional batch) onto bulk row ids with two set-based lookups.
+    Returns the mapped rows and {offset: errors} for unknown reg_no/codes.
+    """
+    reg_nos = {str(row['reg_no']).strip() for row in rows if row.get('reg_no')}
+    codes = {str(row['subject_code']).strip() for row in rows if row.get('subject_code')}
+    students = dict(User.objects.filter(reg_no__in=reg_nos).values_list('reg_no', 'id')) if reg_nos else {}
+    subjects = dict(Subject.objects.filter(code__in=codes).values_list('code', 'id')) if codes else {}
+
+    resolved, unresolved = [], {}
+    for offset, row in enumerate(rows):
+        data = {
+            'batch': row.get('batch') or batch_id,
+            'student': row.get('student'),
+            'subject': row.get('subject'),
+            'marks': row.get('marks'),
+        }
+        if row.get('max_marks') not in (None, ''):
+            data['max_marks'] = row['max_marks']
+        if row.get('reg_no'):
+            data['student'] = students.get(str(row['reg_no']).strip())
+            if data['student'] is None:
+                unresolved[offset] = {'reg_no': [f'No student with reg_no "{row["reg_no"]}".']}
+        if row.get('subject_code'):
+            data['subject'] = subjects.get(str(row['subject_code']).strip())
+            if data['subject'] is None:
+                unresolved[offset] = {'subject_code': [f'No subject with code "{row["subject_code"]}".']}
+        resolved.append(data)
+    return resolved, unresolved
+
+
+def import_mark_sheet(upload, batch_id=None, updated_by=None, chunk_size=BULK_BATCH_SIZE, atomic=False):
+    """
+    Streams a CSV/XLSX mark sheet into MarkRecord in chunks of `chunk_size`
+    rows inside one transaction. With `atomic`, any invalid row rolls the
+    whole import back.
+
+    Returns `(results, errors)` keyed by data-row index (0 = first row after
+    the header).
+    """
+    results, errors = {}, {}
+    rows = read_mark_sheet(upload)
+    with transaction.atomic():
+        start = 0
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            resolved, unresolved = _resolve_sheet_rows(chunk, batch_id)
+            valid, chunk_errors = validate_mark_rows(resolved, start=start)
+            for offset, error in unresolved.items():
+                valid.pop(start + offset, None)
+                chunk_errors[start + offset] = error
+            errors.update(chunk_errors)
+            if not (atomic and errors):
+                results.update(upsert_marks(valid, updated_by=updated_by))
+            start += len(chunk)
+        if atomic and errors:
+            transaction.set_rollback(True)
+            results = {}
+    return results, errors
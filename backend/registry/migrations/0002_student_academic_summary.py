@@ -0,0 +1,50 @@
+# Generated by Django 5.0.2 on 2026-10-16 20:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_summaries(apps, schema_editor):
+    AttendanceRecord = apps.get_model('registry', 'AttendanceRecord')
+    MarkRecord = apps.get_model('registry', 'MarkRecord')
+    StudentAcademicSummary = apps.get_model('registry', 'StudentAcademicSummary')
+
+    summaries = {}
+    attendance = AttendanceRecord.objects.values('user_id').annotate(
+        total=Count('id'), present=Count('id', filter=Q(is_present=True))
+    )
+    for row in attendance:
+        summary = summaries.setdefault(row['user_id'], StudentAcademicSummary(user_id=row['user_id']))
+        summary.present_days, summary.total_days = row['present'], row['total']
+    marks = MarkRecord.objects.values('student_id').annotate(mark_sum=Sum('marks'), mark_count=Count('id'))
+    for row in marks:
+        summary = summaries.setdefault(row['student_id'], StudentAcademicSummary(user_id=row['student_id']))
+        summary.mark_sum, summary.mark_count = row['mark_sum'] or 0, row['mark_count']
+    StudentAcademicSummary.objects.bulk_create(summaries.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentAcademicSummary',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='academic_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('present_days', models.IntegerField(default=0)),
+                ('total_days', models.IntegerField(default=0)),
+                ('mark_sum', models.FloatField(default=0)),
+                ('mark_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Student Academic Summaries',
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
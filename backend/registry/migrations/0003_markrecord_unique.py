@@ -0,0 +1,46 @@
+# Generated by Django 5.0.2 on 2026-10-16 20:35
+
+from django.db import migrations
+from django.db.models import Count
+
+REPORT_LIMIT = 20
+
+
+def check_duplicate_marks(apps, schema_editor):
+    # Duplicate (batch, student, subject) rows would break the unique
+    # constraint. Which mark is right is for an admin to decide, so report
+    # them and stop rather than discard any
+    MarkRecord = apps.get_model('registry', 'MarkRecord')
+    key = ('batch_id', 'student_id', 'subject_id')
+    duplicates = (
+        MarkRecord.objects.values(*key).annotate(rows=Count('id')).filter(rows__gt=1).order_by(*key)
+    )
+    total = duplicates.count()
+    if not total:
+        return
+
+    lines = []
+    for row in duplicates[:REPORT_LIMIT]:
+        ids = list(MarkRecord.objects.filter(**{field: row[field] for field in key}).order_by('id').values_list('id', flat=True))
+        lines.append(f'  batch {row["batch_id"]}, student {row["student_id"]}, subject {row["subject_id"]}: MarkRecord ids {ids}')
+    if total > REPORT_LIMIT:
+        lines.append(f'  ... and {total - REPORT_LIMIT} more')
+    raise RuntimeError(
+        f'{total} (batch, student, subject) combinations have more than one MarkRecord:\n' + '\n'.join(lines)
+        + '\nDelete or merge the extra rows, then run migrate again.'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0002_student_academic_summary'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_marks, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='markrecord',
+            unique_together={('batch', 'student', 'subject')},
+        ),
+    ]
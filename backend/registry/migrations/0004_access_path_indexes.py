@@ -0,0 +1,45 @@
+# Generated by Django 5.0.2 on 2026-10-16 20:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0003_markrecord_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='academictask',
+            index=models.Index(fields=['department', 'study_year'], name='task_dept_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendancerecord',
+            index=models.Index(fields=['date'], name='attendance_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['mentor', 'status'], name='leave_mentor_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['student', 'start_date'], name='leave_student_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='markrecord',
+            index=models.Index(fields=['student', 'subject'], name='mark_student_subject_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='markrecord',
+            index=models.Index(fields=['batch', 'subject'], name='mark_batch_subject_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'read', 'timestamp'], name='notif_user_read_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timetable',
+            index=models.Index(fields=['department', 'study_year'], name='timetable_dept_year_idx'),
+        ),
+    ]
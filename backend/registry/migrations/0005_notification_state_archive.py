@@ -0,0 +1,60 @@
+# Generated by Django 5.0.2 on 2026-10-16 20:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_unread_counts(apps, schema_editor):
+    # Existing broadcasts start out read so users are not flooded on upgrade
+    Notification = apps.get_model('registry', 'Notification')
+    NotificationState = apps.get_model('registry', 'NotificationState')
+    User = apps.get_model('registry', 'User')
+
+    latest_broadcast = Notification.objects.filter(user__isnull=True).order_by('-id').values_list('id', flat=True).first() or 0
+    unread = dict(
+        Notification.objects.filter(user__isnull=False, read=False)
+        .values('user_id').annotate(n=Count('id')).values_list('user_id', 'n')
+    )
+    NotificationState.objects.bulk_create(
+        (NotificationState(user_id=user_id, unread_count=unread.get(user_id, 0), broadcast_read_id=latest_broadcast)
+         for user_id in User.objects.values_list('id', flat=True).iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0004_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationState',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_state', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('unread_count', models.IntegerField(default=0)),
+                ('broadcast_read_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(unique=True)),
+                ('message', models.TextField()),
+                ('timestamp', models.DateTimeField()),
+                ('read', models.BooleanField(default=False)),
+                ('type', models.CharField(default='SYSTEM', max_length=50)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archived_notifications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'timestamp'], name='archived_notif_user_ts_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_unread_counts, migrations.RunPython.noop),
+    ]
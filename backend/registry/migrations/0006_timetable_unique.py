@@ -0,0 +1,47 @@
+# Generated by Django 5.0.2 on 2026-10-16 20:48
+
+from django.db import migrations
+from django.db.models import Count
+
+REPORT_LIMIT = 20
+
+
+def check_duplicate_timetables(apps, schema_editor):
+    # Deleting the extra timetables of a class would cascade to their hour
+    # assignments, so report them and stop; an admin merges or removes them
+    Timetable = apps.get_model('registry', 'Timetable')
+    key = ('department', 'study_year')
+    duplicates = Timetable.objects.values(*key).annotate(rows=Count('id')).filter(rows__gt=1).order_by(*key)
+    total = duplicates.count()
+    if not total:
+        return
+
+    lines = []
+    for row in duplicates[:REPORT_LIMIT]:
+        ids = list(Timetable.objects.filter(**{field: row[field] for field in key}).order_by('id').values_list('id', flat=True))
+        lines.append(f'  {row["department"]} / {row["study_year"]}: Timetable ids {ids}')
+    if total > REPORT_LIMIT:
+        lines.append(f'  ... and {total - REPORT_LIMIT} more')
+    raise RuntimeError(
+        f'{total} (department, study_year) classes have more than one Timetable:\n' + '\n'.join(lines)
+        + '\nMerge or delete the extra timetables, then run migrate again.'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0005_notification_state_archive'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_timetables, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='timetable',
+            unique_together={('department', 'study_year')},
+        ),
+        migrations.RemoveIndex(
+            model_name='timetable',
+            name='timetable_dept_year_idx',
+        ),
+    ]
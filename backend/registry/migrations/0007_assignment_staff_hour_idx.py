@@ -0,0 +1,17 @@
+# Generated by Django 5.0.2 on 2026-10-16 20:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0006_timetable_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hourassignment',
+            index=models.Index(fields=['staff', 'hour'], name='assignment_staff_hour_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.2 on 2026-10-16 20:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0007_assignment_staff_hour_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['status', 'end_date', 'start_date'], name='leave_status_end_idx'),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.0.2 on 2026-10-16 21:06
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Frozen copy of registry.search as of this migration, so later changes to
+# the live tokenizer do not change what this backfill writes
+SEARCH_FIELDS = {'reg_no': 0, 'staff_id': 0, 'username': 1, 'first_name': 2, 'last_name': 2, 'email': 3}
+PREFIX_LENGTH = 16
+WORD = re.compile(r'[^\W_]+')
+
+
+def tokenize(text):
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(char for char in text if not unicodedata.combining(char)).lower()
+    return WORD.findall(text)
+
+
+def search_tokens(user):
+    tokens = {}
+    for field, weight in SEARCH_FIELDS.items():
+        value = getattr(user, field, None)
+        if field == 'email' and value:
+            value = value.split('@')[0]
+        for word in tokenize(value):
+            word = word[:PREFIX_LENGTH]
+            for length in range(1, len(word) + 1):
+                key = (word[:length], length == len(word))
+                tokens[key] = min(weight, tokens.get(key, weight))
+    return tokens
+
+
+def backfill_search_tokens(apps, schema_editor):
+    User = apps.get_model('registry', 'User')
+    UserSearchToken = apps.get_model('registry', 'UserSearchToken')
+    last_id = 0
+    while True:
+        chunk = list(User.objects.filter(id__gt=last_id).order_by('id')[:2000])
+        if not chunk:
+            return
+        UserSearchToken.objects.bulk_create([
+            UserSearchToken(
+                user_id=user.pk, token=token, complete=complete, weight=weight, role=user.role, department=user.department
+            )
+            for user in chunk for (token, complete), weight in search_tokens(user).items()
+        ], batch_size=2000)
+        last_id = chunk[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registry', '0008_leave_status_end_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=16)),
+                ('complete', models.BooleanField(default=False)),
+                ('weight', models.SmallIntegerField(default=0)),
+                ('role', models.CharField(max_length=20)),
+                ('department', models.CharField(blank=True, max_length=255, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['token'], name='search_token_idx'), models.Index(fields=['role', 'token'], name='search_role_token_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_search_tokens, migrations.RunPython.noop),
+    ]
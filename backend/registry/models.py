@@ -94,6 +94,11 @@ class AcademicTask(models.Model):
     staff = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tasks_created')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['department', 'study_year'], name='task_dept_year_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -108,6 +113,10 @@ class AttendanceRecord(models.Model):
 
     class Meta:
         unique_together = ('user', 'date')
+        # (user, date range) lookups are served by the unique index above
+        indexes = [
+            models.Index(fields=['date'], name='attendance_date_idx'),
+        ]
 
 class HourAttendance(models.Model):
     record = models.ForeignKey(AttendanceRecord, related_name='hours', on_delete=models.CASCADE)
@@ -124,6 +133,9 @@ class AttendanceEditRequest(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
 
 class MarkBatch(models.Model):
+    # Marks in these batches can no longer be written
+    LOCKED_STATUSES = ('FROZEN', 'BLOCKED')
+
     name = models.CharField(max_length=255) # e.g. SEM 1 INTERNAL 1
     academic_year = models.CharField(max_length=20)
     status = models.CharField(max_length=20, choices=[('OPEN', 'Open'), ('FROZEN', 'Frozen'), ('BLOCKED', 'Blocked')], default='OPEN')
@@ -139,6 +151,13 @@ class MarkRecord(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     updated_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
 
+    class Meta:
+        unique_together = ('batch', 'student', 'subject')
+        indexes = [
+            models.Index(fields=['student', 'subject'], name='mark_student_subject_idx'),
+            models.Index(fields=['batch', 'subject'], name='mark_batch_subject_idx'),
+        ]
+
 class LeaveRequest(models.Model):
     class LeaveType(models.TextChoices):
         MEDICAL = 'MEDICAL', _('Medical')
@@ -161,16 +180,35 @@ class LeaveRequest(models.Model):
     status = models.CharField(max_length=20, choices=LeaveStatus.choices, default=LeaveStatus.PENDING)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['mentor', 'status'], name='leave_mentor_status_idx'),
+            models.Index(fields=['student', 'start_date'], name='leave_student_start_idx'),
+            # Calendar overlap scans: a range scan on end_date (leaves ending
+            # on or after the window), start_date filtered from the index itself
+            models.Index(fields=['status', 'end_date', 'start_date'], name='leave_status_end_idx'),
+        ]
+
 class Timetable(models.Model):
     department = models.CharField(max_length=255)
     study_year = models.CharField(max_length=50)
     last_updated = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # One timetable per class; the unique index also serves (department, study_year) lookups
+        unique_together = ('department', 'study_year')
+
 class HourAssignment(models.Model):
     timetable = models.ForeignKey(Timetable, related_name='assignments', on_delete=models.CASCADE)
     hour = models.IntegerField()
     staff = models.ForeignKey(User, on_delete=models.CASCADE)
 
+    class Meta:
+        indexes = [
+            # Staff x hour occupancy: clash checks and workload lookups
+            models.Index(fields=['staff', 'hour'], name='assignment_staff_hour_idx'),
+        ]
+
 class PortalConnection(models.Model):
     name = models.CharField(max_length=255)
     url = models.URLField()
@@ -186,6 +224,11 @@ class Notification(models.Model):
     read = models.BooleanField(default=False)
     type = models.CharField(max_length=50, default='SYSTEM')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'read', 'timestamp'], name='notif_user_read_ts_idx'),
+        ]
+
 class CurriculumEditRequest(models.Model):
     hod = models.ForeignKey(User, on_delete=models.CASCADE)
     dept_name = models.CharField(max_length=255)
@@ -202,3 +245,56 @@ class SiteSettings(models.Model):
     
     class Meta:
         verbose_name_plural = "Site Settings"
+
+class StudentAcademicSummary(models.Model):
+    # Denormalized counters behind UserViewSet.academic_data, kept in step with
+    # AttendanceRecord/MarkRecord writes by registry.signals
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='academic_summary')
+    present_days = models.IntegerField(default=0)
+    total_days = models.IntegerField(default=0)
+    mark_sum = models.FloatField(default=0)
+    mark_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Student Academic Summaries"
+
+class NotificationState(models.Model):
+    # Per-user read state: broadcasts (user=None) are read up to a cursor
+    # instead of being copied per user; personal unread rows are counted here
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='notification_state')
+    unread_count = models.IntegerField(default=0)
+    broadcast_read_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+class ArchivedNotification(models.Model):
+    original_id = models.BigIntegerField(unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_notifications', null=True, blank=True)
+    message = models.TextField()
+    timestamp = models.DateTimeField()
+    read = models.BooleanField(default=False)
+    type = models.CharField(max_length=50, default='SYSTEM')
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'timestamp'], name='archived_notif_user_ts_idx'),
+        ]
+
+class UserSearchToken(models.Model):
+    # Typeahead index (registry.search): one row per prefix of each normalised
+    # word of a user's name, username, email, reg_no and staff_id, so a
+    # keystroke is an equality probe. Role and department are copied in so
+    # scoped lookups never join the user table.
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='search_tokens')
+    token = models.CharField(max_length=16)
+    complete = models.BooleanField(default=False)  # the prefix is the whole word
+    weight = models.SmallIntegerField(default=0)  # lower ranks first: ids, username, name, email
+    role = models.CharField(max_length=20)
+    department = models.CharField(max_length=255, blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['token'], name='search_token_idx'),
+            models.Index(fields=['role', 'token'], name='search_role_token_idx'),
+        ]
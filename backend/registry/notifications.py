@@ -0,0 +1,131 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models import F, Max
+
+from .models import Notification, NotificationState, ArchivedNotification
+
+CHUNK_SIZE = 1000
+
+_counters_suspended = ContextVar('notification_counters_suspended', default=False)
+
+
+@contextmanager
+def suspend_counters():
+    """Skips per-row counter signals for bulk deletes that fix counters themselves."""
+    token = _counters_suspended.set(True)
+    try:
+        yield
+    finally:
+        _counters_suspended.reset(token)
+
+
+def counters_suspended():
+    return _counters_suspended.get()
+
+
+def adjust_unread(user_id, delta, create_missing=True):
+    """
+    Adds `delta` to a user's personal unread counter. A missing state row is
+    created from a fresh count (which already reflects the change), unless
+    `create_missing` is False (deletes, which may be part of a user cascade).
+    """
+    if user_id is None or not delta:
+        return
+    updated = NotificationState.objects.filter(user_id=user_id).update(unread_count=F('unread_count') + delta)
+    if not updated and create_missing:
+        NotificationState.objects.update_or_create(
+            user_id=user_id,
+            defaults={'unread_count': Notification.objects.filter(user_id=user_id, read=False).count()},
+        )
+
+
+def broadcast_cursor(user):
+    return NotificationState.objects.filter(user=user).values_list('broadcast_read_id', flat=True).first() or 0
+
+
+def unread_count(user):
+    """Personal unread counter plus broadcasts past the user's read cursor (two indexed reads)."""
+    state = NotificationState.objects.filter(user=user).values('unread_count', 'broadcast_read_id').first()
+    state = state or {'unread_count': 0, 'broadcast_read_id': 0}
+    broadcasts = Notification.objects.filter(user__isnull=True, id__gt=state['broadcast_read_id']).count()
+    return state['unread_count'] + broadcasts
+
+
+def mark_read(user, notification):
+    if notification.user_id is None:
+        # Reading a broadcast moves the cursor; older broadcasts count as read too
+        NotificationState.objects.get_or_create(user=user)
+        NotificationState.objects.filter(user=user, broadcast_read_id__lt=notification.id).update(
+            broadcast_read_id=notification.id
+        )
+    elif not notification.read:
+        notification.read = True
+        notification.save(update_fields=['read'])
+
+
+@transaction.atomic
+def mark_all_read(user):
+    latest_broadcast = Notification.objects.filter(user__isnull=True).aggregate(latest=Max('id'))['latest'] or 0
+    Notification.objects.filter(user=user, read=False).update(read=True)
+    NotificationState.objects.update_or_create(
+        user=user, defaults={'unread_count': 0, 'broadcast_read_id': latest_broadcast}
+    )
+
+
+def clear_notifications(user, chunk_size=CHUNK_SIZE):
+    """Deletes a user's personal notifications in short id-bounded statements."""
+    deleted = 0
+    with suspend_counters():
+        while True:
+            ids = list(Notification.objects.filter(user=user).order_by('id').values_list('id', flat=True)[:chunk_size])
+            if not ids:
+                break
+            deleted += Notification.objects.filter(id__in=ids).delete()[0]
+    NotificationState.objects.filter(user=user).update(unread_count=0)
+    return deleted
+
+
+def archive_notifications(cutoff, chunk_size=CHUNK_SIZE, pause=0, archive=True):
+    """
+    Moves notifications older than `cutoff` out of the hot table, `chunk_size`
+    rows per transaction so locks stay short. With `archive=False` they are
+    purged without a copy. Personal unread counters are corrected per chunk.
+    Yields the number of rows moved per chunk.
+    """
+    while True:
+        with transaction.atomic(), suspend_counters():
+            rows = list(
+                Notification.objects.filter(timestamp__lt=cutoff).order_by('id')
+                .values('id', 'user_id', 'message', 'timestamp', 'read', 'type')[:chunk_size]
+            )
+            if not rows:
+                return
+            if archive:
+                ArchivedNotification.objects.bulk_create(
+                    [
+                        ArchivedNotification(
+                            original_id=row['id'], user_id=row['user_id'], message=row['message'],
+                            timestamp=row['timestamp'], read=row['read'], type=row['type'],
+                        )
+                        for row in rows
+                    ],
+                    ignore_conflicts=True,
+                )
+            Notification.objects.filter(id__in=[row['id'] for row in rows]).delete()
+
+            unread = {}
+            for row in rows:
+                if row['user_id'] is not None and not row['read']:
+                    unread[row['user_id']] = unread.get(row['user_id'], 0) + 1
+            # One UPDATE per distinct decrement rather than per user
+            by_count = {}
+            for user_id, count in unread.items():
+                by_count.setdefault(count, []).append(user_id)
+            for count, user_ids in by_count.items():
+                NotificationState.objects.filter(user_id__in=user_ids).update(unread_count=F('unread_count') - count)
+        yield len(rows)
+        if pause:
+            time.sleep(pause)
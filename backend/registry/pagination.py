@@ -0,0 +1,51 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+
+class RegistryCursorPagination(CursorPagination):
+    """
+    Keyset pagination on the primary key (always indexed and unique), oldest
+    first on every endpoint: the order the plain, unpaginated lists return,
+    so paging through a list yields the same rows in the same order.
+
+    Pagination is opt-in per request so existing clients that expect a plain
+    list keep working: a request is paginated only when it sends `cursor` or
+    `page_size`. The total is left out unless `?count=exact` is passed, so a
+    page costs one indexed range scan no matter how large the table grows.
+    """
+    ordering = 'id'
+    page_size_query_param = 'page_size'
+    count_query_param = 'count'
+
+    @property
+    def max_page_size(self):
+        return getattr(settings, 'REGISTRY_MAX_PAGE_SIZE', None)
+
+    def get_page_size(self, request):
+        if (self.cursor_query_param not in request.query_params and
+                self.page_size_query_param not in request.query_params):
+            return None
+        return super().get_page_size(request)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        page = super().paginate_queryset(queryset, request, view)
+        if page is not None and request.query_params.get(self.count_query_param) == 'exact':
+            self.count = queryset.count()
+        return page
+
+    def get_paginated_response(self, data):
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            payload['count'] = self.count
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count'] = {'type': 'integer', 'example': 123}
+        return response_schema
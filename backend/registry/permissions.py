@@ -0,0 +1,12 @@
+from rest_framework import permissions
+
+from .models import User
+
+
+class IsAcademicLead(permissions.BasePermission):
+    """HODs, Deans and administrators."""
+    roles = (User.Role.HOD, User.Role.DEAN, User.Role.ADMIN)
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and (user.role in self.roles or user.is_superuser))
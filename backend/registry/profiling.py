@@ -0,0 +1,228 @@
+import cProfile
+import json
+import pstats
+import random
+import re
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .instrumentation import recording_queries
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAM = 'profile'
+PROFILE_ID = re.compile(r'^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$')
+FUNCTION_LIMIT = 60
+SQL_LIMIT = 500
+
+
+def profile_dir():
+    return Path(settings.PROFILE_DIR)
+
+
+def function_name(func):
+    filename, line, name = func
+    return f'{name} ({filename}:{line})' if line else name
+
+
+def call_tree(profiler, limit=FUNCTION_LIMIT):
+    """The `limit` most expensive functions by cumulative time, each with its callees."""
+    stats = pstats.Stats(profiler).stats
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees.setdefault(caller, []).append((cumulative, func))
+
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    return [
+        {
+            'function': function_name(func),
+            'calls': calls,
+            'total_ms': round(total * 1000, 3),
+            'cumulative_ms': round(cumulative * 1000, 3),
+            'callees': [
+                {'function': function_name(callee), 'cumulative_ms': round(time_spent * 1000, 3)}
+                for time_spent, callee in sorted(callees.get(func, []), reverse=True)[:10]
+            ],
+        }
+        for func, (_, calls, total, cumulative, _) in rows
+    ]
+
+
+class SQLTimeline:
+    """Query hook (see recording_queries) recording each query's offset and duration."""
+
+    def __init__(self, started):
+        self.started = started
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        offset = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'offset_ms': round((offset - self.started) * 1000, 3),
+                'duration_ms': round((time.perf_counter() - offset) * 1000, 3),
+                'alias': context['connection'].alias,
+                'sql': sql[:SQL_LIMIT],
+            })
+
+
+def save_profile(request, response, profiler, timeline, duration, trigger):
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    profile_id = f'{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}'
+    match = request.resolver_match
+    summary = {
+        'id': profile_id,
+        'created': datetime.now(timezone.utc).isoformat(),
+        'method': request.method,
+        'path': request.get_full_path(),
+        'view': match.view_name if match else None,
+        'status': response.status_code,
+        'trigger': trigger,
+        'duration_ms': round(duration * 1000, 3),
+        'query_count': len(timeline.queries),
+        'db_ms': round(sum(query['duration_ms'] for query in timeline.queries), 3),
+        'functions': call_tree(profiler),
+        'sql': timeline.queries,
+    }
+    (directory / f'{profile_id}.json').write_text(json.dumps(summary))
+    # Raw stats for snakeviz / pstats
+    profiler.dump_stats(directory / f'{profile_id}.prof')
+    rotate_profiles(directory)
+    return profile_id
+
+
+def rotate_profiles(directory, keep=None):
+    """Keeps the newest PROFILE_KEEP profiles (ids sort by time)."""
+    keep = settings.PROFILE_KEEP if keep is None else keep
+    profiles = sorted(directory.glob('*.json'), reverse=True)
+    for path in profiles[keep:]:
+        path.unlink(missing_ok=True)
+        path.with_suffix('.prof').unlink(missing_ok=True)
+
+
+def list_profiles():
+    """Profile summaries without the call tree and SQL, newest first."""
+    directory = profile_dir()
+    if not directory.is_dir():
+        return []
+    profiles = []
+    for path in sorted(directory.glob('*.json'), reverse=True):
+        try:
+            summary = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue  # removed by rotation or still being written
+        summary.pop('functions', None)
+        summary.pop('sql', None)
+        profiles.append(summary)
+    return profiles
+
+
+def load_profile(profile_id):
+    if not PROFILE_ID.match(profile_id):
+        return None
+    path = profile_dir() / f'{profile_id}.json'
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a request with cProfile and records its SQL timeline when
+
+      * an admin (is_staff) sends `X-Profile: 1` or `?profile=1`, or
+      * it is picked by PROFILE_SAMPLE_RATE (0 disables sampling).
+
+    Other requests pass straight through; with PROFILING off the middleware
+    is dropped from the stack at startup. Profiles go to PROFILE_DIR as a JSON
+    summary plus a .prof file, rotated to PROFILE_KEEP, and the response
+    carries their id in X-Profile-Id. Placed after authentication so the
+    admin check can see request.user.
+
+    Sync and async capable. cProfile only sees the thread it is enabled in,
+    so for async views the call tree covers the event loop (including any
+    other request it interleaves with) but not the code run in sync_to_async
+    threads; the SQL timeline still has every query.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def requested(request):
+        return request.META.get(PROFILE_HEADER) == '1' or request.GET.get(PROFILE_PARAM) == '1'
+
+    @staticmethod
+    def is_admin(request):
+        user = getattr(request, 'user', None)
+        return user is not None and user.is_staff
+
+    @staticmethod
+    def sampled():
+        return bool(settings.PROFILE_SAMPLE_RATE) and random.random() < settings.PROFILE_SAMPLE_RATE
+
+    def trigger(self, request):
+        if self.requested(request):
+            return 'requested' if self.is_admin(request) else None
+        return 'sampled' if self.sampled() else None
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        trigger = self.trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        with recording_queries(SQLTimeline(started)) as timeline:
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        duration = time.perf_counter() - started
+
+        response['X-Profile-Id'] = save_profile(request, response, profiler, timeline, duration, trigger)
+        return response
+
+    async def __acall__(self, request):
+        if self.requested(request):
+            # request.user is lazy and may need the database
+            trigger = 'requested' if await sync_to_async(self.is_admin)(request) else None
+        else:
+            trigger = 'sampled' if self.sampled() else None
+        if trigger is None:
+            return await self.get_response(request)
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        with recording_queries(SQLTimeline(started)) as timeline:
+            profiler.enable()
+            try:
+                response = await self.get_response(request)
+            finally:
+                profiler.disable()
+        duration = time.perf_counter() - started
+
+        response['X-Profile-Id'] = await sync_to_async(save_profile)(
+            request, response, profiler, timeline, duration, trigger
+        )
+        return response
@@ -0,0 +1,186 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .models import User
+from .search import index_users
+from .serializers import UserProvisionRowSerializer
+from .sheets import read_sheet
+
+BULK_BATCH_SIZE = 1000
+UNIQUE_FIELDS = ('username', 'reg_no', 'staff_id')
+# Below this many passwords starting worker processes costs more than it saves
+POOL_THRESHOLD = 8
+USER_FIELDS = (
+    'username', 'email', 'first_name', 'last_name', 'role', 'department', 'study_year', 'reg_no', 'staff_id',
+    'designation', 'experience',
+)
+
+
+def read_user_file(upload):
+    """Rows of an uploaded .json (a list of objects), .csv or .xlsx user file; blank cells are dropped."""
+    name = (upload.name or '').lower()
+    if not name.endswith(('.json', '.csv', '.xlsx')):
+        raise ValueError('Unsupported file type; upload a .csv, .xlsx or .json user file.')
+    if name.endswith('.json'):
+        try:
+            rows = json.load(upload)
+        except ValueError as exc:
+            raise ValueError(f'Invalid JSON: {exc}')
+        if not isinstance(rows, list):
+            raise ValueError('Expected a JSON list of users.')
+        return rows
+    return [
+        {field: value for field, value in row.items() if value not in (None, '')}
+        for row in read_sheet(upload, 'user file')
+    ]
+
+
+def _init_hash_worker():
+    # Workers started with 'spawn' (macOS, Windows) have no configured Django yet
+    if not apps.ready:
+        django.setup()
+
+
+def hash_workers(workers=None):
+    """Hashing processes for the provision_users command: `workers`, else PROVISION_HASH_WORKERS, else one per core."""
+    return workers or settings.PROVISION_HASH_WORKERS or os.cpu_count() or 1
+
+
+def hash_passwords(passwords, workers=1):
+    """
+    PBKDF2-hashes `passwords`. Each hash is deliberately slow and holds the
+    GIL, so with `workers` > 1 they are spread across a process pool. Only the
+    provision_users command asks for one: forking a web worker would copy its
+    threads and open database connections. Small batches are always hashed
+    in-process.
+    """
+    passwords = list(passwords)
+    workers = min(workers, len(passwords))
+    if workers <= 1 or len(passwords) < POOL_THRESHOLD:
+        return [make_password(password) for password in passwords]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_hash_worker) as pool:
+        return list(pool.map(make_password, passwords, chunksize=max(1, len(passwords) // (workers * 4))))
+
+
+def validate_user_rows(rows):
+    """
+    Validates bulk user rows. username, reg_no and staff_id are checked for
+    clashes with existing users with one query per field and within the
+    payload; mentors are resolved by id or staff_id in one query each.
+    Passwords go through AUTH_PASSWORD_VALIDATORS.
+
+    Returns `(valid, errors)` keyed by row index.
+    """
+    valid, errors = {}, {}
+    if not isinstance(rows, list):
+        return valid, {None: {'non_field_errors': ['Expected a list of users.']}}
+
+    for index, row in enumerate(rows):
+        serializer = UserProvisionRowSerializer(data=row)
+        if serializer.is_valid():
+            valid[index] = serializer.validated_data
+        else:
+            errors[index] = serializer.errors
+
+    taken = {}
+    for field in UNIQUE_FIELDS:
+        values = {data[field] for data in valid.values() if data.get(field)}
+        taken[field] = set(User.objects.filter(**{f'{field}__in': values}).values_list(field, flat=True)) if values else set()
+    mentor_ids = {data['mentor'] for data in valid.values() if data.get('mentor')}
+    mentor_ids = set(User.objects.filter(id__in=mentor_ids).values_list('id', flat=True)) if mentor_ids else set()
+    staff_ids = {data['mentor_staff_id'] for data in valid.values() if data.get('mentor_staff_id')}
+    mentors = dict(User.objects.filter(staff_id__in=staff_ids).values_list('staff_id', 'id')) if staff_ids else {}
+
+    seen = {field: set() for field in UNIQUE_FIELDS}
+    for index, data in list(valid.items()):
+        error = None
+        for field in UNIQUE_FIELDS:
+            value = data.get(field)
+            if value in taken[field]:
+                error = {field: [f'A user with this {field} already exists.']}
+            elif value and value in seen[field]:
+                error = {field: [f'Duplicate {field} in payload.']}
+            if error:
+                break
+        if error is None and data.get('mentor') and data['mentor'] not in mentor_ids:
+            error = {'mentor': [f'Invalid pk "{data["mentor"]}" - object does not exist.']}
+        if error is None and data.get('mentor_staff_id'):
+            data['mentor'] = mentors.get(data['mentor_staff_id'])
+            if data['mentor'] is None:
+                error = {'mentor_staff_id': [f'No staff with staff_id "{data["mentor_staff_id"]}".']}
+        if error is None and data.get('password'):
+            try:
+                validate_password(data['password'], user=User(**{field: data[field] for field in USER_FIELDS}))
+            except ValidationError as exc:
+                error = {'password': exc.messages}
+
+        if error is None:
+            for field in UNIQUE_FIELDS:
+                if data.get(field):
+                    seen[field].add(data[field])
+        else:
+            errors[index] = error
+            del valid[index]
+    return valid, errors
+
+
+def provision_users(valid, workers=1, atomic=False):
+    """
+    Creates the validated users with one bulk insert. Passwords are hashed
+    (across `workers` processes, see hash_passwords) before the transaction
+    opens, so no locks are held while hashing; rows without a password get an
+    unusable one.
+
+    A username, reg_no or staff_id taken by a concurrent writer after
+    validation is reported as an error for that row (with `atomic`, the whole
+    batch is rolled back instead). Returns `(results, errors)`: row index ->
+    ('created', user id), and row index -> errors.
+    """
+    if not valid:
+        return {}, {}
+
+    indexes = [index for index, data in valid.items() if data.get('password')]
+    hashed = dict(zip(indexes, hash_passwords([valid[index]['password'] for index in indexes], workers=workers)))
+    users = {
+        index: User(
+            password=hashed.get(index) or make_password(None), mentor_id=data.get('mentor'),
+            **{field: data[field] for field in USER_FIELDS},
+        )
+        for index, data in valid.items()
+    }
+
+    results, errors = {}, {}
+    with transaction.atomic():
+        User.objects.bulk_create(users.values(), batch_size=BULK_BATCH_SIZE, ignore_conflicts=True)
+        # bulk_create does not return primary keys on MySQL and skipped rows
+        # are silent, so read back: every password hash is salted, so a row
+        # is ours only if the stored hash matches
+        stored = {
+            username: (pk, password)
+            for pk, username, password in User.objects.filter(
+                username__in=[user.username for user in users.values()]
+            ).values_list('id', 'username', 'password')
+        }
+        for index, user in users.items():
+            pk, password = stored.get(user.username, (None, None))
+            if password == user.password:
+                user.pk = pk
+                results[index] = ('created', pk)
+            else:
+                errors[index] = {'non_field_errors': ['Username, reg_no or staff_id was taken while provisioning.']}
+
+        if atomic and errors:
+            transaction.set_rollback(True)
+            return {}, errors
+        # bulk_create bypasses the post_save signal that maintains the typeahead index
+        index_users(user for index, user in users.items() if index in results)
+    return results, errors
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class LocalBroker:
+    """
+    In-process pub/sub for notification events.
+
+    Subscribers are asyncio queues owned by streaming responses; `publish` may
+    be called from any thread (e.g. a sync signal handler) and hands events to
+    each subscriber's event loop. Personal events reach only that user's
+    queues, broadcasts (`user` is None) reach everyone. A slow subscriber whose
+    queue is full misses events and resynchronises with Last-Event-ID.
+
+    Only publishers in the same process are seen, so multi-worker deployments
+    should point NOTIFICATION_BROKER at a shared implementation with the same
+    interface.
+    """
+    queue_size = 100
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}  # user_id -> {queue: loop}
+
+    def subscribe(self, user_id):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._subscribers.setdefault(user_id, {})[queue] = loop
+        return queue
+
+    def unsubscribe(self, user_id, queue):
+        with self._lock:
+            queues = self._subscribers.get(user_id, {})
+            queues.pop(queue, None)
+            if not queues:
+                self._subscribers.pop(user_id, None)
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(queues) for queues in self._subscribers.values())
+
+    def publish(self, event):
+        with self._lock:
+            if event.get('user') is None:
+                targets = [item for queues in self._subscribers.values() for item in queues.items()]
+            else:
+                targets = list(self._subscribers.get(event['user'], {}).items())
+        for queue, loop in targets:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, event)
+            except RuntimeError:
+                # Loop already closed; the stream is gone
+                pass
+
+    @staticmethod
+    def _offer(queue, event):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            pass
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(getattr(settings, 'NOTIFICATION_BROKER', 'registry.pubsub.LocalBroker'))()
+        return _broker
@@ -0,0 +1,107 @@
+import re
+import unicodedata
+
+from django.db import transaction
+from django.db.models import Count, IntegerField, Max, Min
+from django.db.models.functions import Cast
+
+from .models import User, UserSearchToken
+
+# Indexed user fields -> rank weight (lower ranks first)
+SEARCH_FIELDS = {'reg_no': 0, 'staff_id': 0, 'username': 1, 'first_name': 2, 'last_name': 2, 'email': 3}
+INDEX_FIELDS = set(SEARCH_FIELDS) | {'role', 'department'}
+# Words are indexed by every prefix up to this length; longer terms match on it
+PREFIX_LENGTH = 16
+MAX_TERMS = 4
+WORD = re.compile(r'[^\W_]+')
+
+
+def tokenize(text):
+    """'Jaí_Akash.S' -> ['jai', 'akash', 's']: accents folded, lowercased, split on non-alphanumerics."""
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(char for char in text if not unicodedata.combining(char)).lower()
+    return WORD.findall(text)
+
+
+def search_tokens(user):
+    """
+    {(prefix, complete): weight} for a user (or any object with the indexed
+    attributes): every prefix of every word, flagged when it is the whole
+    word. Emails index their local part.
+    """
+    tokens = {}
+    for field, weight in SEARCH_FIELDS.items():
+        value = getattr(user, field, None)
+        if field == 'email' and value:
+            value = value.split('@')[0]
+        for word in tokenize(value):
+            word = word[:PREFIX_LENGTH]
+            for length in range(1, len(word) + 1):
+                key = (word[:length], length == len(word))
+                tokens[key] = min(weight, tokens.get(key, weight))
+    return tokens
+
+
+def token_rows(users):
+    return [
+        UserSearchToken(user_id=user.pk, token=token, complete=complete, weight=weight, role=user.role, department=user.department)
+        for user in users for (token, complete), weight in search_tokens(user).items()
+    ]
+
+
+@transaction.atomic
+def index_users(users):
+    """Replaces the search tokens of `users` (two statements whatever their number)."""
+    users = list(users)
+    UserSearchToken.objects.filter(user_id__in=[user.pk for user in users]).delete()
+    UserSearchToken.objects.bulk_create(token_rows(users), batch_size=2000)
+
+
+def rebuild_search_index(users=None, chunk_size=2000):
+    """Reindexes `users` (a queryset, default all) in keyset chunks; returns the number indexed."""
+    users = User.objects.all() if users is None else users
+    indexed, last_id = 0, 0
+    fields = ['id', 'role', 'department', *SEARCH_FIELDS]
+    while True:
+        chunk = list(users.filter(id__gt=last_id).order_by('id').only(*fields)[:chunk_size])
+        if not chunk:
+            return indexed
+        index_users(chunk)
+        indexed += len(chunk)
+        last_id = chunk[-1].id
+
+
+def typeahead(query, role=None, department=None, limit=10):
+    """
+    Ranked top-`limit` users having a word that starts with each term of
+    `query`. Ranking: users with a whole-word match first, then by the best
+    field weight (ids, username, name, email), then by id.
+
+    Each term is an equality probe of the prefix index and the grouping runs
+    in the database, so this is two queries: ranked ids, then the users.
+    """
+    terms = list(dict.fromkeys(term[:PREFIX_LENGTH] for term in tokenize(query)))
+    # A term that prefixes another ('ja' in 'ja jai') matches the same word,
+    # so it would let a one-word user count as matching both
+    terms = [term for term in terms if not any(other != term and other.startswith(term) for other in terms)]
+    terms = terms[:MAX_TERMS]
+    if not terms:
+        return []
+
+    tokens = UserSearchToken.objects.filter(token__in=terms)
+    if role:
+        tokens = tokens.filter(role=role)
+    if department:
+        tokens = tokens.filter(department=department)
+
+    ranked = (
+        tokens.values('user_id')
+        .annotate(matched=Count('token', distinct=True), exact=Max(Cast('complete', IntegerField())), best=Min('weight'))
+        .filter(matched=len(terms))
+        .order_by('-exact', 'best', 'user_id')
+    )
+    user_ids = [row['user_id'] for row in ranked[:limit]]
+    users = User.objects.in_bulk(user_ids)
+    return [users[user_id] for user_id in user_ids if user_id in users]
@@ -1,3 +1,6 @@
+from django.conf import settings
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import transaction
 from rest_framework import serializers
 from .models import (
     User, Course, Subject, AcademicTask, AttendanceRecord, HourAttendance,
@@ -5,18 +8,44 @@ from .models import (
     HourAssignment, PortalConnection, Notification, CurriculumEditRequest, SiteSettings,
     AcademicBatch, BatchCourseCurriculum
 )
+from .sparse import SparseFieldsetMixin
+from .versioning import bump_version
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'role', 'department', 'study_year', 'reg_no', 'staff_id', 'designation', 'experience', 'avatar']
 
-class HourAttendanceSerializer(serializers.ModelSerializer):
+class UserProvisionRowSerializer(serializers.Serializer):
+    # Plain values so a whole upload is checked for clashes in one query per unique field
+    username = serializers.CharField(max_length=150, validators=[UnicodeUsernameValidator()])
+    email = serializers.EmailField()
+    password = serializers.CharField(required=False, allow_blank=True, trim_whitespace=False)
+    first_name = serializers.CharField(required=False, allow_blank=True, max_length=150, default='')
+    last_name = serializers.CharField(required=False, allow_blank=True, max_length=150, default='')
+    role = serializers.ChoiceField(choices=User.Role.choices, required=False, default=User.Role.STUDENT)
+    department = serializers.CharField(required=False, allow_blank=True, max_length=255)
+    study_year = serializers.CharField(required=False, allow_blank=True, max_length=50)
+    reg_no = serializers.CharField(required=False, allow_blank=True, max_length=100)
+    staff_id = serializers.CharField(required=False, allow_blank=True, max_length=100)
+    designation = serializers.CharField(required=False, allow_blank=True, max_length=255)
+    experience = serializers.CharField(required=False, allow_blank=True, max_length=10)
+    mentor = serializers.IntegerField(required=False)
+    mentor_staff_id = serializers.CharField(required=False, max_length=100)
+
+    def validate(self, attrs):
+        # Blank optional values are stored as NULL so reg_no/staff_id stay unique
+        for field in ('department', 'study_year', 'reg_no', 'staff_id', 'designation', 'experience'):
+            attrs[field] = attrs.get(field) or None
+        return attrs
+
+class HourAttendanceSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = HourAttendance
         fields = ['hour', 'status', 'detail']
 
-class AttendanceRecordSerializer(serializers.ModelSerializer):
+class AttendanceRecordSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    expandable_fields = {'user': (UserSerializer, {}), 'marked_by': (UserSerializer, {})}
     hours = HourAttendanceSerializer(many=True, required=False)
     
     class Meta:
@@ -30,24 +59,43 @@ class AttendanceRecordSerializer(serializers.ModelSerializer):
             HourAttendance.objects.create(record=record, **hour_data)
         return record
 
-class AttendanceEditRequestSerializer(serializers.ModelSerializer):
+class AttendanceBulkRowSerializer(serializers.Serializer):
+    # Plain ids so a whole batch is resolved in one query instead of per row
+    user = serializers.IntegerField()
+    date = serializers.DateField()
+    is_present = serializers.BooleanField(required=False, default=False)
+    marked_by = serializers.IntegerField(required=False, allow_null=True)
+    hours = HourAttendanceSerializer(many=True, required=False)
+
+    def validate_hours(self, value):
+        hours = [hour['hour'] for hour in value]
+        if len(hours) != len(set(hours)):
+            raise serializers.ValidationError('Each hour may appear only once.')
+        return value
+
+class AttendanceEditRequestSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    expandable_fields = {'requester': (UserSerializer, {})}
+
     class Meta:
         model = AttendanceEditRequest
         fields = '__all__'
 
-class SubjectSerializer(serializers.ModelSerializer):
+class SubjectSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    expandable_fields = {'assigned_staff': (UserSerializer, {'many': True})}
+
     class Meta:
         model = Subject
         fields = '__all__'
 
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     subjects = SubjectSerializer(many=True, read_only=True)
     
     class Meta:
         model = Course
         fields = '__all__'
 
-class AcademicTaskSerializer(serializers.ModelSerializer):
+class AcademicTaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    expandable_fields = {'subject': (SubjectSerializer, {}), 'staff': (UserSerializer, {})}
     staff_name = serializers.CharField(source='staff.username', read_only=True)
     subject_name = serializers.CharField(source='subject.name', read_only=True)
 
@@ -55,70 +103,195 @@ class AcademicTaskSerializer(serializers.ModelSerializer):
         model = AcademicTask
         fields = '__all__'
 
-class MarkRecordSerializer(serializers.ModelSerializer):
+class MarkRecordSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    expandable_fields = {'student': (UserSerializer, {}), 'subject': (SubjectSerializer, {})}
+
     class Meta:
         model = MarkRecord
         fields = '__all__'
 
-class MarkBatchSerializer(serializers.ModelSerializer):
+    def validate(self, attrs):
+        batch = attrs.get('batch') or getattr(self.instance, 'batch', None)
+        if batch is not None and batch.status in MarkBatch.LOCKED_STATUSES:
+            raise serializers.ValidationError({'batch': f'Mark batch is {batch.status.lower()}; marks cannot be changed.'})
+        return attrs
+
+class MarkBulkRowSerializer(serializers.Serializer):
+    # Plain ids so a whole batch is resolved in one query per table
+    batch = serializers.IntegerField()
+    student = serializers.IntegerField()
+    subject = serializers.IntegerField()
+    marks = serializers.FloatField(min_value=0)
+    max_marks = serializers.FloatField(required=False, default=100, min_value=0.01)
+
+    def validate(self, attrs):
+        if attrs['marks'] > attrs['max_marks']:
+            raise serializers.ValidationError({'marks': 'Marks cannot exceed max_marks.'})
+        return attrs
+
+class MarkBatchSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    expandable_fields = {'subjects': (SubjectSerializer, {'many': True})}
     records = MarkRecordSerializer(many=True, read_only=True)
     
     class Meta:
         model = MarkBatch
         fields = '__all__'
 
-class LeaveRequestSerializer(serializers.ModelSerializer):
+class LeaveRequestSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    expandable_fields = {'student': (UserSerializer, {}), 'mentor': (UserSerializer, {})}
     student_name = serializers.CharField(source='student.username', read_only=True)
     
     class Meta:
         model = LeaveRequest
         fields = '__all__'
 
-class HourAssignmentSerializer(serializers.ModelSerializer):
+class HourAssignmentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    expandable_fields = {'staff': (UserSerializer, {})}
+
     class Meta:
         model = HourAssignment
         fields = ['hour', 'staff']
 
-class TimetableSerializer(serializers.ModelSerializer):
+class TimetableSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     assignments = HourAssignmentSerializer(many=True, required=False)
     
     class Meta:
         model = Timetable
         fields = ['id', 'department', 'study_year', 'assignments', 'last_updated']
 
+    @transaction.atomic
     def create(self, validated_data):
         assignments_data = validated_data.pop('assignments', [])
         timetable = Timetable.objects.create(**validated_data)
-        for assignment_data in assignments_data:
-            HourAssignment.objects.create(timetable=timetable, **assignment_data)
+        HourAssignment.objects.bulk_create(
+            HourAssignment(timetable=timetable, **assignment_data) for assignment_data in assignments_data
+        )
+        bump_version(HourAssignment)
         return timetable
 
-class PortalConnectionSerializer(serializers.ModelSerializer):
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        # Assignments, when sent, replace the existing set
+        assignments_data = validated_data.pop('assignments', None)
+        instance = super().update(instance, validated_data)
+        if assignments_data is not None:
+            instance.assignments.all().delete()
+            HourAssignment.objects.bulk_create(
+                HourAssignment(timetable=instance, **assignment_data) for assignment_data in assignments_data
+            )
+            bump_version(HourAssignment)
+        return instance
+
+class HourAssignmentBulkSerializer(serializers.Serializer):
+    hour = serializers.IntegerField(min_value=1)
+    staff = serializers.IntegerField()
+
+class TimetableBulkRowSerializer(serializers.Serializer):
+    # Plain ids so a whole institution is resolved in one query per table
+    department = serializers.CharField(max_length=255)
+    study_year = serializers.CharField(max_length=50)
+    assignments = HourAssignmentBulkSerializer(many=True)
+
+    def validate_assignments(self, value):
+        slots = [(assignment['hour'], assignment['staff']) for assignment in value]
+        if len(slots) != len(set(slots)):
+            raise serializers.ValidationError('Each staff member may appear only once per hour.')
+        return value
+
+class PortalConnectionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = PortalConnection
         fields = '__all__'
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    always_load = ('user',)
+
     class Meta:
         model = Notification
         fields = '__all__'
 
-class CurriculumEditRequestSerializer(serializers.ModelSerializer):
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Broadcast read state is per user, held as a cursor in NotificationState
+        cursor = self.context.get('broadcast_read_id')
+        if 'read' in data and instance.user_id is None and cursor is not None:
+            data['read'] = instance.id <= cursor
+        return data
+
+class CurriculumEditRequestSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = CurriculumEditRequest
         fields = '__all__'
 
-class SiteSettingsSerializer(serializers.ModelSerializer):
+class SiteSettingsSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = SiteSettings
         fields = '__all__'
 
-class AcademicBatchSerializer(serializers.ModelSerializer):
+class AcademicBatchSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    expandable_fields = {'departments': (CourseSerializer, {'many': True})}
+
     class Meta:
         model = AcademicBatch
         fields = '__all__'
 
-class BatchCourseCurriculumSerializer(serializers.ModelSerializer):
+class BatchCourseCurriculumSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    expandable_fields = {'batch': (AcademicBatchSerializer, {}), 'course': (CourseSerializer, {})}
+
     class Meta:
         model = BatchCourseCurriculum
         fields = '__all__'
+
+class CohortAnalyticsQuerySerializer(serializers.Serializer):
+    department = serializers.CharField(required=False)
+    study_year = serializers.CharField(required=False)
+    batch = serializers.IntegerField(required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    attendance_threshold = serializers.FloatField(required=False, default=75, min_value=0, max_value=100)
+    pass_mark = serializers.FloatField(required=False, default=40, min_value=0, max_value=100)
+    bucket_width = serializers.IntegerField(required=False, default=10, min_value=1, max_value=100)
+
+class UserTypeaheadQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=100)
+    role = serializers.ChoiceField(choices=User.Role.choices, required=False)
+    department = serializers.CharField(required=False)
+    limit = serializers.IntegerField(required=False, default=10, min_value=1, max_value=50)
+
+class ExportQuerySerializer(serializers.Serializer):
+    file_type = serializers.ChoiceField(choices=['csv', 'xlsx'], required=False, default='csv')
+
+class AttendanceExportQuerySerializer(ExportQuerySerializer):
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    department = serializers.CharField(required=False)
+    study_year = serializers.CharField(required=False)
+
+    def validate(self, attrs):
+        if attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError({'date_to': 'date_to must not be before date_from.'})
+        return attrs
+
+class LeaveCalendarQuerySerializer(serializers.Serializer):
+    date_from = serializers.DateField()
+    date_to = serializers.DateField(required=False)
+    status = serializers.ChoiceField(choices=LeaveRequest.LeaveStatus.choices, required=False, default='APPROVED')
+    department = serializers.CharField(required=False)
+    study_year = serializers.CharField(required=False)
+
+    def validate(self, attrs):
+        attrs.setdefault('date_to', attrs['date_from'])
+        if attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError({'date_to': 'date_to must not be before date_from.'})
+        return attrs
+
+class OnLeaveQuerySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    hour = serializers.IntegerField(required=False, min_value=1)
+    department = serializers.CharField(required=False)
+    study_year = serializers.CharField(required=False)
+
+    def validate_hour(self, value):
+        if value > len(settings.PERIOD_TIMES):
+            raise serializers.ValidationError(f'Ensure this value is less than or equal to {len(settings.PERIOD_TIMES)}.')
+        return value
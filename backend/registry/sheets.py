@@ -0,0 +1,37 @@
+import codecs
+import csv
+
+
+def _normalise_header(header):
+    return [str(cell or '').strip().lower().replace(' ', '_') for cell in header]
+
+
+def read_sheet(upload, label='sheet'):
+    """
+    Yields one dict per data row of an uploaded CSV or XLSX file, keyed by the
+    lower-cased header row. Rows are read lazily so memory stays flat
+    regardless of sheet size. `label` names the upload in error messages.
+    """
+    name = (upload.name or '').lower()
+    if name.endswith('.xlsx'):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ValueError('XLSX import requires openpyxl; upload a CSV instead.')
+        workbook = load_workbook(upload, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = _normalise_header(next(rows, []))
+            for row in rows:
+                if any(cell not in (None, '') for cell in row):
+                    yield dict(zip(header, row))
+        finally:
+            workbook.close()
+    elif name.endswith('.csv'):
+        rows = csv.reader(codecs.iterdecode(upload, 'utf-8-sig'))
+        header = _normalise_header(next(rows, []))
+        for row in rows:
+            if any(cell.strip() for cell in row):
+                yield dict(zip(header, row))
+    else:
+        raise ValueError(f'Unsupported file type; upload a .csv or .xlsx {label}.')
@@ -0,0 +1,164 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from oauth2_provider.models import get_access_token_model
+
+from .authentication import invalidate_token, invalidate_user_tokens
+from .models import (
+    User, Course, Subject, AcademicBatch, BatchCourseCurriculum, Timetable, HourAssignment,
+    SiteSettings, AttendanceRecord, MarkRecord, Notification
+)
+from .notifications import adjust_unread, counters_suspended
+from .pubsub import get_broker
+from .search import INDEX_FIELDS, index_users
+from .serializers import NotificationSerializer
+from .summary import apply_summary_delta
+from .versioning import bump_version
+
+
+def _previous(sender, instance, fields):
+    if instance.pk is None:
+        return None
+    return sender.objects.filter(pk=instance.pk).values(*fields).first()
+
+
+def _apply_change(previous_user_id, previous_deltas, user_id, deltas):
+    # An edit to the same student collapses into a single net delta so a missing
+    # summary is rebuilt once from the already-written source rows
+    if previous_user_id == user_id:
+        apply_summary_delta(user_id, **{field: deltas[field] - previous_deltas[field] for field in deltas})
+    else:
+        apply_summary_delta(previous_user_id, create_missing=False, **{f: -v for f, v in previous_deltas.items()})
+        apply_summary_delta(user_id, **deltas)
+
+
+# --- Student academic summaries ---
+
+@receiver(pre_save, sender=AttendanceRecord)
+def remember_attendance(sender, instance, **kwargs):
+    instance._summary_previous = _previous(sender, instance, ['user_id', 'is_present'])
+
+
+@receiver(post_save, sender=AttendanceRecord)
+def attendance_saved(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_summary_previous', None) or {'user_id': None, 'is_present': False}
+    _apply_change(
+        previous['user_id'], {'present_days': int(previous['is_present']), 'total_days': int(previous['user_id'] is not None)},
+        instance.user_id, {'present_days': int(instance.is_present), 'total_days': 1},
+    )
+
+
+@receiver(post_delete, sender=AttendanceRecord)
+def attendance_deleted(sender, instance, **kwargs):
+    apply_summary_delta(
+        instance.user_id, create_missing=False, present_days=-int(instance.is_present), total_days=-1
+    )
+
+
+@receiver(pre_save, sender=MarkRecord)
+def remember_marks(sender, instance, **kwargs):
+    instance._summary_previous = _previous(sender, instance, ['student_id', 'marks'])
+
+
+@receiver(post_save, sender=MarkRecord)
+def marks_saved(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_summary_previous', None) or {'student_id': None, 'marks': 0}
+    _apply_change(
+        previous['student_id'], {'mark_sum': previous['marks'], 'mark_count': int(previous['student_id'] is not None)},
+        instance.student_id, {'mark_sum': instance.marks, 'mark_count': 1},
+    )
+
+
+@receiver(post_delete, sender=MarkRecord)
+def marks_deleted(sender, instance, **kwargs):
+    apply_summary_delta(instance.student_id, create_missing=False, mark_sum=-instance.marks, mark_count=-1)
+
+
+# --- Cached OAuth2 token lookups ---
+
+@receiver(post_save, sender=get_access_token_model())
+@receiver(post_delete, sender=get_access_token_model())
+def access_token_changed(sender, instance, **kwargs):
+    invalidate_token(instance.token)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    invalidate_user_tokens(instance.pk)
+
+
+# --- User typeahead index ---
+
+@receiver(post_save, sender=User)
+def user_search_changed(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login; skip saves that leave the indexed fields alone
+    if update_fields is not None and not INDEX_FIELDS.intersection(update_fields):
+        return
+    index_users([instance])
+
+
+# --- Catalog version counters (conditional GET) ---
+
+VERSIONED_MODELS = [Course, Subject, AcademicBatch, BatchCourseCurriculum, Timetable, HourAssignment, SiteSettings]
+
+
+def catalog_changed(sender, **kwargs):
+    bump_version(sender)
+
+
+for _model in VERSIONED_MODELS:
+    post_save.connect(catalog_changed, sender=_model, dispatch_uid=f'catalog_saved_{_model._meta.label_lower}')
+    post_delete.connect(catalog_changed, sender=_model, dispatch_uid=f'catalog_deleted_{_model._meta.label_lower}')
+
+
+@receiver(m2m_changed, sender=Subject.assigned_staff.through)
+@receiver(m2m_changed, sender=AcademicBatch.departments.through)
+def catalog_links_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_version(sender)
+
+
+@receiver(post_delete, sender=User)
+def staff_links_deleted(sender, **kwargs):
+    # The cascade drops Subject.assigned_staff rows without m2m_changed
+    bump_version(Subject.assigned_staff.through)
+
+
+@receiver(post_delete, sender=Course)
+def department_links_deleted(sender, **kwargs):
+    bump_version(AcademicBatch.departments.through)
+
+
+# --- Notification unread counters ---
+
+@receiver(pre_save, sender=Notification)
+def remember_notification(sender, instance, **kwargs):
+    instance._counter_previous = _previous(sender, instance, ['user_id', 'read'])
+
+
+@receiver(post_save, sender=Notification)
+def notification_saved(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_counter_previous', None) or {'user_id': None, 'read': True}
+    was_unread, is_unread = int(not previous['read']), int(not instance.read)
+    if previous['user_id'] == instance.user_id:
+        adjust_unread(instance.user_id, is_unread - was_unread)
+    else:
+        adjust_unread(previous['user_id'], -was_unread, create_missing=False)
+        adjust_unread(instance.user_id, is_unread)
+
+
+@receiver(post_delete, sender=Notification)
+def notification_deleted(sender, instance, **kwargs):
+    if not instance.read and not counters_suspended():
+        adjust_unread(instance.user_id, -1, create_missing=False)
+
+
+# --- Notification stream ---
+
+@receiver(post_save, sender=Notification)
+def notification_created(sender, instance, created, **kwargs):
+    if not created:
+        return
+    event = {'user': instance.user_id, 'notification': NotificationSerializer(instance).data}
+    transaction.on_commit(lambda: get_broker().publish(event))
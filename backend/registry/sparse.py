@@ -0,0 +1,176 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+SPARSE_PARAMS = ('fields', 'omit', 'expand')
+
+
+def parse_paths(value):
+    """'id,name,subjects.code' -> {'id': {}, 'name': {}, 'subjects': {'code': {}}}"""
+    tree = {}
+    for path in (value or '').split(','):
+        path = path.strip()
+        if not path:
+            continue
+        node = tree
+        for part in path.split('.'):
+            node = node.setdefault(part, {})
+    return tree
+
+
+def sparse_requested(request):
+    return (request is not None and request.method in SAFE_METHODS
+            and any(request.query_params.get(param) for param in SPARSE_PARAMS))
+
+
+class SparseFieldsetMixin:
+    """
+    Lets a read request shape the response of a ModelSerializer:
+
+        ?fields=id,name,subjects.code       keep only these fields
+        ?omit=materials,subjects.materials  drop these fields
+        ?expand=staff,subject               embed related objects listed in
+                                            `expandable_fields` instead of ids
+
+    Dotted paths reach nested serializers. Only the root serializer of a
+    response reads the query string; it hands the matching sub-paths to its
+    nested serializers. Writes always use the full field set.
+    """
+    # name -> (serializer class, kwargs); expanded fields are read-only
+    expandable_fields = {}
+    # Model fields to_representation reads besides the serialized ones, kept
+    # when the view prunes columns with only()
+    always_load = ()
+    _sparse_spec = None
+
+    def _request_spec(self):
+        request = self.context.get('request')
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None or not sparse_requested(request):
+            return None
+        params = request.query_params
+        only = parse_paths(params['fields']) if params.get('fields') else None
+        return only, parse_paths(params.get('omit')), parse_paths(params.get('expand'))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        spec = self._sparse_spec if self._sparse_spec is not None else self._request_spec()
+        if spec is None:
+            return fields
+        only, omit, expand = spec
+
+        for name in expand:
+            if name in self.expandable_fields:
+                serializer_class, kwargs = self.expandable_fields[name]
+                fields[name] = serializer_class(read_only=True, **kwargs)
+        if only is not None:
+            fields = {name: field for name, field in fields.items() if name in only}
+        fields = {name: field for name, field in fields.items() if name not in omit or omit[name]}
+
+        for name, field in fields.items():
+            nested = ((only or {}).get(name) or None, omit.get(name, {}), expand.get(name, {}))
+            target = getattr(field, 'child', field)
+            if isinstance(target, SparseFieldsetMixin) and (nested[0] is not None or nested[1] or nested[2]):
+                target._sparse_spec = nested
+        return fields
+
+
+def source_tree(serializer):
+    """
+    Maps the model attributes a serializer reads to nested trees, e.g.
+    {'id': {}, 'staff': {'username': {}}, 'subjects': {'id': {}, ...}}.
+    Returns `(tree, complete)`; `complete` is False when some field reads the
+    whole instance (source='*' or a method field), so columns cannot be pruned.
+    """
+    tree, complete = {}, True
+    for field in serializer.fields.values():
+        if field.source == '*' or isinstance(field, serializers.SerializerMethodField):
+            complete = False
+            continue
+        *path, last = field.source.split('.')
+        node = tree
+        for part in path:
+            node = node.setdefault(part, {})
+        target = getattr(field, 'child', field)
+        if isinstance(target, serializers.BaseSerializer):
+            node[last] = source_tree(target)[0]
+        else:
+            node.setdefault(last, {})
+    for name in getattr(serializer, 'always_load', ()):
+        tree.setdefault(name, {})
+    return tree, complete
+
+
+def _relations(model, tree, prefix='', prefetched=False):
+    """Yields `(lookup, needs_prefetch)` for every relation the tree reads into."""
+    for name, nested in tree.items():
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if not field.is_relation:
+            continue
+        many = field.many_to_many or field.one_to_many
+        if not (many or nested):
+            continue  # a plain foreign key id needs no join
+        lookup = prefix + name
+        yield lookup, prefetched or many
+        if nested:
+            yield from _relations(field.related_model, nested, lookup + '__', prefetched or many)
+
+
+def prune_queryset(queryset, serializer, keep=()):
+    """
+    Rebuilds select_related/prefetch_related from the relations the serializer
+    actually reads (dropping omitted ones, adding expanded ones) and limits
+    the selected columns with only() when every field maps onto a model
+    field. `keep` names extra columns to load, such as the pagination ordering.
+    """
+    tree, complete = source_tree(serializer)
+    model = queryset.model
+
+    related, prefetches = [], []
+    for lookup, needs_prefetch in _relations(model, tree):
+        (prefetches if needs_prefetch else related).append(lookup)
+    # Custom Prefetch objects (filtered or annotated querysets) survive as long
+    # as their relation is still read
+    for lookup in queryset._prefetch_related_lookups:
+        if not isinstance(lookup, str) and lookup.prefetch_through.split('__')[0] in tree:
+            prefetches = [path for path in prefetches if path != lookup.prefetch_through] + [lookup]
+
+    columns = {model._meta.pk.name, *keep}
+    for name in tree:
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            complete = False
+            continue
+        if field.concrete and not field.many_to_many:
+            columns.add(name)
+
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if related:
+        queryset = queryset.select_related(*related)
+    if prefetches:
+        queryset = queryset.prefetch_related(*prefetches)
+    if complete:
+        queryset = queryset.only(*columns)
+    return queryset
+
+
+class SparseQuerysetMixin:
+    """Prunes the viewset queryset to match ?fields=/?omit=/?expand= on reads."""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not sparse_requested(self.request):
+            return queryset
+        serializer = self.get_serializer_class()(context={'request': self.request, 'view': self})
+        # Keep the columns the cursor paginator orders on
+        ordering = getattr(self.paginator, 'ordering', None) or ()
+        if isinstance(ordering, str):
+            ordering = [ordering]
+        keep = [field.lstrip('-') for field in ordering]
+        return prune_queryset(queryset, serializer, keep=keep)
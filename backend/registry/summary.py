@@ -0,0 +1,112 @@
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import AttendanceRecord, MarkRecord, StudentAcademicSummary
+from .upserts import upsert_options
+
+SUMMARY_FIELDS = ['present_days', 'total_days', 'mark_sum', 'mark_count']
+
+
+def apply_summary_delta(user_id, create_missing=True, **deltas):
+    """
+    Adds `deltas` (field -> increment) to a student's summary row in place.
+    When the row is missing it is recomputed from scratch, unless
+    `create_missing` is False (deletes, which may be part of a user cascade).
+    """
+    deltas = {field: value for field, value in deltas.items() if value}
+    if user_id is None or not deltas:
+        return
+    updated = StudentAcademicSummary.objects.filter(user_id=user_id).update(
+        updated_at=timezone.now(), **{field: F(field) + value for field, value in deltas.items()}
+    )
+    if not updated and create_missing:
+        rebuild_summaries([user_id])
+
+
+def compute_summaries(user_ids):
+    """Aggregates the source tables for `user_ids` with one grouped query per table."""
+    summaries = {user_id: dict.fromkeys(SUMMARY_FIELDS, 0) for user_id in user_ids}
+
+    attendance = (
+        AttendanceRecord.objects.filter(user_id__in=user_ids)
+        .values('user_id')
+        .annotate(total=Count('id'), present=Count('id', filter=Q(is_present=True)))
+    )
+    for row in attendance:
+        summaries[row['user_id']].update(present_days=row['present'], total_days=row['total'])
+
+    marks = (
+        MarkRecord.objects.filter(student_id__in=user_ids)
+        .values('student_id')
+        .annotate(mark_sum=Sum('marks'), mark_count=Count('id'))
+    )
+    for row in marks:
+        summaries[row['student_id']].update(mark_sum=row['mark_sum'] or 0, mark_count=row['mark_count'])
+    return summaries
+
+
+def summary_user_ids():
+    """Every user that has, or had, rows feeding a summary."""
+    user_ids = set(AttendanceRecord.objects.values_list('user_id', flat=True).distinct())
+    user_ids |= set(MarkRecord.objects.values_list('student_id', flat=True).distinct())
+    user_ids |= set(StudentAcademicSummary.objects.values_list('user_id', flat=True))
+    return sorted(user_ids)
+
+
+def _chunks(user_ids, chunk_size):
+    user_ids = list(user_ids)
+    for start in range(0, len(user_ids), chunk_size):
+        yield user_ids[start:start + chunk_size]
+
+
+def rebuild_summaries(user_ids=None, chunk_size=1000):
+    """Recomputes and upserts summaries for `user_ids` (all users when None). Returns the row count."""
+    if user_ids is None:
+        user_ids = summary_user_ids()
+    written = 0
+    for chunk in _chunks(set(user_ids), chunk_size):
+        summaries = compute_summaries(chunk)
+        StudentAcademicSummary.objects.bulk_create(
+            [StudentAcademicSummary(user_id=user_id, **values) for user_id, values in summaries.items()],
+            **upsert_options(StudentAcademicSummary, ['user'], SUMMARY_FIELDS + ['updated_at']),
+        )
+        written += len(summaries)
+    return written
+
+
+def academic_figures(summary):
+    """Dashboard figures (attendance %, CGPA, credits, green points) from a StudentAcademicSummary."""
+    attendance_pct = (summary.present_days / summary.total_days * 100) if summary.total_days > 0 else 0
+
+    avg_pct = (summary.mark_sum / summary.mark_count) if summary.mark_count > 0 else 0
+    cgpa = (avg_pct / 10)
+
+    return {
+        'attendance': round(attendance_pct, 2),
+        'cgpa': round(cgpa, 2),
+        'sgpa': round(cgpa, 2),
+        # Flat 3 credits per mark record, as academic_data has always reported
+        'credits': summary.mark_count * 3,
+        'greenPoints': round(attendance_pct + (cgpa * 10), 0)
+    }
+
+
+def verify_summaries(user_ids=None, chunk_size=1000):
+    """Yields `(user_id, stored, expected)` for every summary that has drifted from the source tables."""
+    if user_ids is None:
+        user_ids = summary_user_ids()
+    for chunk in _chunks(set(user_ids), chunk_size):
+        expected = compute_summaries(chunk)
+        stored = {
+            row['user_id']: row
+            for row in StudentAcademicSummary.objects.filter(user_id__in=chunk).values('user_id', *SUMMARY_FIELDS)
+        }
+        for user_id, values in expected.items():
+            current = stored.get(user_id)
+            current = {field: current[field] for field in SUMMARY_FIELDS} if current else None
+            if current is None and not any(values.values()):
+                continue
+            if current is None or any(
+                abs(current[field] - values[field]) > 1e-6 for field in SUMMARY_FIELDS
+            ):
+                yield user_id, current, values
@@ -0,0 +1,410 @@
+import random
+import time
+from datetime import date, datetime, time as dt_time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, models, transaction
+from django.db.models import Count, Max, Q
+from django.db.models.deletion import Collector
+
+from .models import (
+    User, Course, Subject, AcademicTask, AttendanceRecord, HourAttendance, MarkBatch, MarkRecord,
+    LeaveRequest, Timetable, HourAssignment, Notification, NotificationState, AcademicBatch,
+    BatchCourseCurriculum
+)
+from .authentication import invalidate_user_tokens
+from .search import rebuild_search_index
+from .summary import rebuild_summaries
+from .versioning import bump_version
+
+DEPARTMENTS = [
+    ('Computer Science & Engineering', 'CS'),
+    ('Electronics & Communication Engineering', 'EC'),
+    ('Electrical & Electronics Engineering', 'EE'),
+    ('Mechanical Engineering', 'ME'),
+    ('Civil Engineering', 'CE'),
+    ('Information Technology', 'IT'),
+    ('Artificial Intelligence & Data Science', 'AD'),
+    ('Biotechnology', 'BT'),
+]
+YEARS = ['1st Year', '2nd Year', '3rd Year', '4th Year']
+LEAVE_TYPES = [choice for choice, _ in LeaveRequest.LeaveType.choices]
+LEAVE_STATUSES = ['APPROVED'] * 6 + ['PENDING'] * 2 + ['REJECTED']
+BROADCASTS = 10
+CATALOG_MODELS = [
+    Course, Subject, Subject.assigned_staff.through, AcademicBatch, AcademicBatch.departments.through,
+    BatchCourseCurriculum, Timetable, HourAssignment,
+]
+
+
+def purge(queryset):
+    """
+    Deletes `queryset` and every row that cascades from it with one DELETE
+    per table (children first), and an UPDATE per SET_NULL reference. Unlike
+    QuerySet.delete() nothing is loaded and no per-row signal fires, so the
+    caller refreshes whatever those signals maintain. Returns the rows deleted.
+    """
+    deleted = 0
+    for relation in queryset.model._meta.get_fields(include_hidden=True):
+        if relation.concrete or not (relation.one_to_many or relation.one_to_one):
+            continue
+        related = relation.related_model._base_manager.filter(**{f'{relation.field.name}__in': queryset})
+        if relation.on_delete is models.CASCADE:
+            deleted += purge(related)
+        elif relation.on_delete is models.SET_NULL:
+            related.update(**{relation.field.name: None})
+    if Collector(using=queryset.db, origin=queryset).can_fast_delete(queryset):
+        return deleted + queryset.delete()[0]
+    # QuerySet.delete() would load every row to send this model's per-row
+    # signals or to walk the cascades handled above; _raw_delete is the bare
+    # DELETE that Django itself issues for fast deletes
+    return deleted + queryset._raw_delete(queryset.db)
+
+
+class SyntheticDataset:
+    """
+    Generates an institution-sized registry dataset with bulk inserts.
+
+    Primary keys are assigned up front (from the current maximum), so child
+    rows can reference parents without reading ids back, which MySQL's
+    bulk_create cannot do. Every user shares one pre-computed password hash.
+    The same arguments and seed always produce the same rows.
+    """
+
+    def __init__(self, departments=4, students_per_year=50, staff_per_department=12, days=60, hours=None,
+                 subjects_per_semester=5, leaves_per_student=2, tasks_per_subject=2, notifications_per_user=5,
+                 seed=42, end_date=None, prefix='gen', password='password', batch_size=5000, log=None):
+        self.departments = departments
+        self.students_per_year = students_per_year
+        self.staff_per_department = max(staff_per_department, 1)
+        self.days = days
+        self.hours = hours or len(settings.PERIOD_TIMES)
+        self.subjects_per_semester = subjects_per_semester
+        self.leaves_per_student = leaves_per_student
+        self.tasks_per_subject = tasks_per_subject
+        self.notifications_per_user = notifications_per_user
+        self.rng = random.Random(seed)
+        self.end_date = end_date or date.today()
+        self.prefix = prefix
+        self.password_hash = make_password(password)
+        self.batch_size = batch_size
+        self.log = log or (lambda message: None)
+        self.counts = {}
+
+    # --- helpers ---
+
+    def _next_ids(self, model):
+        start = (model.objects.aggregate(top=Max('id'))['top'] or 0) + 1
+        return iter(range(start, 2 ** 62))
+
+    def _insert(self, model, rows):
+        """Bulk inserts an iterable of instances in committed batches of `batch_size`."""
+        total, batch = 0, []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                total += self._flush(model, batch)
+                batch = []
+        if batch:
+            total += self._flush(model, batch)
+        self.counts[model._meta.model_name] = self.counts.get(model._meta.model_name, 0) + total
+        return total
+
+    def _flush(self, model, batch):
+        with transaction.atomic():
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+        return len(batch)
+
+    def _stage(self, name, func):
+        started = time.perf_counter()
+        func()
+        self.log(f'{name:<14} {time.perf_counter() - started:7.1f}s')
+
+    def exists(self):
+        return User.objects.filter(username__startswith=f'{self.prefix}_').exists()
+
+    def school_days(self):
+        days, day = [], self.end_date
+        while len(days) < self.days:
+            if day.weekday() != 6:  # no classes on Sundays
+                days.append(day)
+            day -= timedelta(days=1)
+        return sorted(days)
+
+    # --- stages ---
+
+    def generate(self):
+        for name, stage in [
+            ('catalog', self.create_catalog),
+            ('users', self.create_users),
+            ('timetables', self.create_timetables),
+            ('attendance', self.create_attendance),
+            ('marks', self.create_marks),
+            ('leaves', self.create_leaves),
+            ('tasks', self.create_tasks),
+            ('notifications', self.create_notifications),
+            ('summaries', self.finalize),
+        ]:
+            self._stage(name, stage)
+        return self.counts
+
+    def create_catalog(self):
+        course_ids, subject_ids = self._next_ids(Course), self._next_ids(Subject)
+        self.courses = []
+        for index in range(self.departments):
+            name, code = DEPARTMENTS[index % len(DEPARTMENTS)]
+            if index >= len(DEPARTMENTS):
+                name, code = f'{name} {index // len(DEPARTMENTS) + 1}', f'{code}{index // len(DEPARTMENTS) + 1}'
+            self.courses.append({'id': next(course_ids), 'name': f'{name} [{self.prefix}]', 'code': code})
+        self._insert(Course, (
+            Course(id=course['id'], name=course['name'], degree='B.Tech', domain='Engineering')
+            for course in self.courses
+        ))
+
+        # subjects[course id][semester] -> [(subject id, credits)]
+        self.subjects = {}
+        rows = []
+        for course in self.courses:
+            for semester in range(1, 9):
+                for number in range(self.subjects_per_semester):
+                    subject_id, credits = next(subject_ids), self.rng.choice([2, 3, 3, 4])
+                    self.subjects.setdefault(course['id'], {}).setdefault(semester, []).append((subject_id, credits))
+                    rows.append(Subject(
+                        id=subject_id, course_id=course['id'], semester=semester, credits=credits,
+                        code=f'{self.prefix.upper()}{course["code"]}{semester}{number:02}',
+                        name=f'{course["code"]} Subject {semester}.{number + 1}',
+                        lesson_names=[f'Unit {unit}' for unit in range(1, 6)],
+                    ))
+        self._insert(Subject, rows)
+
+        batch_ids = self._next_ids(AcademicBatch)
+        first_year = self.end_date.year - 3
+        self.batches = []
+        for start in range(first_year, first_year + 4):
+            self.batches.append(next(batch_ids))
+            AcademicBatch.objects.create(
+                id=self.batches[-1], name=f'{start}-{start + 4} B.Tech [{self.prefix}]',
+                start_year=start, end_year=start + 4,
+            ).departments.add(*[course['id'] for course in self.courses])
+        self._insert(BatchCourseCurriculum, (
+            BatchCourseCurriculum(batch_id=batch_id, course_id=course['id'], status='FROZEN')
+            for batch_id in self.batches for course in self.courses
+        ))
+
+    def create_users(self):
+        user_ids = self._next_ids(User)
+        users = []
+        self.staff, self.students = {}, {}
+        for course in self.courses:
+            department = f'{course["name"]} (B.Tech)'
+            course['department'] = department
+            for number in range(self.staff_per_department):
+                user_id = next(user_ids)
+                self.staff.setdefault(course['id'], []).append(user_id)
+                users.append(User(
+                    id=user_id, username=f'{self.prefix}_{course["code"].lower()}_staff_{number}',
+                    email=f'{self.prefix}.{course["code"].lower()}.staff{number}@example.edu',
+                    first_name=f'Staff {number}', role='HOD' if number == 0 else 'STAFF',
+                    department=department, staff_id=f'{self.prefix.upper()}{course["code"]}S{number:04}',
+                    designation='Head of Department' if number == 0 else 'Assistant Professor',
+                    experience=str(self.rng.randint(1, 25)), password=self.password_hash,
+                ))
+            for year_index, year in enumerate(YEARS):
+                for number in range(self.students_per_year):
+                    user_id = next(user_ids)
+                    self.students.setdefault((course['id'], year_index), []).append(user_id)
+                    users.append(User(
+                        id=user_id, username=f'{self.prefix}_{course["code"].lower()}{year_index + 1}_{number}',
+                        email=f'{self.prefix}.{course["code"].lower()}{year_index + 1}.{number}@example.edu',
+                        first_name=f'Student {number}', role='STUDENT', department=department, study_year=year,
+                        reg_no=f'{self.prefix.upper()}{self.end_date.year - year_index}{course["code"]}{number:05}',
+                        mentor_id=self.rng.choice(self.staff[course['id']]), password=self.password_hash,
+                    ))
+        self._insert(User, users)
+
+        links = []
+        for course in self.courses:
+            for semester_subjects in self.subjects[course['id']].values():
+                for subject_id, _ in semester_subjects:
+                    links.append(Subject.assigned_staff.through(
+                        subject_id=subject_id, user_id=self.rng.choice(self.staff[course['id']])
+                    ))
+        self._insert(Subject.assigned_staff.through, links)
+
+    def create_timetables(self):
+        timetable_ids = self._next_ids(Timetable)
+        timetables, assignments = [], []
+        for course in self.courses:
+            staff = self.staff[course['id']]
+            for year_index, year in enumerate(YEARS):
+                timetable_id = next(timetable_ids)
+                timetables.append(Timetable(id=timetable_id, department=course['department'], study_year=year))
+                for hour in range(1, self.hours + 1):
+                    # Rotate so a staff member teaches one class per hour where staffing allows
+                    assignments.append(HourAssignment(
+                        timetable_id=timetable_id, hour=hour, staff_id=staff[(year_index + hour * 4) % len(staff)]
+                    ))
+        self._insert(Timetable, timetables)
+        self._insert(HourAssignment, assignments)
+
+    def create_attendance(self):
+        record_ids = self._next_ids(AttendanceRecord)
+        students = [
+            (user_id, self.staff[course_id][0])
+            for (course_id, _), user_ids in self.students.items() for user_id in user_ids
+        ]
+        records, hours = [], []
+        for day in self.school_days():
+            for user_id, marked_by in students:
+                record_id = next(record_ids)
+                absent_day = self.rng.random() < 0.08
+                statuses = [
+                    'ABSENT' if absent_day or self.rng.random() < 0.03 else 'PRESENT'
+                    for _ in range(self.hours)
+                ]
+                records.append(AttendanceRecord(
+                    id=record_id, user_id=user_id, date=day, marked_by_id=marked_by,
+                    is_present=statuses.count('PRESENT') * 2 > self.hours,
+                ))
+                hours.extend(
+                    HourAttendance(record_id=record_id, hour=hour, status=status)
+                    for hour, status in enumerate(statuses, start=1)
+                )
+                if len(hours) >= self.batch_size:
+                    self._insert(AttendanceRecord, records)
+                    self._insert(HourAttendance, hours)
+                    records, hours = [], []
+        self._insert(AttendanceRecord, records)
+        self._insert(HourAttendance, hours)
+
+    def create_marks(self):
+        batch_ids = self._next_ids(MarkBatch)
+        academic_year = f'{self.end_date.year}-{str(self.end_date.year + 1)[2:]}'
+        batches = []
+        for number in (1, 2):
+            batch = MarkBatch.objects.create(
+                id=next(batch_ids), name=f'INTERNAL {number} [{self.prefix}]', academic_year=academic_year,
+                status='FROZEN' if number == 1 else 'OPEN',
+            )
+            batch.subjects.add(*[
+                subject_id for course in self.courses for year_index in range(4)
+                for subject_id, _ in self.subjects[course['id']][year_index * 2 + 1]
+            ])
+            batches.append(batch.id)
+
+        def rows():
+            for (course_id, year_index), user_ids in self.students.items():
+                subjects = self.subjects[course_id][year_index * 2 + 1]
+                marker = self.staff[course_id][0]
+                for batch_id in batches:
+                    for user_id in user_ids:
+                        for subject_id, _ in subjects:
+                            yield MarkRecord(
+                                batch_id=batch_id, student_id=user_id, subject_id=subject_id,
+                                marks=max(0, min(100, round(self.rng.gauss(68, 14)))), updated_by_id=marker,
+                            )
+        self._insert(MarkRecord, rows())
+
+    def create_leaves(self):
+        first_day = self.school_days()[0]
+        span = max((self.end_date - first_day).days, 1)
+
+        def rows():
+            for (course_id, _), user_ids in self.students.items():
+                for user_id in user_ids:
+                    for _ in range(self.leaves_per_student):
+                        start = first_day + timedelta(days=self.rng.randrange(span + 14))
+                        part_day = self.rng.random() < 0.2
+                        yield LeaveRequest(
+                            student_id=user_id, mentor_id=self.rng.choice(self.staff[course_id]),
+                            type=self.rng.choice(LEAVE_TYPES), status=self.rng.choice(LEAVE_STATUSES),
+                            start_date=start, end_date=start if part_day else start + timedelta(days=self.rng.randint(0, 4)),
+                            start_time=dt_time(13, 0) if part_day else None, reason='Generated leave',
+                        )
+        self._insert(LeaveRequest, rows())
+
+    def create_tasks(self):
+        due = datetime.combine(self.end_date, dt_time(17, 0), tzinfo=dt_timezone.utc)
+
+        def rows():
+            for course in self.courses:
+                for year_index, year in enumerate(YEARS):
+                    for subject_id, _ in self.subjects[course['id']][year_index * 2 + 1]:
+                        for number in range(self.tasks_per_subject):
+                            yield AcademicTask(
+                                title=f'Assignment {number + 1}', description='Generated task',
+                                due_date=due + timedelta(days=self.rng.randint(-30, 30)),
+                                priority=self.rng.choice(['LOW', 'MEDIUM', 'HIGH']),
+                                status=self.rng.choice(['TO DO', 'IN PROGRESS', 'COMPLETED']),
+                                subject_id=subject_id, department=course['department'], study_year=year,
+                                staff_id=self.rng.choice(self.staff[course['id']]),
+                            )
+        self._insert(AcademicTask, rows())
+
+    def create_notifications(self):
+        user_ids = [user_id for ids in self.staff.values() for user_id in ids]
+        user_ids += [user_id for ids in self.students.values() for user_id in ids]
+
+        def rows():
+            for number in range(BROADCASTS):
+                yield Notification(user=None, message=f'[{self.prefix}] Institution notice {number + 1}', type='SYSTEM')
+            for user_id in user_ids:
+                for number in range(self.notifications_per_user):
+                    yield Notification(
+                        user_id=user_id, message=f'Update {number + 1}', read=self.rng.random() < 0.6,
+                        type=self.rng.choice(['SYSTEM', 'TASK', 'LEAVE', 'ATTENDANCE']),
+                    )
+        self._insert(Notification, rows())
+
+        unread = dict(
+            Notification.objects.filter(user__username__startswith=f'{self.prefix}_', read=False)
+            .values('user_id').annotate(n=Count('id')).values_list('user_id', 'n')
+        )
+        self._insert(NotificationState, (
+            NotificationState(user_id=user_id, unread_count=unread.get(user_id, 0)) for user_id in user_ids
+        ))
+
+    def finalize(self):
+        # Explicit ids leave PostgreSQL sequences behind; MySQL and SQLite track the maximum themselves
+        sequenced = [Course, Subject, AcademicBatch, User, Timetable, AttendanceRecord, MarkBatch]
+        with connection.cursor() as cursor:
+            for statement in connection.ops.sequence_reset_sql(no_style(), sequenced):
+                cursor.execute(statement)
+
+        # Bulk inserts bypass the signals behind summaries, the search index and catalog versions
+        self.counts['usersearchtoken'] = rebuild_search_index(User.objects.filter(username__startswith=f'{self.prefix}_'))
+        students = [user_id for ids in self.students.values() for user_id in ids]
+        self.counts['studentacademicsummary'] = rebuild_summaries(students)
+        bump_version(*CATALOG_MODELS)
+
+    def delete(self):
+        """
+        Removes a previous run with the same prefix with set-based deletes
+        (see purge), then brings the state kept by the skipped signals back in
+        line: catalog versions, cached tokens of the removed users and the
+        summaries of other students who had marks in removed batches.
+        """
+        users = User.objects.filter(username__startswith=f'{self.prefix}_')
+        courses = Course.objects.filter(name__endswith=f'[{self.prefix}]')
+        mark_batches = MarkBatch.objects.filter(name__endswith=f'[{self.prefix}]')
+        departments = [f'{name} (B.Tech)' for name in courses.values_list('name', flat=True)]
+        user_ids = list(users.values_list('id', flat=True))
+        students = set(
+            MarkRecord.objects.filter(Q(batch__in=mark_batches) | Q(subject__course__in=courses))
+            .exclude(student__in=users).values_list('student_id', flat=True)
+        )
+
+        with transaction.atomic():
+            deleted = purge(Timetable.objects.filter(department__in=departments))
+            deleted += purge(users)
+            deleted += purge(courses)
+            deleted += purge(AcademicBatch.objects.filter(name__endswith=f'[{self.prefix}]'))
+            deleted += purge(mark_batches)
+            deleted += purge(Notification.objects.filter(user=None, message__startswith=f'[{self.prefix}] '))
+            rebuild_summaries(students)
+            bump_version(*CATALOG_MODELS)
+        for user_id in user_ids:
+            invalidate_user_tokens(user_id)
+        return deleted
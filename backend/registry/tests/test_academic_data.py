@@ -0,0 +1,53 @@
+from datetime import date, timedelta
+
+from rest_framework.test import APITestCase
+
+from registry.models import User, Course, Subject, AttendanceRecord, MarkBatch, MarkRecord
+from registry.summary import rebuild_summaries
+from registry.tests.utils import mysql_upserts
+
+
+class AcademicDataTests(APITestCase):
+    def setUp(self):
+        self.student = User.objects.create(username='student', role='STUDENT')
+        self.client.force_authenticate(self.student)
+        course = Course.objects.create(name='CSE', degree='B.Tech')
+        self.subjects = [
+            Subject.objects.create(course=course, code=f'CS{i}', name=f'Subject {i}', semester=1, credits=credits)
+            for i, credits in enumerate([4, 2, 3])
+        ]
+        self.batch = MarkBatch.objects.create(name='Internal 1', academic_year='2024-25')
+
+    def get(self):
+        response = self.client.get(f'/api/registry/users/{self.student.pk}/academic_data/')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_figures_follow_source_rows(self):
+        today = date.today()
+        for offset, present in enumerate([True, True, False, True]):
+            AttendanceRecord.objects.create(user=self.student, date=today - timedelta(days=offset), is_present=present)
+        for subject, marks in zip(self.subjects, [80, 60, 70]):
+            MarkRecord.objects.create(batch=self.batch, student=self.student, subject=subject, marks=marks)
+
+        self.assertEqual(self.get(), {
+            'attendance': 75.0, 'cgpa': 7.0, 'sgpa': 7.0, 'credits': 9, 'greenPoints': 145,
+        })
+
+    def test_credits_are_three_per_mark_record(self):
+        record = MarkRecord.objects.create(batch=self.batch, student=self.student, subject=self.subjects[0], marks=50)
+        self.assertEqual(self.get()['credits'], 3)
+        record.delete()
+        self.assertEqual(self.get()['credits'], 0)
+
+    def test_summary_upserts_on_mysql(self):
+        with mysql_upserts():
+            AttendanceRecord.objects.create(user=self.student, date=date.today(), is_present=True)
+            MarkRecord.objects.create(batch=self.batch, student=self.student, subject=self.subjects[0], marks=80)
+            self.assertEqual(rebuild_summaries([self.student.pk]), 1)
+        self.assertEqual(self.get(), {
+            'attendance': 100.0, 'cgpa': 8.0, 'sgpa': 8.0, 'credits': 3, 'greenPoints': 180,
+        })
+
+    def test_empty_student(self):
+        self.assertEqual(self.get(), {'attendance': 0, 'cgpa': 0, 'sgpa': 0, 'credits': 0, 'greenPoints': 0})
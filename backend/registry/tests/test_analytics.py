@@ -0,0 +1,41 @@
+from datetime import date
+
+from rest_framework.test import APITestCase
+
+from registry.models import User, AttendanceRecord
+
+URL = '/api/registry/analytics/cohort/'
+
+
+class CohortAnalyticsTests(APITestCase):
+    def setUp(self):
+        for department, present in (('CSE', True), ('ECE', False)):
+            student = User.objects.create(
+                username=f'student_{department}', role='STUDENT', department=department, study_year='1st Year'
+            )
+            AttendanceRecord.objects.create(user=student, date=date.today(), is_present=present)
+
+    def get(self, user, **params):
+        self.client.force_authenticate(user)
+        return self.client.get(URL, params)
+
+    def test_hod_is_scoped_to_own_department(self):
+        hod = User.objects.create(username='hod', role='HOD', department='CSE')
+        response = self.get(hod, department='ECE')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['scope']['department'], 'CSE')
+        self.assertEqual([row['department'] for row in response.data['attendance']], ['CSE'])
+
+    def test_hod_without_department_is_refused(self):
+        hod = User.objects.create(username='hod', role='HOD')
+        self.assertEqual(self.get(hod).status_code, 403)
+
+    def test_dean_sees_every_department(self):
+        dean = User.objects.create(username='dean', role='DEAN')
+        response = self.get(dean)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['department'] for row in response.data['attendance']], ['CSE', 'ECE'])
+
+    def test_staff_is_refused(self):
+        staff = User.objects.create(username='staff', role='STAFF', department='CSE')
+        self.assertEqual(self.get(staff).status_code, 403)
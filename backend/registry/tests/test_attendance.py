@@ -0,0 +1,69 @@
+from datetime import date
+
+from rest_framework.test import APITestCase
+
+from registry.models import User, AttendanceRecord, LeaveRequest, StudentAcademicSummary
+from registry.tests.utils import mysql_upserts
+
+URL = '/api/registry/attendance/bulk_create/'
+DAY = '2025-03-10'
+
+
+class AttendanceBulkCreateTests(APITestCase):
+    def setUp(self):
+        self.staff = User.objects.create(username='staff', role='STAFF')
+        self.client.force_authenticate(self.staff)
+        self.students = [User.objects.create(username=f'student_{i}', role='STUDENT') for i in range(2)]
+
+    def row(self, student, present=True, hours=((1, 'PRESENT'),)):
+        return {
+            'user': student.pk, 'date': DAY, 'is_present': present,
+            'hours': [{'hour': hour, 'status': status} for hour, status in hours],
+        }
+
+    def test_upsert_creates_then_updates(self):
+        response = self.client.post(URL, [self.row(self.students[0])], format='json')
+        self.assertEqual((response.data['created'], response.data['updated']), (1, 0))
+
+        response = self.client.post(URL, [
+            self.row(self.students[0], present=False, hours=[(1, 'ABSENT'), (2, 'ABSENT')]),
+            self.row(self.students[1]),
+        ], format='json')
+        self.assertEqual((response.data['created'], response.data['updated']), (1, 1))
+        record = AttendanceRecord.objects.get(user=self.students[0])
+        self.assertFalse(record.is_present)
+        self.assertEqual(sorted(record.hours.values_list('hour', 'status')), [(1, 'ABSENT'), (2, 'ABSENT')])
+        self.assertEqual(StudentAcademicSummary.objects.get(user=self.students[0]).total_days, 1)
+
+    def test_upsert_on_mysql(self):
+        with mysql_upserts():
+            self.client.post(URL, [self.row(self.students[0])], format='json')
+            response = self.client.post(URL, [self.row(self.students[0], present=False)], format='json')
+        self.assertEqual((response.data['created'], response.data['updated']), (0, 1))
+        self.assertFalse(AttendanceRecord.objects.get(user=self.students[0]).is_present)
+
+    def test_invalid_rows_are_reported_per_index(self):
+        response = self.client.post(URL, [
+            self.row(self.students[0]), {'user': 0, 'date': DAY}, self.row(self.students[0]),
+        ], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['status'] for row in response.data['results']], ['created', 'error', 'error'])
+
+    def test_atomic_rejects_whole_batch(self):
+        response = self.client.post(f'{URL}?atomic=true', [self.row(self.students[0]), {'user': 0, 'date': DAY}], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([row['status'] for row in response.data['results']], ['skipped', 'error'])
+        self.assertFalse(AttendanceRecord.objects.exists())
+
+    def test_non_list_payload_is_rejected(self):
+        self.assertEqual(self.client.post(URL, {'user': 1}, format='json').status_code, 400)
+
+    def test_unmarked_hours_are_filled_from_approved_leave(self):
+        LeaveRequest.objects.create(
+            student=self.students[0], mentor=self.staff, type='MEDICAL', reason='-', status='APPROVED',
+            start_date=date(2025, 3, 10), end_date=date(2025, 3, 10),
+        )
+        self.client.post(URL, [self.row(self.students[0], hours=[(1, 'PRESENT')])], format='json')
+        record = AttendanceRecord.objects.get(user=self.students[0])
+        self.assertEqual(record.hours.get(hour=1).status, 'PRESENT')
+        self.assertGreater(record.hours.exclude(hour=1).count(), 0)
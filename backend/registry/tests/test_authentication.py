@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from oauth2_provider.models import get_access_token_model, get_application_model
+
+from registry.authentication import CachedOAuth2Validator, token_cache
+from registry.checks import shared_caches_check
+from registry.models import User
+
+AccessToken = get_access_token_model()
+Application = get_application_model()
+
+
+class TokenCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='staff', role='STAFF')
+        application = Application.objects.create(
+            name='web', client_type=Application.CLIENT_PUBLIC, authorization_grant_type=Application.GRANT_PASSWORD
+        )
+        self.token = AccessToken.objects.create(
+            user=self.user, application=application, token='secret-token', scope='read write',
+            expires=timezone.now() + timedelta(hours=1),
+        )
+        self.validator = CachedOAuth2Validator()
+
+    def load(self):
+        return self.validator._load_access_token('secret-token')
+
+    def test_second_lookup_is_served_from_cache(self):
+        self.assertEqual(self.load(), self.token)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.load(), self.token)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_revoked_token_is_dropped(self):
+        self.load()
+        self.token.delete()
+        self.assertIsNone(self.load())
+
+    def test_user_change_makes_cached_token_stale(self):
+        self.load()
+        self.user.role = 'HOD'
+        self.user.save()
+        self.assertEqual(self.load().user.role, 'HOD')
+
+    @override_settings(REGISTRY_SINGLE_PROCESS=False)
+    def test_process_local_cache_is_not_used_by_several_workers(self):
+        self.assertIsNone(token_cache())
+        self.assertEqual(self.load(), self.token)
+        with CaptureQueriesContext(connection) as ctx:
+            self.load()
+        self.assertGreater(len(ctx.captured_queries), 0)
+        self.assertIn('registry.E001', [error.id for error in shared_caches_check(None)])
+
+    @override_settings(REGISTRY_SINGLE_PROCESS=False, OAUTH2_TOKEN_CACHE_TTL=0)
+    def test_disabled_token_cache_passes_check(self):
+        self.assertNotIn('registry.E001', [error.id for error in shared_caches_check(None)])
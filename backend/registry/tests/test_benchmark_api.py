@@ -0,0 +1,36 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from registry.management.commands.benchmark_api import Command
+
+SCALE = {'departments': 1}
+ROW = {'p50': 1.0, 'p95': 2.0, 'p99': 3.0, 'queries': 2, 'bytes': 100}
+
+
+class BenchmarkBaselineTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.baseline = Path(directory.name) / 'baseline.json'
+
+    def compare(self, results):
+        options = {'baseline': self.baseline, 'tolerance': 0.25, 'size_tolerance': 0.10}
+        Command(stdout=io.StringIO(), stderr=io.StringIO()).compare(results, SCALE, options)
+
+    def test_missing_baseline_fails(self):
+        with self.assertRaisesMessage(CommandError, 'No baseline'):
+            call_command('benchmark_api', baseline=self.baseline)
+
+    def test_regressions_fail(self):
+        self.baseline.write_text(json.dumps({'scale': SCALE, 'results': {'users': ROW}}))
+        self.compare({'users': ROW})
+        with self.assertRaisesMessage(CommandError, '1 regression(s)'):
+            self.compare({'users': {**ROW, 'queries': 3}})
+        with self.assertRaisesMessage(CommandError, '1 regression(s)'):
+            self.compare({'users': ROW, 'tasks': ROW})
@@ -0,0 +1,66 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+
+from registry.caching import LocalCache, TwoTierCache, read_cache
+from registry.models import User, Course
+
+
+class LocalCacheTests(SimpleTestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        local = LocalCache(max_entries=2)
+        local.set('a', 1)
+        local.set('b', 2)
+        local.get('a')
+        local.set('c', 3)
+        self.assertEqual((local.get('a'), local.get('b'), local.get('c')), (1, None, 3))
+
+    def test_expired_entry_is_dropped(self):
+        local = LocalCache(ttl=30)
+        with mock.patch('registry.caching.time.monotonic', return_value=100):
+            local.set('a', 1)
+        with mock.patch('registry.caching.time.monotonic', return_value=131):
+            self.assertIsNone(local.get('a'))
+        self.assertEqual(len(local), 0)
+
+
+class TwoTierCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = TwoTierCache(prefix='test')
+        self.cache.clear()
+
+    def test_shared_hit_is_promoted_locally(self):
+        self.cache.set('key', {'value': 1})
+        self.cache.local.clear()
+        self.assertEqual(self.cache.get('key'), {'value': 1})
+        self.assertEqual(self.cache.get('key'), {'value': 1})
+        stats = self.cache.stats()
+        self.assertEqual((stats['shared_hits'], stats['local_hits']), (1, 1))
+
+    @override_settings(REGISTRY_SINGLE_PROCESS=False)
+    def test_process_local_alias_is_bypassed(self):
+        self.cache.set('key', {'value': 1})
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(len(self.cache.local), 0)
+        self.assertFalse(self.cache.stats()['shared'])
+
+
+class CatalogReadCacheTests(APITestCase):
+    def setUp(self):
+        read_cache.clear()
+        self.client.force_authenticate(User.objects.create(username='staff', role='STAFF'))
+        with self.captureOnCommitCallbacks(execute=True):
+            Course.objects.create(name='CSE', degree='B.Tech')
+
+    def test_repeat_read_runs_no_queries(self):
+        first = self.client.get('/api/registry/courses/')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/registry/courses/')
+        self.assertEqual(second.data, first.data)
+
+    def test_write_is_visible_on_next_read(self):
+        self.client.get('/api/registry/courses/')
+        with self.captureOnCommitCallbacks(execute=True):
+            Course.objects.create(name='ECE', degree='B.Tech')
+        self.assertEqual(len(self.client.get('/api/registry/courses/').data), 2)
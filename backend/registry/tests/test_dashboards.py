@@ -0,0 +1,39 @@
+from asgiref.sync import async_to_sync
+from django.test import TestCase
+
+from registry.dashboards import dashboard_for
+from registry.models import User
+
+
+async def _await(coroutine):
+    return await coroutine
+
+
+class DashboardRoleTests(TestCase):
+    def dashboard(self, user, role=None, department=None):
+        role, sections = dashboard_for(user, role, department=department)
+        return role, (async_to_sync(_await)(sections) if sections is not None else None)
+
+    def test_associate_professors_get_the_staff_dashboard(self):
+        for role in (User.Role.ASSOC_PROF_I, User.Role.ASSOC_PROF_II, User.Role.ASSOC_PROF_III):
+            with self.subTest(role=role):
+                user = User.objects.create(username=role.lower(), role=role, department='CSE')
+                self.assertEqual(self.dashboard(user)[0], 'staff')
+                role_name, payload = self.dashboard(user, 'staff')
+                self.assertEqual(role_name, 'staff')
+                self.assertEqual(payload['mentees'], 0)
+                self.assertIsNone(self.dashboard(user, 'hod')[1])
+
+    def test_hod_counts_associate_professors_as_staff(self):
+        hod = User.objects.create(username='hod', role=User.Role.HOD, department='CSE')
+        User.objects.create(username='assoc', role=User.Role.ASSOC_PROF_II, department='CSE')
+        User.objects.create(username='student', role=User.Role.STUDENT, department='CSE')
+        role, payload = self.dashboard(hod)
+        self.assertEqual(role, 'hod')
+        self.assertEqual(payload['counts'], {'students': 1, 'staff': 2})
+
+    def test_students_cannot_open_other_dashboards(self):
+        student = User.objects.create(username='student', role=User.Role.STUDENT)
+        self.assertEqual(self.dashboard(student)[0], 'student')
+        self.assertIsNone(self.dashboard(student, 'staff')[1])
+        self.assertIsNone(self.dashboard(student, 'dean')[1])
@@ -0,0 +1,80 @@
+import csv
+import io
+from datetime import date
+
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from openpyxl import load_workbook
+from rest_framework.test import APITestCase
+
+from registry.exports import MARK_SHEET_COLUMNS, iter_keyset
+from registry.models import User, Course, Subject, AttendanceRecord, HourAttendance, MarkBatch, MarkRecord
+
+
+class ExportTests(APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create(username='staff', role='STAFF'))
+        # Created out of register order, so pk order and register order differ
+        self.students = [
+            User.objects.create(username=username, role='STUDENT', reg_no=reg_no)
+            for username, reg_no in [('carol', 'R3'), ('alice', 'R1'), ('bob', 'R2')]
+        ]
+        course = Course.objects.create(name='CSE', degree='B.Tech')
+        self.subjects = [
+            Subject.objects.create(course=course, code=code, name=f'Subject {code}', semester=1) for code in ['CS2', 'CS1']
+        ]
+        self.batch = MarkBatch.objects.create(name='Internal 1', academic_year='2024-25')
+        for student in self.students:
+            for subject in self.subjects:
+                MarkRecord.objects.create(batch=self.batch, student=student, subject=subject, marks=40)
+
+    def read_csv(self, response):
+        self.assertEqual(response.status_code, 200)
+        content = b''.join(response.streaming_content).decode('utf-8-sig')
+        return list(csv.reader(io.StringIO(content)))
+
+    def test_mark_sheet_csv_is_in_register_order(self):
+        rows = self.read_csv(self.client.get(f'/api/registry/mark-batches/{self.batch.pk}/export/'))
+        self.assertEqual(rows[0], [label for _, label in MARK_SHEET_COLUMNS])
+        self.assertEqual([(row[0], row[4]) for row in rows[1:]], [
+            ('R1', 'CS1'), ('R1', 'CS2'), ('R2', 'CS1'), ('R2', 'CS2'), ('R3', 'CS1'), ('R3', 'CS2'),
+        ])
+        self.assertEqual(rows[1][:2] + rows[1][6:], ['R1', 'alice', '40.0', '100.0'])
+
+    def test_mark_sheet_xlsx(self):
+        response = self.client.get(f'/api/registry/mark-batches/{self.batch.pk}/export/?file_type=xlsx')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('marks-', response['Content-Disposition'])
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+        rows = list(workbook.active.iter_rows(values_only=True))
+        self.assertEqual(rows[0][0], 'reg_no')
+        self.assertEqual([row[0] for row in rows[1:]], ['R1', 'R1', 'R2', 'R2', 'R3', 'R3'])
+
+    def test_keyset_chunks_resume_across_boundaries(self):
+        # Ties on the leading sort keys must neither skip nor repeat rows at a chunk edge
+        self.students[1].reg_no = None
+        self.students[1].save()
+        queryset = MarkRecord.objects.filter(batch=self.batch).annotate(sort_reg_no=Coalesce('student__reg_no', Value('')))
+        order = ['sort_reg_no', 'student_id', 'subject__code']
+        expected = [(username, code) for username in ('alice', 'bob', 'carol') for code in ('CS1', 'CS2')]
+        for chunk_size in (1, 2, 4, 10):
+            with self.assertNumQueries(len(expected) // chunk_size + 1):
+                rows = list(iter_keyset(queryset, ['student__username', 'subject__code'], order=order, chunk_size=chunk_size))
+            self.assertEqual(rows, expected)
+
+    def test_missing_or_malformed_batch_is_404(self):
+        self.assertEqual(self.client.get('/api/registry/mark-batches/999/export/').status_code, 404)
+        self.assertEqual(self.client.get('/api/registry/mark-batches/abc/export/').status_code, 404)
+
+    def test_attendance_register_is_in_register_order(self):
+        for day in (date(2025, 3, 11), date(2025, 3, 10)):
+            for student in self.students:
+                record = AttendanceRecord.objects.create(user=student, date=day, is_present=True)
+                for hour in (2, 1):
+                    HourAttendance.objects.create(record=record, hour=hour)
+        rows = self.read_csv(self.client.get(
+            '/api/registry/attendance/export/?date_from=2025-03-10&date_to=2025-03-10'
+        ))
+        self.assertEqual([(row[0], row[1], row[6]) for row in rows[1:]], [
+            ('2025-03-10', reg_no, hour) for reg_no in ('R1', 'R2', 'R3') for hour in ('1', '2')
+        ])
@@ -0,0 +1,103 @@
+import json
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from registry.caching import read_cache
+from registry.instrumentation import RequestMetrics, metrics
+from registry.models import User, Course
+
+
+class RequestMetricsTests(SimpleTestCase):
+    def test_export(self):
+        recorded = RequestMetrics()
+        labels = ('CourseViewSet', 'list', 'GET')
+        recorded.record(labels, 200, 0.02, 3, 0.005, 0.001, 120, False)
+        recorded.record(labels, 200, 0.7, 5, 0.25, 0.002, 80, True)
+        recorded.record(labels, 404, 0.003, 1, 0.001, 0.0, 10, False)
+        lines = recorded.export().splitlines()
+
+        series = 'view="CourseViewSet",action="list",method="GET"'
+        for line in [
+            f'registry_requests_total{{{series},status="200"}} 2',
+            f'registry_requests_total{{{series},status="404"}} 1',
+            f'registry_request_duration_seconds_bucket{{{series},le="0.005"}} 1',
+            f'registry_request_duration_seconds_bucket{{{series},le="0.025"}} 2',
+            f'registry_request_duration_seconds_bucket{{{series},le="1"}} 3',
+            f'registry_request_duration_seconds_bucket{{{series},le="+Inf"}} 3',
+            f'registry_request_duration_seconds_count{{{series}}} 3',
+            f'registry_request_duration_seconds_sum{{{series}}} 0.723000',
+            f'registry_db_queries_total{{{series}}} 9',
+            f'registry_render_duration_seconds_total{{{series}}} 0.003000',
+            f'registry_response_bytes_total{{{series}}} 210',
+            f'registry_slow_requests_total{{{series}}} 1',
+            '# TYPE registry_request_duration_seconds histogram',
+        ]:
+            self.assertIn(line, lines)
+
+        recorded.reset()
+        self.assertNotIn('registry_requests_total{', recorded.export())
+
+
+@override_settings(SERVER_TIMING=True, SLOW_REQUEST_MS=10_000, SLOW_QUERY_MS=10_000)
+class RequestInstrumentationTests(APITestCase):
+    def setUp(self):
+        metrics.reset()
+        read_cache.clear()
+        self.user = User.objects.create(username='staff', role='STAFF', is_staff=True)
+        self.client.force_authenticate(self.user)
+        Course.objects.create(name='CSE', degree='B.Tech')
+
+    def timings(self, response):
+        return dict(entry.split(';', 1) for entry in response['Server-Timing'].split(', '))
+
+    def test_server_timing_and_metrics(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get('/api/registry/courses/?fields=id,name')
+        queries = len(captured)
+        self.assertEqual(response.status_code, 200)
+        timings = self.timings(response)
+        self.assertEqual(set(timings), {'db', 'render', 'app', 'total'})
+        self.assertTrue(timings['db'].endswith(f'desc="{queries} queries"'))
+
+        exported = self.client.get('/api/registry/metrics/').content.decode()
+        self.assertIn(
+            'registry_requests_total{view="CourseViewSet",action="list",method="GET",status="200"} 1', exported
+        )
+        self.assertIn(
+            f'registry_db_queries_total{{view="CourseViewSet",action="list",method="GET"}} {queries}', exported
+        )
+
+    @override_settings(SERVER_TIMING=False)
+    def test_server_timing_can_be_turned_off(self):
+        self.assertNotIn('Server-Timing', self.client.get('/api/registry/courses/'))
+
+    @override_settings(SLOW_REQUEST_MS=0, SLOW_QUERY_MS=0)
+    def test_slow_requests_and_queries_are_logged(self):
+        with self.assertLogs('registry.slow', 'WARNING') as logs:
+            self.client.get('/api/registry/courses/')
+        events = [json.loads(record.getMessage()) for record in logs.records]
+        queries = [event for event in events if event['event'] == 'slow_query']
+        request, = [event for event in events if event['event'] == 'slow_request']
+        self.assertTrue(queries)
+        self.assertTrue(all(event['view'] == 'CourseViewSet' and event['sql'] for event in queries))
+        self.assertEqual((request['view'], request['action'], request['status']), ('CourseViewSet', 'list', 200))
+        self.assertEqual((request['queries'], request['slow_queries']), (len(queries), len(queries)))
+        self.assertIn('render_ms', request)
+
+    def test_fast_requests_are_not_logged(self):
+        with self.assertNoLogs('registry.slow'):
+            self.client.get('/api/registry/courses/')
+
+
+@override_settings(SERVER_TIMING=True)
+class AsyncInstrumentationTests(TestCase):
+    async def test_queries_in_async_views_are_counted(self):
+        user = await User.objects.acreate(username='student', role='STUDENT', department='CSE')
+        await self.async_client.aforce_login(user)
+        response = await self.async_client.get('/api/registry/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        db = response['Server-Timing'].split(', ')[0]
+        self.assertNotIn('desc="0 queries"', db)
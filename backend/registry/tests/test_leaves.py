@@ -0,0 +1,55 @@
+from datetime import date, time
+
+from rest_framework.test import APITestCase
+
+from registry.models import User, LeaveRequest
+
+URL = '/api/registry/leaves/'
+
+
+class LeaveCalendarTests(APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create(username='dean', role='DEAN'))
+        self.mentor = User.objects.create(username='mentor', role='STAFF')
+        self.student = User.objects.create(username='student', role='STUDENT', department='CSE')
+
+    def leave(self, start, end, status='APPROVED', **extra):
+        return LeaveRequest(
+            student=self.student, mentor=self.mentor, type='MEDICAL', reason='-',
+            start_date=start, end_date=end, status=status, **extra
+        )
+
+    def ids(self, response):
+        self.assertEqual(response.status_code, 200)
+        return sorted(row['id'] for row in response.data)
+
+    def test_overlaps_include_bulk_inserted_long_leave(self):
+        short = self.leave(date(2025, 3, 10), date(2025, 3, 10))
+        short.save()
+        self.client.get(f'{URL}overlaps/', {'date_from': '2025-03-10'})
+        # Bulk writes fire no signals; a leave starting weeks before the window must still match
+        LeaveRequest.objects.bulk_create([
+            self.leave(date(2025, 2, 1), date(2025, 3, 20)),
+            self.leave(date(2025, 2, 1), date(2025, 3, 9)),
+            self.leave(date(2025, 3, 11), date(2025, 3, 12)),
+            self.leave(date(2025, 3, 1), date(2025, 3, 30), status='PENDING'),
+        ])
+        long = LeaveRequest.objects.get(end_date=date(2025, 3, 20))
+        self.assertEqual(self.ids(self.client.get(f'{URL}overlaps/', {'date_from': '2025-03-10'})), [short.pk, long.pk])
+
+    def test_overlaps_filter_by_class(self):
+        self.leave(date(2025, 3, 10), date(2025, 3, 10)).save()
+        response = self.client.get(f'{URL}overlaps/', {'date_from': '2025-03-10', 'department': 'ECE'})
+        self.assertEqual(self.ids(response), [])
+
+    def test_on_leave_resolves_part_day_hours(self):
+        morning = self.leave(date(2025, 3, 10), date(2025, 3, 10), start_time=time(9), end_time=time(11))
+        morning.save()
+        self.assertEqual(self.ids(self.client.get(f'{URL}on_leave/', {'date': '2025-03-10', 'hour': 1})), [morning.pk])
+        self.assertEqual(self.ids(self.client.get(f'{URL}on_leave/', {'date': '2025-03-10', 'hour': 6})), [])
+
+    def test_students_only_see_their_own_leaves(self):
+        self.leave(date(2025, 3, 10), date(2025, 3, 10)).save()
+        other = User.objects.create(username='other', role='STUDENT')
+        self.client.force_authenticate(other)
+        self.assertEqual(self.ids(self.client.get(URL)), [])
@@ -0,0 +1,129 @@
+import io
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from openpyxl import Workbook
+from rest_framework.test import APITestCase
+
+from registry.models import User, Course, Subject, MarkBatch, MarkRecord
+from registry.tests.utils import mysql_upserts
+
+URL = '/api/registry/mark-records/'
+
+
+class MarkRecordTests(APITestCase):
+    def setUp(self):
+        self.staff = User.objects.create(username='staff', role='STAFF')
+        self.client.force_authenticate(self.staff)
+        self.student = User.objects.create(username='student', role='STUDENT')
+        course = Course.objects.create(name='CSE', degree='B.Tech')
+        self.subject = Subject.objects.create(course=course, code='CS1', name='Subject 1', semester=1)
+        self.other_subject = Subject.objects.create(course=course, code='CS2', name='Subject 2', semester=1)
+        self.batch = MarkBatch.objects.create(name='Internal 1', academic_year='2024-25')
+        self.frozen = MarkBatch.objects.create(name='Internal 0', academic_year='2024-25', status='FROZEN')
+
+    def row(self, batch, subject, marks):
+        return {'batch': batch.pk, 'student': self.student.pk, 'subject': subject.pk, 'marks': marks}
+
+    def test_bulk_upsert_creates_then_updates(self):
+        response = self.client.post(f'{URL}bulk_upsert/', [self.row(self.batch, self.subject, 40)], format='json')
+        self.assertEqual((response.data['created'], response.data['updated']), (1, 0))
+
+        response = self.client.post(f'{URL}bulk_upsert/', [
+            self.row(self.batch, self.subject, 55), self.row(self.batch, self.other_subject, 70),
+        ], format='json')
+        self.assertEqual((response.data['created'], response.data['updated']), (1, 1))
+        self.assertEqual(MarkRecord.objects.get(subject=self.subject).marks, 55)
+        self.assertEqual(MarkRecord.objects.count(), 2)
+
+    def test_bulk_upsert_on_mysql(self):
+        with mysql_upserts():
+            self.client.post(f'{URL}bulk_upsert/', [self.row(self.batch, self.subject, 40)], format='json')
+            response = self.client.post(f'{URL}bulk_upsert/', [self.row(self.batch, self.subject, 65)], format='json')
+        self.assertEqual((response.data['created'], response.data['updated']), (0, 1))
+        self.assertEqual(MarkRecord.objects.get().marks, 65)
+
+    def test_bulk_upsert_reports_invalid_rows(self):
+        response = self.client.post(f'{URL}bulk_upsert/', [
+            self.row(self.batch, self.subject, 40),
+            self.row(self.frozen, self.subject, 40),
+            self.row(self.batch, self.subject, 45),
+        ], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['status'] for row in response.data['results']], ['created', 'error', 'error'])
+
+    def test_atomic_bulk_upsert_writes_nothing_on_error(self):
+        response = self.client.post(f'{URL}bulk_upsert/?atomic=true', [
+            self.row(self.batch, self.subject, 40), self.row(self.frozen, self.subject, 40),
+        ], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(MarkRecord.objects.exists())
+
+    def test_locked_batch_rejects_update_and_delete(self):
+        record = MarkRecord.objects.create(batch=self.frozen, student=self.student, subject=self.subject, marks=30)
+
+        response = self.client.patch(f'{URL}{record.pk}/', {'batch': self.batch.pk, 'marks': 90}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.delete(f'{URL}{record.pk}/').status_code, 400)
+
+        record.refresh_from_db()
+        self.assertEqual((record.batch_id, record.marks), (self.frozen.pk, 30))
+
+    def test_open_batch_allows_delete(self):
+        record = MarkRecord.objects.create(batch=self.batch, student=self.student, subject=self.subject, marks=30)
+        self.assertEqual(self.client.delete(f'{URL}{record.pk}/').status_code, 204)
+        self.assertFalse(MarkRecord.objects.exists())
+
+
+class MarkSheetImportTests(APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create(username='staff', role='STAFF'))
+        self.students = [User.objects.create(username=f'student_{i}', role='STUDENT', reg_no=f'REG{i}') for i in range(2)]
+        course = Course.objects.create(name='CSE', degree='B.Tech')
+        self.subject = Subject.objects.create(course=course, code='CS1', name='Subject 1', semester=1)
+        self.batch = MarkBatch.objects.create(name='Internal 1', academic_year='2024-25')
+
+    def upload(self, content, name='marks.csv', **data):
+        upload = SimpleUploadedFile(name, content)
+        return self.client.post(f'{URL}import/', {'file': upload, 'batch': self.batch.pk, **data}, format='multipart')
+
+    def test_csv_headers_map_reg_no_and_subject_code(self):
+        response = self.upload(b'Reg No,Subject Code,Marks,Max Marks\nREG0,CS1,40,50\nREG1,CS1,35,\n')
+        self.assertEqual((response.data['created'], response.data['updated']), (2, 0))
+        self.assertEqual(
+            sorted(MarkRecord.objects.values_list('student__reg_no', 'marks', 'max_marks')),
+            [('REG0', 40, 50), ('REG1', 35, 100)],
+        )
+
+    def test_xlsx_sheet(self):
+        workbook = Workbook()
+        workbook.active.append(['reg_no', 'subject_code', 'marks'])
+        workbook.active.append(['REG0', 'CS1', 48])
+        content = io.BytesIO()
+        workbook.save(content)
+        response = self.upload(content.getvalue(), name='marks.xlsx')
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(MarkRecord.objects.get().marks, 48)
+
+    def test_bad_rows_are_reported_per_row(self):
+        response = self.upload(b'reg_no,subject_code,marks\nREG0,CS1,40\nNOPE,CS1,40\nREG1,XX9,40\nREG1,CS1,abc\n')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['status'] for row in response.data['results']], ['created', 'error', 'error', 'error'])
+        self.assertIn('reg_no', response.data['results'][1]['errors'])
+        self.assertIn('subject_code', response.data['results'][2]['errors'])
+        self.assertEqual(MarkRecord.objects.count(), 1)
+
+    def test_atomic_import_writes_nothing_on_error(self):
+        response = self.upload(b'reg_no,subject_code,marks\nREG0,CS1,40\nNOPE,CS1,40\n', atomic='true')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(MarkRecord.objects.exists())
+
+    def test_locked_batch_rejects_every_row(self):
+        self.batch.status = 'FROZEN'
+        self.batch.save()
+        response = self.upload(b'reg_no,subject_code,marks\nREG0,CS1,40\n')
+        self.assertEqual(response.data['results'][0]['status'], 'error')
+        self.assertIn('batch', response.data['results'][0]['errors'])
+        self.assertFalse(MarkRecord.objects.exists())
+
+    def test_unsupported_file_type(self):
+        self.assertEqual(self.upload(b'x', name='marks.txt').status_code, 400)
@@ -0,0 +1,88 @@
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+from registry.search import search_tokens
+
+
+class MigrationTestCase(TransactionTestCase):
+    """Rolls the registry schema back to `migrate_from` and forward again afterwards."""
+    migrate_from = None
+
+    def setUp(self):
+        self.executor = MigrationExecutor(connection)
+        self.executor.migrate([('registry', self.migrate_from)])
+        self.apps = self.executor.loader.project_state(('registry', self.migrate_from)).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def migrate(self, target):
+        executor = MigrationExecutor(connection)
+        executor.migrate([('registry', target)])
+
+
+class DuplicateMarksMigrationTests(MigrationTestCase):
+    migrate_from = '0002_student_academic_summary'
+
+    def create_marks(self, duplicated):
+        User = self.apps.get_model('registry', 'User')
+        Course = self.apps.get_model('registry', 'Course')
+        Subject = self.apps.get_model('registry', 'Subject')
+        MarkBatch = self.apps.get_model('registry', 'MarkBatch')
+        MarkRecord = self.apps.get_model('registry', 'MarkRecord')
+        student = User.objects.create(username='student', role='STUDENT')
+        course = Course.objects.create(name='CSE', degree='B.Tech')
+        subject = Subject.objects.create(course=course, code='CS1', name='Subject 1', semester=1)
+        batch = MarkBatch.objects.create(name='Internal 1', academic_year='2024-25')
+        for marks in ([40, 45] if duplicated else [40]):
+            MarkRecord.objects.create(batch=batch, student=student, subject=subject, marks=marks)
+        return MarkRecord
+
+    def test_duplicates_stop_the_migration_and_are_kept(self):
+        MarkRecord = self.create_marks(duplicated=True)
+        with self.assertRaisesMessage(RuntimeError, '1 (batch, student, subject) combinations'):
+            self.migrate('0003_markrecord_unique')
+        self.assertEqual(MarkRecord.objects.count(), 2)
+        MarkRecord.objects.order_by('id').first().delete()
+
+    def test_clean_data_migrates(self):
+        MarkRecord = self.create_marks(duplicated=False)
+        self.migrate('0003_markrecord_unique')
+        self.assertEqual(MarkRecord.objects.count(), 1)
+
+
+class DuplicateTimetablesMigrationTests(MigrationTestCase):
+    migrate_from = '0005_notification_state_archive'
+
+    def test_duplicates_stop_the_migration_and_keep_assignments(self):
+        User = self.apps.get_model('registry', 'User')
+        Timetable = self.apps.get_model('registry', 'Timetable')
+        HourAssignment = self.apps.get_model('registry', 'HourAssignment')
+        staff = User.objects.create(username='staff', role='STAFF')
+        for _ in range(2):
+            timetable = Timetable.objects.create(department='CSE', study_year='1st Year')
+            HourAssignment.objects.create(timetable=timetable, hour=1, staff=staff)
+
+        with self.assertRaisesMessage(RuntimeError, 'CSE / 1st Year: Timetable ids'):
+            self.migrate('0006_timetable_unique')
+        self.assertEqual((Timetable.objects.count(), HourAssignment.objects.count()), (2, 2))
+        Timetable.objects.order_by('id').first().delete()
+
+
+class SearchTokenBackfillTests(MigrationTestCase):
+    migrate_from = '0008_leave_status_end_idx'
+
+    def test_existing_users_are_indexed(self):
+        User = self.apps.get_model('registry', 'User')
+        user = User.objects.create(username='jai', role='STUDENT', department='CSE', reg_no='R1', email='jai.k@example.com')
+        self.migrate('0009_user_search_token')
+
+        apps = MigrationExecutor(connection).loader.project_state(('registry', '0009_user_search_token')).apps
+        tokens = apps.get_model('registry', 'UserSearchToken').objects.filter(user_id=user.pk)
+        self.assertEqual(
+            set(tokens.values_list('token', 'complete', 'weight')),
+            {(token, complete, weight) for (token, complete), weight in search_tokens(user).items()},
+        )
+        self.assertEqual(set(tokens.values_list('role', 'department')), {('STUDENT', 'CSE')})
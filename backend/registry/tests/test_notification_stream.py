@@ -0,0 +1,89 @@
+import asyncio
+import threading
+from datetime import timedelta
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from oauth2_provider.models import get_access_token_model, get_application_model
+
+from registry.models import User, Notification
+from registry.pubsub import LocalBroker
+
+AccessToken = get_access_token_model()
+Application = get_application_model()
+
+URL = '/api/registry/notifications/stream/'
+
+
+class LocalBrokerTests(SimpleTestCase):
+    def event(self, user, notification_id=1):
+        return {'user': user, 'notification': {'id': notification_id, 'read': False}}
+
+    async def test_personal_events_reach_only_their_user(self):
+        broker = LocalBroker()
+        mine, theirs = broker.subscribe(1), broker.subscribe(2)
+        broker.publish(self.event(1))
+        self.assertEqual((await asyncio.wait_for(mine.get(), 1))['user'], 1)
+        await asyncio.sleep(0)
+        self.assertTrue(theirs.empty())
+
+    async def test_broadcasts_reach_everyone(self):
+        broker = LocalBroker()
+        queues = [broker.subscribe(1), broker.subscribe(1), broker.subscribe(2)]
+        broker.publish(self.event(None))
+        for queue in queues:
+            self.assertIsNone((await asyncio.wait_for(queue.get(), 1))['user'])
+
+    async def test_publish_from_another_thread(self):
+        broker = LocalBroker()
+        queue = broker.subscribe(1)
+        thread = threading.Thread(target=broker.publish, args=(self.event(1, 7),))
+        thread.start()
+        thread.join()
+        self.assertEqual((await asyncio.wait_for(queue.get(), 1))['notification']['id'], 7)
+
+    async def test_unsubscribe_and_full_queues(self):
+        broker = LocalBroker()
+        broker.queue_size = 2
+        queue = broker.subscribe(1)
+        for notification_id in range(3):
+            broker.publish(self.event(1, notification_id))
+        await asyncio.sleep(0)
+        self.assertEqual(queue.qsize(), 2)
+
+        broker.unsubscribe(1, queue)
+        self.assertEqual(broker.subscriber_count(), 0)
+        broker.publish(self.event(1, 9))
+        await asyncio.sleep(0)
+        self.assertEqual(queue.qsize(), 2)
+
+
+class NotificationStreamAuthTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='student', role='STUDENT')
+        application = Application.objects.create(
+            name='web', client_type=Application.CLIENT_PUBLIC, authorization_grant_type=Application.GRANT_PASSWORD
+        )
+        for token, expires in [('live-token', timedelta(hours=1)), ('expired-token', -timedelta(minutes=1))]:
+            AccessToken.objects.create(
+                user=self.user, application=application, token=token, scope='read write',
+                expires=timezone.now() + expires,
+            )
+        Notification.objects.create(user=self.user, message='Hello')
+
+    async def test_access_token_query_parameter_opens_the_stream(self):
+        response = await self.async_client.get(URL, {'access_token': 'live-token'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = aiter(response.streaming_content)
+        self.assertEqual(await anext(chunks), b'retry: 5000\n\n')
+        self.assertEqual(await anext(chunks), b'event: unread\ndata: {"unread": 1}\n\n')
+        await chunks.aclose()
+
+    async def test_invalid_and_expired_tokens_are_rejected(self):
+        for token in ('wrong-token', 'expired-token'):
+            response = await self.async_client.get(URL, {'access_token': token})
+            self.assertEqual(response.status_code, 401, token)
+
+    async def test_missing_token_is_rejected(self):
+        self.assertEqual((await self.async_client.get(URL)).status_code, 401)
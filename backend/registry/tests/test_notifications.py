@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from registry.models import User, Notification, NotificationState, ArchivedNotification
+from registry.notifications import archive_notifications, unread_count
+
+URL = '/api/registry/notifications/'
+
+
+class NotificationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='student', role='STUDENT')
+        self.other = User.objects.create(username='other', role='STUDENT')
+        self.client.force_authenticate(self.user)
+
+    def stored_unread(self, user):
+        return NotificationState.objects.get(user=user).unread_count
+
+    def assertCounterMatches(self, user):
+        self.assertEqual(self.stored_unread(user), Notification.objects.filter(user=user, read=False).count())
+
+    def test_counters_follow_saves_and_deletes(self):
+        first = Notification.objects.create(user=self.user, message='One')
+        second = Notification.objects.create(user=self.user, message='Two')
+        Notification.objects.create(user=self.user, message='Seen', read=True)
+        self.assertEqual(self.stored_unread(self.user), 2)
+
+        first.read = True
+        first.save()
+        self.assertEqual(self.stored_unread(self.user), 1)
+
+        second.user = self.other
+        second.save()
+        self.assertEqual((self.stored_unread(self.user), self.stored_unread(self.other)), (0, 1))
+
+        second.delete()
+        self.assertEqual(self.stored_unread(self.other), 0)
+        self.assertCounterMatches(self.user)
+
+    def test_reading_a_broadcast_moves_the_cursor(self):
+        older, newer, latest = (Notification.objects.create(message=f'Notice {i}') for i in range(3))
+        Notification.objects.create(user=self.user, message='Personal')
+        self.assertEqual(unread_count(self.user), 4)
+
+        response = self.client.post(f'{URL}{newer.pk}/mark_read/')
+        self.assertEqual(response.data, {'unread': 2})
+        read = {row['id']: row['read'] for row in self.client.get(URL).data}
+        self.assertEqual((read[older.pk], read[newer.pk], read[latest.pk]), (True, True, False))
+
+        # Reading an older broadcast never moves the cursor back
+        self.client.post(f'{URL}{older.pk}/mark_read/')
+        self.assertEqual(NotificationState.objects.get(user=self.user).broadcast_read_id, newer.pk)
+        self.assertEqual(unread_count(self.other), 3)
+
+    def test_mark_all_read_and_clear_all(self):
+        Notification.objects.create(message='Notice')
+        Notification.objects.create(user=self.user, message='Personal')
+        self.assertEqual(self.client.post(f'{URL}mark_all_read/').data, {'unread': 0})
+        self.assertEqual(self.client.get(f'{URL}unread_count/').data, {'unread': 0})
+
+        Notification.objects.create(user=self.user, message='Another')
+        self.client.post(f'{URL}clear_all/')
+        self.assertFalse(Notification.objects.filter(user=self.user).exists())
+        self.assertCounterMatches(self.user)
+
+    def test_archive_moves_old_rows_in_chunks_and_keeps_counters(self):
+        for index in range(5):
+            Notification.objects.create(user=self.user, message=f'Old {index}', read=index == 0)
+        Notification.objects.create(message='Old notice')
+        cutoff = timezone.now()
+        Notification.objects.update(timestamp=cutoff - timedelta(days=1))
+        recent = Notification.objects.create(user=self.user, message='Recent')
+        self.assertEqual(self.stored_unread(self.user), 5)
+
+        self.assertEqual(list(archive_notifications(cutoff, chunk_size=4)), [4, 2])
+        self.assertEqual(list(Notification.objects.values_list('id', flat=True)), [recent.pk])
+        self.assertEqual(ArchivedNotification.objects.count(), 6)
+        self.assertEqual(ArchivedNotification.objects.filter(user=self.user, read=False).count(), 4)
+        self.assertCounterMatches(self.user)
+        self.assertEqual(unread_count(self.user), 1)
+
+    def test_purge_skips_the_archive(self):
+        Notification.objects.create(user=self.user, message='Old')
+        cutoff = timezone.now()
+        Notification.objects.update(timestamp=cutoff - timedelta(days=1))
+        self.assertEqual(sum(archive_notifications(cutoff, archive=False)), 1)
+        self.assertFalse(ArchivedNotification.objects.exists())
+        self.assertCounterMatches(self.user)
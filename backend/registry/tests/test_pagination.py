@@ -0,0 +1,55 @@
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from registry.models import User, Notification
+
+URL = '/api/registry/users/'
+
+
+class CursorPaginationTests(APITestCase):
+    def setUp(self):
+        admin = User.objects.create(username='admin', role='ADMIN', is_staff=True)
+        self.client.force_authenticate(admin)
+        self.ids = [admin.pk] + [User.objects.create(username=f'student{i}', role='STUDENT').pk for i in range(6)]
+
+    def ids_of(self, rows):
+        return [row['id'] for row in rows]
+
+    def test_plain_list_unless_paging_is_requested(self):
+        response = self.client.get(URL)
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(self.ids_of(response.data), self.ids)
+
+    def test_pages_round_trip_in_list_order(self):
+        pages, url = [], f'{URL}?page_size=3'
+        while url:
+            with self.assertNumQueries(1):
+                page = self.client.get(url).data
+            self.assertNotIn('count', page)
+            pages.append(self.ids_of(page['results']))
+            url = page['next']
+        self.assertEqual(pages, [self.ids[0:3], self.ids[3:6], self.ids[6:]])
+
+        # New rows land at the end, so earlier pages stay put
+        User.objects.create(username='late', role='STUDENT')
+        back = self.client.get(page['previous']).data
+        self.assertEqual(self.ids_of(back['results']), self.ids[3:6])
+        self.assertEqual(self.ids_of(self.client.get(back['previous']).data['results']), self.ids[0:3])
+
+    def test_every_endpoint_pages_oldest_first(self):
+        student = User.objects.get(pk=self.ids[1])
+        notices = [Notification.objects.create(user=student, message=f'Notice {i}').pk for i in range(3)]
+        self.client.force_authenticate(student)
+        page = self.client.get('/api/registry/notifications/?page_size=2').data
+        self.assertEqual(self.ids_of(page['results']), notices[:2])
+
+    def test_exact_count_is_opt_in(self):
+        with self.assertNumQueries(2):
+            page = self.client.get(f'{URL}?page_size=2&count=exact').data
+        self.assertEqual((page['count'], len(page['results'])), (7, 2))
+        self.assertEqual(self.client.get(page['next']).data['count'], 7)
+        self.assertEqual(self.client.get(f'{URL}?page_size=2&role=STUDENT&count=exact').data['count'], 6)
+
+    @override_settings(REGISTRY_MAX_PAGE_SIZE=5)
+    def test_page_size_is_capped(self):
+        self.assertEqual(len(self.client.get(f'{URL}?page_size=50').data['results']), 5)
@@ -0,0 +1,110 @@
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from oauth2_provider.models import get_access_token_model, get_application_model
+
+from registry.caching import read_cache
+from registry.models import User
+from registry.profiling import ProfilingMiddleware, list_profiles, load_profile, rotate_profiles
+
+AccessToken = get_access_token_model()
+Application = get_application_model()
+
+
+class ProfileDirMixin:
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        settings_override = override_settings(PROFILING=True, PROFILE_SAMPLE_RATE=0, PROFILE_DIR=directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+
+class ProfilingMiddlewareTests(ProfileDirMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        read_cache.clear()
+
+    def bearer(self, user):
+        application = Application.objects.create(
+            name='web', client_type=Application.CLIENT_PUBLIC, authorization_grant_type=Application.GRANT_PASSWORD
+        )
+        AccessToken.objects.create(
+            user=user, application=application, token=f'{user.username}-token', scope='read write',
+            expires=timezone.now() + timedelta(hours=1),
+        )
+        return {'HTTP_AUTHORIZATION': f'Bearer {user.username}-token'}
+
+    def test_admins_can_request_a_profile(self):
+        auth = self.bearer(User.objects.create(username='admin', role='ADMIN', is_staff=True))
+        response = self.client.get('/api/registry/courses/', HTTP_X_PROFILE='1', **auth)
+        self.assertEqual(response.status_code, 200)
+        profile = load_profile(response['X-Profile-Id'])
+        self.assertEqual((profile['trigger'], profile['path'], profile['status']), ('requested', '/api/registry/courses/', 200))
+        self.assertEqual(profile['query_count'], len(profile['sql']))
+        self.assertTrue(profile['sql'] and profile['functions'])
+        self.assertTrue((self.directory / f'{profile["id"]}.prof').exists())
+
+        response = self.client.get('/api/registry/courses/?profile=1', **auth)
+        self.assertIn('X-Profile-Id', response)
+
+    def test_other_users_are_not_profiled(self):
+        auth = self.bearer(User.objects.create(username='staff', role='STAFF'))
+        response = self.client.get('/api/registry/courses/', HTTP_X_PROFILE='1', **auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertNotIn('X-Profile-Id', self.client.get('/api/registry/courses/?profile=1'))
+        self.assertEqual(list_profiles(), [])
+
+    @override_settings(PROFILE_SAMPLE_RATE=1)
+    def test_sampled_requests_are_profiled(self):
+        response = self.client.get('/api/registry/courses/')
+        self.assertEqual(load_profile(response['X-Profile-Id'])['trigger'], 'sampled')
+
+    async def test_async_views_are_profiled(self):
+        user = await User.objects.acreate(username='admin', role='ADMIN', is_staff=True)
+        await sync_to_async(self.bearer)(user)
+        response = await self.async_client.get(
+            '/api/registry/dashboard/', headers={'Authorization': 'Bearer admin-token', 'X-Profile': '1'}
+        )
+        self.assertEqual(response.status_code, 200)
+        profile = load_profile(response['X-Profile-Id'])
+        self.assertEqual(profile['view'], 'dashboard')
+        self.assertTrue(profile['sql'])
+
+
+class ProfileStorageTests(ProfileDirMixin, SimpleTestCase):
+    def write_profiles(self, ids):
+        for profile_id in ids:
+            (self.directory / f'{profile_id}.json').write_text(f'{{"id": "{profile_id}"}}')
+            (self.directory / f'{profile_id}.prof').write_bytes(b'')
+
+    def test_rotation_keeps_the_newest_profiles(self):
+        ids = [f'2025031{day}T120000-0000000{day}' for day in range(5)]
+        self.write_profiles(ids)
+        with override_settings(PROFILE_KEEP=2):
+            rotate_profiles(self.directory)
+        self.assertEqual(sorted(path.name for path in self.directory.iterdir()), sorted(
+            f'{profile_id}{suffix}' for profile_id in ids[-2:] for suffix in ('.json', '.prof')
+        ))
+        self.assertEqual([profile['id'] for profile in list_profiles()], ids[:-3:-1])
+
+    def test_load_profile_rejects_bad_ids(self):
+        self.write_profiles(['20250310T120000-0000000a'])
+        self.assertEqual(load_profile('20250310T120000-0000000a'), {'id': '20250310T120000-0000000a'})
+        for profile_id in ('../outside', '20250310T120000-0000000A', '20250310T120000-0000000a/../x', '', 'missing'):
+            self.assertIsNone(load_profile(profile_id), profile_id)
+        self.assertIsNone(load_profile('20250311T120000-0000000b'))
+
+    @override_settings(PROFILING=False)
+    def test_middleware_is_dropped_when_profiling_is_off(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            ProfilingMiddleware(lambda request: HttpResponse())
@@ -0,0 +1,98 @@
+import io
+import json
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+from django.contrib.auth.hashers import check_password
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from registry.models import User, UserSearchToken
+from registry.provisioning import hash_passwords
+
+URL = '/api/registry/users/bulk_provision/'
+
+
+class BulkProvisionTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create(username='admin', role='ADMIN', is_staff=True)
+        self.client.force_authenticate(self.admin)
+        self.mentor = User.objects.create(username='mentor', role='STAFF', staff_id='S1')
+
+    def row(self, username, **extra):
+        return {'username': username, 'email': f'{username}@example.edu', **extra}
+
+    def test_creates_users_with_hashed_or_unusable_passwords(self):
+        response = self.client.post(URL, [
+            self.row('alice', password='correct-horse-battery', mentor_staff_id='S1', reg_no='R1'),
+            self.row('bob'),
+        ], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], 2)
+
+        alice, bob = User.objects.get(username='alice'), User.objects.get(username='bob')
+        self.assertTrue(check_password('correct-horse-battery', alice.password))
+        self.assertEqual(alice.mentor, self.mentor)
+        self.assertFalse(bob.has_usable_password())
+        self.assertTrue(UserSearchToken.objects.filter(user=alice).exists())
+
+    def test_conflicts_and_weak_passwords_are_reported(self):
+        response = self.client.post(URL, [
+            self.row('mentor'),
+            self.row('carol', staff_id='S1'),
+            self.row('dave', password='123'),
+            self.row('erin'),
+            self.row('erin'),
+            self.row('frank', mentor_staff_id='missing'),
+        ], format='json')
+        self.assertEqual(
+            [row['status'] for row in response.data['results']],
+            ['error', 'error', 'error', 'created', 'error', 'error'],
+        )
+        self.assertEqual(set(response.data['results'][1]['errors']), {'staff_id'})
+
+    def test_atomic_creates_nothing_on_error(self):
+        response = self.client.post(f'{URL}?atomic=true', [self.row('alice'), self.row('mentor')], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(User.objects.filter(username='alice').exists())
+
+    def test_csv_upload(self):
+        upload = io.BytesIO(b'username,email,role,department\ngrace,grace@example.edu,STAFF,CSE\n')
+        upload.name = 'users.csv'
+        response = self.client.post(URL, {'file': upload}, format='multipart')
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(User.objects.get(username='grace').department, 'CSE')
+
+    def test_requests_hash_in_process(self):
+        rows = [self.row(f'user{i}', password=f'correct-horse-{i}') for i in range(10)]
+        with mock.patch('registry.provisioning.ProcessPoolExecutor') as pool:
+            response = self.client.post(URL, rows, format='json')
+        self.assertEqual(response.data['created'], 10)
+        pool.assert_not_called()
+
+    def test_requires_admin(self):
+        self.client.force_authenticate(self.mentor)
+        self.assertEqual(self.client.post(URL, [self.row('alice')], format='json').status_code, 403)
+
+
+class HashPasswordsTests(APITestCase):
+    def test_pool_and_inline_hashes_verify(self):
+        passwords = [f'password-{i}' for i in range(10)]
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                hashes = hash_passwords(passwords, workers=workers)
+                self.assertTrue(all(check_password(p, h) for p, h in zip(passwords, hashes)))
+
+    @override_settings(PROVISION_HASH_WORKERS=3)
+    def test_command_hashes_in_a_pool(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as upload:
+            json.dump([
+                {'username': f'user{i}', 'email': f'user{i}@example.edu', 'password': f'correct-horse-{i}'} for i in range(10)
+            ], upload)
+            upload.flush()
+            with mock.patch('registry.provisioning.ProcessPoolExecutor', wraps=ProcessPoolExecutor) as pool:
+                call_command('provision_users', upload.name, stdout=io.StringIO())
+        self.assertEqual(pool.call_args.kwargs['max_workers'], 3)
+        self.assertTrue(check_password('correct-horse-4', User.objects.get(username='user4').password))
@@ -0,0 +1,93 @@
+from datetime import date, timedelta
+
+from rest_framework.test import APITestCase
+
+from registry.caching import read_cache
+from registry.models import (
+    User, Course, Subject, AcademicTask, AttendanceRecord, HourAttendance,
+    AttendanceEditRequest, MarkBatch, MarkRecord, LeaveRequest, Timetable,
+    HourAssignment, PortalConnection, Notification, CurriculumEditRequest, SiteSettings,
+    AcademicBatch, BatchCourseCurriculum
+)
+
+API = '/api/registry'
+
+# Queries per list/detail request; the count must not grow with the row count.
+BUDGETS = {
+    'users': (1, User),
+    'courses': (3, Course),
+    'subjects': (2, Subject),
+    'tasks': (1, AcademicTask),
+    'attendance': (2, AttendanceRecord),
+    'attendance-requests': (1, AttendanceEditRequest),
+    'mark-batches': (3, MarkBatch),
+    'mark-records': (1, MarkRecord),
+    'leaves': (1, LeaveRequest),
+    'timetables': (2, Timetable),
+    'portals': (1, PortalConnection),
+    'notifications': (2, Notification),
+    'curriculum-requests': (1, CurriculumEditRequest),
+    'settings': (1, None),
+    'batches': (2, AcademicBatch),
+    'curriculum-status': (1, BatchCourseCurriculum),
+}
+
+
+def populate(start, end, admin):
+    today = date.today()
+    SiteSettings.objects.get_or_create(admin_email='budget@example.com', defaults={'institution': 'Budget'})
+    course = Course.objects.create(name=f'Course {start}', degree='B.Tech')
+    batch = AcademicBatch.objects.create(name=f'Batch {start}', start_year=2024, end_year=2028)
+    batch.departments.add(course)
+    BatchCourseCurriculum.objects.create(batch=batch, course=course)
+    mark_batch = MarkBatch.objects.create(name=f'Internal {start}', academic_year='2024-25')
+    timetable = Timetable.objects.create(department=f'Dept {start}', study_year='1st Year')
+
+    for i in range(start, end + 1):
+        staff = User.objects.create(username=f'budget_staff_{i}', role='STAFF', staff_id=f'S{i}')
+        student = User.objects.create(username=f'budget_student_{i}', role='STUDENT', reg_no=f'R{i}', mentor=staff)
+        subject = Subject.objects.create(course=course, code=f'BG{i}', name=f'Subject {i}', semester=1)
+        subject.assigned_staff.add(staff)
+        mark_batch.subjects.add(subject)
+        AcademicTask.objects.create(
+            title=f'Task {i}', description='', due_date=f'{today}T00:00:00Z', subject=subject,
+            department=f'Dept {start}', study_year='1st Year', staff=staff
+        )
+        record = AttendanceRecord.objects.create(user=student, date=today - timedelta(days=i), is_present=True, marked_by=staff)
+        HourAttendance.objects.bulk_create(HourAttendance(record=record, hour=h) for h in range(1, 4))
+        AttendanceEditRequest.objects.create(requester=staff, date=today)
+        MarkRecord.objects.create(batch=mark_batch, student=student, subject=subject, marks=50, updated_by=staff)
+        LeaveRequest.objects.create(
+            student=student, mentor=staff, type='MEDICAL', start_date=today, end_date=today, reason='-'
+        )
+        HourAssignment.objects.create(timetable=timetable, hour=i % 8 + 1, staff=staff)
+        PortalConnection.objects.create(name=f'Portal {i}', url='https://example.com', handshake_id=str(i))
+        Notification.objects.create(user=admin if i % 2 else None, message=f'Notice {i}')
+        CurriculumEditRequest.objects.create(hod=staff, dept_name=f'Dept {start}', batch_name=batch.name)
+
+
+class QueryBudgetTests(APITestCase):
+    """List and detail endpoints run a fixed number of queries at 20 and at 60 rows per model."""
+
+    def setUp(self):
+        self.admin = User.objects.create(username='budget_admin', role='ADMIN', is_staff=True, is_superuser=True)
+        self.client.force_authenticate(self.admin)
+
+    def assert_within_budget(self):
+        for name, (budget, model) in BUDGETS.items():
+            urls = [f'{API}/{name}/']
+            if model is not None:
+                urls.append(f'{API}/{name}/{model.objects.order_by("pk").values_list("pk", flat=True).first()}/')
+            for url in urls:
+                with self.subTest(url=url):
+                    # Budgets are for cold reads, not responses served from the read cache
+                    read_cache.clear()
+                    with self.assertNumQueries(budget):
+                        response = self.client.get(url)
+                    self.assertEqual(response.status_code, 200)
+
+    def test_budgets_do_not_grow_with_rows(self):
+        populate(1, 20, self.admin)
+        self.assert_within_budget()
+        populate(21, 60, self.admin)
+        self.assert_within_budget()
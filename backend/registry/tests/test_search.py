@@ -0,0 +1,86 @@
+from rest_framework.test import APITestCase
+
+from registry.models import User, UserSearchToken
+from registry.search import rebuild_search_index, search_tokens, tokenize, typeahead
+
+URL = '/api/registry/users/typeahead/'
+
+
+class TypeaheadTests(APITestCase):
+    def setUp(self):
+        self.jai = User.objects.create(
+            username='jai', role='STUDENT', department='CSE', reg_no='R100', first_name='Jai'
+        )
+        self.jaideep = User.objects.create(
+            username='jaideep', role='STUDENT', department='ECE', reg_no='R200', first_name='Jaideep', last_name='Raj'
+        )
+        self.staff = User.objects.create(
+            username='priya', role='STAFF', department='CSE', staff_id='JAI7', first_name='Priya'
+        )
+
+    def usernames(self, query, **options):
+        return [user.username for user in typeahead(query, **options)]
+
+    def test_tokenize_folds_accents_and_splits_words(self):
+        self.assertEqual(tokenize('Jaí_Akash.S'), ['jai', 'akash', 's'])
+        self.assertEqual(search_tokens(User(email='a.b@example.com'))[('b', True)], 3)
+
+    def test_whole_words_rank_before_prefixes(self):
+        # Then the best field: a staff id prefix before a username prefix
+        self.assertEqual(self.usernames('jai'), ['jai', 'priya', 'jaideep'])
+
+    def test_id_fields_rank_before_names(self):
+        self.staff.first_name = 'Jaivardhan'
+        self.staff.staff_id = 'JAIDEEP'
+        self.staff.save()
+        # Both are whole-word 'jaideep' matches; the staff id outranks the username
+        self.assertEqual(self.usernames('jaideep'), ['priya', 'jaideep'])
+
+    def test_every_term_must_match_a_word(self):
+        self.assertEqual(self.usernames('jai raj'), ['jaideep'])
+        self.assertEqual(self.usernames('jai nobody'), [])
+        self.assertEqual(self.usernames('  '), [])
+
+    def test_terms_prefixing_other_terms_are_dropped(self):
+        # 'ja' and 'jai' would both match the single word 'jai'
+        self.assertEqual(self.usernames('ja jai'), self.usernames('jai'))
+        self.assertEqual(self.usernames('ja raj'), ['jaideep'])
+
+    def test_role_and_department_scoping(self):
+        self.assertEqual(self.usernames('jai', role='STAFF'), ['priya'])
+        self.assertEqual(self.usernames('jai', department='CSE'), ['jai', 'priya'])
+        self.assertEqual(self.usernames('jai', department='ECE'), ['jaideep'])
+        self.assertEqual(self.usernames('jai', role='STUDENT', department='ECE'), ['jaideep'])
+        self.assertEqual(self.usernames('jai', limit=1), ['jai'])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.jai.first_name = 'Arjun'
+        self.jai.username = 'arjun'
+        self.jai.department = 'MECH'
+        self.jai.save()
+        self.assertEqual(self.usernames('arj', department='MECH'), ['arjun'])
+        self.assertNotIn('arjun', self.usernames('jai'))
+
+        # Saves that leave the indexed fields alone do not touch the index
+        token_ids = set(UserSearchToken.objects.filter(user=self.jai).values_list('id', flat=True))
+        self.jai.save(update_fields=['last_login'])
+        self.assertEqual(set(UserSearchToken.objects.filter(user=self.jai).values_list('id', flat=True)), token_ids)
+
+        user_id = self.jai.pk
+        self.jai.delete()
+        self.assertEqual(self.usernames('arj'), [])
+        self.assertFalse(UserSearchToken.objects.filter(user_id=user_id).exists())
+
+    def test_rebuild_matches_the_signal_index(self):
+        indexed = set(UserSearchToken.objects.values_list('user_id', 'token', 'complete', 'weight'))
+        UserSearchToken.objects.all().delete()
+        self.assertEqual(rebuild_search_index(chunk_size=2), 3)
+        self.assertEqual(set(UserSearchToken.objects.values_list('user_id', 'token', 'complete', 'weight')), indexed)
+
+    def test_typeahead_action(self):
+        self.client.force_authenticate(self.staff)
+        with self.assertNumQueries(2):
+            response = self.client.get(URL, {'q': 'Jai', 'role': 'STUDENT'})
+        self.assertEqual([row['username'] for row in response.data], ['jai', 'jaideep'])
+        self.assertEqual(self.client.get(URL, {'q': 'jai', 'role': 'NOBODY'}).status_code, 400)
+        self.assertEqual(self.client.get(URL).status_code, 400)
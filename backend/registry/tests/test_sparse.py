@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from registry.caching import read_cache
+from registry.models import User, Course, Subject, AcademicTask, Notification
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        read_cache.clear()
+        self.staff = User.objects.create(username='staff', role='STAFF')
+        self.client.force_authenticate(self.staff)
+        course = Course.objects.create(name='CSE', degree='B.Tech')
+        self.subject = Subject.objects.create(course=course, code='CS1', name='Subject 1', semester=1)
+        AcademicTask.objects.create(
+            title='Task', description='-', due_date=datetime(2025, 3, 10, tzinfo=timezone.utc),
+            subject=self.subject, department='CSE', study_year='1st Year', staff=self.staff,
+        )
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data, [query['sql'] for query in queries.captured_queries]
+
+    def test_fields_keeps_only_the_listed_paths(self):
+        data, _ = self.get('/api/registry/courses/?fields=id,name,subjects.code')
+        self.assertEqual(data, [{'id': self.subject.course_id, 'name': 'CSE', 'subjects': [{'code': 'CS1'}]}])
+
+    def test_omit_drops_fields_and_their_prefetch(self):
+        full, full_queries = self.get('/api/registry/courses/')
+        data, queries = self.get('/api/registry/courses/?omit=subjects,domain')
+        self.assertEqual(set(full[0]) - set(data[0]), {'subjects', 'domain'})
+        self.assertTrue(any('registry_subject' in sql for sql in full_queries))
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"registry_course"."domain"', queries[0])
+
+    def test_fields_prunes_selected_columns(self):
+        _, queries = self.get('/api/registry/courses/?fields=id,name')
+        course_query = next(sql for sql in queries if 'FROM "registry_course"' in sql)
+        self.assertIn('"registry_course"."name"', course_query)
+        self.assertNotIn('"registry_course"."degree"', course_query)
+        self.assertFalse(any('registry_subject' in sql for sql in queries))
+
+    def test_expand_embeds_related_objects(self):
+        data, _ = self.get('/api/registry/tasks/?fields=id,staff')
+        self.assertEqual(data[0]['staff'], self.staff.pk)
+        data, _ = self.get('/api/registry/tasks/?fields=id,staff.username&expand=staff')
+        self.assertEqual(data[0]['staff'], {'username': 'staff'})
+
+    def test_writes_ignore_sparse_parameters(self):
+        response = self.client.post('/api/registry/courses/?fields=id', {'name': 'ECE', 'degree': 'B.Tech'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('degree', response.data)
+
+    def test_broadcast_read_state_respects_fields(self):
+        Notification.objects.create(message='Notice')
+        data, _ = self.get('/api/registry/notifications/?fields=id')
+        self.assertEqual(list(data[0]), ['id'])
+        data, _ = self.get('/api/registry/notifications/?fields=id,read')
+        self.assertEqual(data[0]['read'], False)
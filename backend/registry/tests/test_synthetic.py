@@ -0,0 +1,79 @@
+from datetime import date
+from unittest import mock
+
+from django.db.models.signals import post_delete
+from django.test import TestCase
+
+from registry.models import (
+    User, Course, Subject, AttendanceRecord, HourAttendance, MarkBatch, MarkRecord, LeaveRequest,
+    Timetable, Notification, StudentAcademicSummary, UserSearchToken
+)
+from registry.synthetic import SyntheticDataset
+from registry.leaves import students_on_leave
+from registry.tests.utils import mysql_upserts
+
+
+def dataset(**options):
+    return SyntheticDataset(
+        departments=2, students_per_year=3, staff_per_department=2, days=5, hours=2, subjects_per_semester=1,
+        leaves_per_student=2, tasks_per_subject=1, notifications_per_user=1, end_date=date(2025, 3, 15), **options
+    )
+
+
+class SyntheticDatasetTests(TestCase):
+    def test_generate_is_deterministic(self):
+        counts = dataset().generate()
+        first = list(MarkRecord.objects.order_by('id').values_list('student__username', 'subject__code', 'marks'))
+        dataset().delete()
+        self.assertEqual(dataset().generate(), counts)
+        self.assertEqual(
+            list(MarkRecord.objects.order_by('id').values_list('student__username', 'subject__code', 'marks')), first
+        )
+
+    def test_generate_and_delete_on_mysql(self):
+        with mysql_upserts():
+            dataset().generate()
+            self.assertTrue(StudentAcademicSummary.objects.exists())
+            dataset().delete()
+        self.assertFalse(User.objects.exists())
+
+    def test_generated_leaves_are_visible_to_overlap_queries(self):
+        dataset().generate()
+        for leave in LeaveRequest.objects.filter(status='APPROVED', start_time__isnull=True):
+            self.assertIn(leave.student_id, students_on_leave(leave.end_date))
+
+    def test_summaries_match_source_rows(self):
+        dataset().generate()
+        student = User.objects.filter(role='STUDENT').first()
+        summary = StudentAcademicSummary.objects.get(user=student)
+        self.assertEqual(summary.total_days, AttendanceRecord.objects.filter(user=student).count())
+        self.assertEqual(summary.mark_count, MarkRecord.objects.filter(student=student).count())
+
+    def test_delete_removes_run_without_row_signals(self):
+        kept = User.objects.create(username='kept', role='STAFF')
+        Notification.objects.create(user=kept, message='kept')
+        dataset().generate()
+        receiver = mock.Mock()
+        post_delete.connect(receiver)
+        try:
+            deleted = dataset().delete()
+        finally:
+            post_delete.disconnect(receiver)
+
+        receiver.assert_not_called()
+        self.assertGreater(deleted, 0)
+        for model in (Course, Subject, AttendanceRecord, HourAttendance, MarkBatch, MarkRecord, LeaveRequest,
+                      Timetable, StudentAcademicSummary):
+            self.assertFalse(model.objects.exists(), model.__name__)
+        self.assertEqual(list(User.objects.values_list('username', flat=True)), ['kept'])
+        self.assertEqual(list(Notification.objects.values_list('message', flat=True)), ['kept'])
+        self.assertFalse(UserSearchToken.objects.exclude(user=kept).exists())
+
+    def test_delete_rebuilds_summaries_of_other_students(self):
+        dataset().generate()
+        outsider = User.objects.create(username='outsider', role='STUDENT')
+        MarkRecord.objects.create(
+            batch=MarkBatch.objects.first(), student=outsider, subject=Subject.objects.first(), marks=50
+        )
+        dataset().delete()
+        self.assertEqual(StudentAcademicSummary.objects.get(user=outsider).mark_count, 0)
@@ -0,0 +1,73 @@
+from rest_framework.test import APITestCase
+
+from registry.models import User, Timetable, HourAssignment
+
+URL = '/api/registry/timetables/'
+
+
+class TimetableClashTests(APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create(username='hod', role='HOD'))
+        self.staff = User.objects.create(username='staff', role='STAFF')
+        self.other = User.objects.create(username='other', role='STAFF')
+        self.timetable = Timetable.objects.create(department='CSE', study_year='1st Year')
+        HourAssignment.objects.create(timetable=self.timetable, hour=1, staff=self.staff)
+
+    def payload(self, staff, hour=1):
+        return {'department': 'ECE', 'study_year': '1st Year', 'assignments': [{'hour': hour, 'staff': staff.pk}]}
+
+    def test_double_booking_is_rejected(self):
+        response = self.client.post(URL, self.payload(self.staff), format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['assignments'][0]['staff'], str(self.staff.pk))
+        self.assertFalse(Timetable.objects.filter(department='ECE').exists())
+
+    def test_flag_writes_and_reports_clashes(self):
+        response = self.client.post(f'{URL}?on_clash=flag', self.payload(self.staff), format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data['clashes']), 1)
+        self.assertEqual(response.data['clashes'][0]['hour'], 1)
+        self.assertEqual(HourAssignment.objects.filter(staff=self.staff, hour=1).count(), 2)
+
+    def test_flag_without_clash_reports_none(self):
+        response = self.client.post(f'{URL}?on_clash=flag', self.payload(self.other), format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['clashes'], [])
+
+    def test_update_ignores_own_assignments(self):
+        response = self.client.patch(
+            f'{URL}{self.timetable.pk}/', {'assignments': [{'hour': 1, 'staff': self.staff.pk}]}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('clashes', response.data)
+
+    def test_bulk_replace_rejects_clash_atomically(self):
+        response = self.client.post(f'{URL}bulk_replace/', [
+            {'department': 'ECE', 'study_year': '1st Year', 'assignments': [{'hour': 2, 'staff': self.other.pk}]},
+            self.payload(self.staff),
+        ], format='json')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(f'{URL}bulk_replace/', [
+            {'department': 'ECE', 'study_year': '1st Year', 'assignments': [{'hour': 1, 'staff': self.staff.pk}]},
+        ], format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Timetable.objects.filter(department='ECE').exists())
+
+    def test_bulk_replace_updates_in_place(self):
+        response = self.client.post(f'{URL}bulk_replace/', [
+            {'department': 'CSE', 'study_year': '1st Year', 'assignments': [{'hour': 2, 'staff': self.staff.pk}]},
+            {'department': 'ECE', 'study_year': '1st Year', 'assignments': [{'hour': 1, 'staff': self.other.pk}]},
+        ], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['status'] for row in response.data['results']], ['updated', 'created'])
+        self.assertEqual(
+            list(self.timetable.assignments.values_list('hour', 'staff_id')), [(2, self.staff.pk)]
+        )
+
+    def test_workload_lists_double_bookings(self):
+        HourAssignment.objects.create(
+            timetable=Timetable.objects.create(department='ECE', study_year='1st Year'), hour=1, staff=self.staff
+        )
+        response = self.client.get(f'{URL}workload/?only_clashes=true')
+        self.assertEqual([(entry['staff'], entry['clashes']) for entry in response.data], [(self.staff.pk, [1])])
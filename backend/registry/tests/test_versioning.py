@@ -0,0 +1,71 @@
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from registry.caching import read_cache
+from registry.checks import shared_caches_check
+from registry.models import User, Course, Subject
+
+URL = '/api/registry/courses/'
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        read_cache.clear()
+        self.client.force_authenticate(User.objects.create(username='staff', role='STAFF'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course = Course.objects.create(name='CSE', degree='B.Tech')
+
+    def test_unchanged_data_is_not_modified(self):
+        etag = self.client.get(URL)['ETag']
+        response = self.client.get(URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_write_changes_etag(self):
+        etag = self.client.get(URL)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course.name = 'Computer Science'
+            self.course.save()
+
+        response = self.client.get(URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data[0]['name'], 'Computer Science')
+
+    def test_bump_waits_for_commit(self):
+        etag = self.client.get(URL)['ETag']
+        with self.captureOnCommitCallbacks(execute=False):
+            Course.objects.create(name='ECE', degree='B.Tech')
+            self.assertEqual(self.client.get(URL)['ETag'], etag)
+
+    @override_settings(REGISTRY_SINGLE_PROCESS=False)
+    def test_process_local_store_disables_etags(self):
+        response = self.client.get(URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+        self.assertIn('registry.E002', [error.id for error in shared_caches_check(None)])
+
+
+class ExpandedConditionalGetTests(APITestCase):
+    def setUp(self):
+        read_cache.clear()
+        self.client.force_authenticate(User.objects.create(username='viewer', role='STAFF'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.staff = User.objects.create(username='staff', role='STAFF')
+            course = Course.objects.create(name='CSE', degree='B.Tech')
+            subject = Subject.objects.create(course=course, code='CS1', name='Subject 1', semester=1)
+            subject.assigned_staff.add(self.staff)
+
+    def test_expanded_read_has_no_etag(self):
+        response = self.client.get('/api/registry/subjects/?expand=assigned_staff')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_expanded_read_sees_renamed_user(self):
+        url = '/api/registry/subjects/?expand=assigned_staff'
+        self.client.get(url)
+        self.staff.username = 'renamed'
+        self.staff.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['assigned_staff'][0]['username'], 'renamed')
@@ -0,0 +1,25 @@
+from contextlib import contextmanager
+from unittest import mock
+
+from django.db import connection
+from django.db.models.constants import OnConflict
+
+
+@contextmanager
+def mysql_upserts():
+    """
+    Runs bulk_create upserts the way MySQL does: the backend refuses a
+    conflict target and the statement updates on any unique key (SQLite's
+    untargeted ON CONFLICT clause has the same semantics).
+    """
+    suffix_sql = connection.ops.on_conflict_suffix_sql
+
+    def untargeted(fields, on_conflict, update_fields, unique_fields):
+        if on_conflict != OnConflict.UPDATE:
+            return suffix_sql(fields, on_conflict, update_fields, unique_fields)
+        columns = map(connection.ops.quote_name, update_fields)
+        return 'ON CONFLICT DO UPDATE SET ' + ', '.join(f'{column} = EXCLUDED.{column}' for column in columns)
+
+    with mock.patch.object(connection.features, 'supports_update_conflicts_with_target', False), \
+            mock.patch.object(connection.ops, 'on_conflict_suffix_sql', untargeted):
+        yield
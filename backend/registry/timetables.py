@@ -0,0 +1,218 @@
+from django.db import transaction
+from django.utils import timezone
+
+from .models import User, Timetable, HourAssignment
+from .serializers import TimetableBulkRowSerializer
+from .versioning import batched_bumps
+
+BULK_BATCH_SIZE = 1000
+CLASH_POLICIES = ('reject', 'flag')
+
+
+class TimetableClash(Exception):
+    def __init__(self, clashes):
+        super().__init__(f'{len(clashes)} staff double-booking(s)')
+        self.clashes = clashes
+
+
+def lock_staff(staff_ids):
+    """
+    Locks the staff rows (in id order) for the rest of the transaction, so
+    concurrent writers cannot book the same slot between a clash check and
+    their insert.
+    """
+    list(User.objects.select_for_update().filter(id__in=staff_ids).order_by('id').values_list('id', flat=True))
+
+
+def find_clashes(slots, replacing=()):
+    """
+    Finds staff double-bookings for proposed `slots`, an iterable of
+    (timetable key, hour, staff id). Existing assignments of the timetables in
+    `replacing` (ids) are ignored since the write replaces them. One probe of
+    the (staff, hour) index covers the whole payload.
+
+    Returns a list of clash dicts, each naming the slot and the timetables
+    that book it.
+    """
+    booked = {}
+    for key, hour, staff_id in slots:
+        booked.setdefault((staff_id, hour), []).append(key)
+    if not booked:
+        return []
+
+    existing = (
+        HourAssignment.objects.filter(
+            staff_id__in={staff_id for staff_id, _ in booked}, hour__in={hour for _, hour in booked}
+        )
+        .exclude(timetable_id__in=replacing)
+        .values_list('staff_id', 'hour', 'timetable__department', 'timetable__study_year')
+    )
+    for staff_id, hour, department, study_year in existing:
+        if (staff_id, hour) in booked:
+            booked[(staff_id, hour)].append((department, study_year))
+
+    return [
+        {
+            'staff': staff_id,
+            'hour': hour,
+            'timetables': [{'department': department, 'study_year': study_year} for department, study_year in keys],
+        }
+        for (staff_id, hour), keys in sorted(booked.items())
+        if len(keys) > 1
+    ]
+
+
+def validate_timetable_rows(rows):
+    """
+    Validates a bulk timetable payload: one row per (department, study_year)
+    carrying its complete list of assignments. Staff ids are resolved with one
+    set-based query; a class may appear only once per payload.
+
+    Returns `(valid, errors)` keyed by payload index.
+    """
+    valid, errors = {}, {}
+    if not isinstance(rows, list):
+        return valid, {None: {'non_field_errors': ['Expected a list of timetables.']}}
+
+    for index, row in enumerate(rows):
+        serializer = TimetableBulkRowSerializer(data=row)
+        if serializer.is_valid():
+            valid[index] = serializer.validated_data
+        else:
+            errors[index] = serializer.errors
+
+    staff_ids = {assignment['staff'] for data in valid.values() for assignment in data['assignments']}
+    known = set(User.objects.filter(id__in=staff_ids).values_list('id', flat=True))
+
+    seen = set()
+    for index, data in list(valid.items()):
+        key = (data['department'], data['study_year'])
+        unknown = sorted({assignment['staff'] for assignment in data['assignments']} - known)
+        if unknown:
+            errors[index] = {'assignments': [f'Invalid pk "{pk}" - object does not exist.' for pk in unknown]}
+        elif key in seen:
+            errors[index] = {'non_field_errors': ['Duplicate department and study year in payload.']}
+        else:
+            seen.add(key)
+            continue
+        del valid[index]
+    return valid, errors
+
+
+@transaction.atomic
+def replace_timetables(valid, on_clash='reject'):
+    """
+    Makes each validated timetable hold exactly the given assignments.
+
+    Missing timetables are created, removed assignments are deleted with one
+    statement and new ones inserted with one bulk insert; assignments present
+    on both sides keep their rows.
+
+    Staff booked for the same hour in two timetables raise TimetableClash,
+    unless `on_clash` is 'flag', in which case the write goes ahead.
+    Returns `(results, clashes)`: payload index -> (status, timetable id),
+    status being created, updated or unchanged, and the clashes found.
+    """
+    if not valid:
+        return {}, []
+
+    keys = {(data['department'], data['study_year']) for data in valid.values()}
+    lookup = dict(
+        department__in={department for department, _ in keys},
+        study_year__in={study_year for _, study_year in keys},
+    )
+
+    def timetable_ids():
+        return {
+            (department, study_year): pk
+            for pk, department, study_year in Timetable.objects.select_for_update().filter(**lookup)
+            .values_list('id', 'department', 'study_year')
+            if (department, study_year) in keys
+        }
+
+    ids = timetable_ids()
+
+    lock_staff({assignment['staff'] for data in valid.values() for assignment in data['assignments']})
+    clashes = find_clashes(
+        (
+            ((data['department'], data['study_year']), assignment['hour'], assignment['staff'])
+            for data in valid.values() for assignment in data['assignments']
+        ),
+        replacing=ids.values(),
+    )
+    if clashes and on_clash == 'reject':
+        raise TimetableClash(clashes)
+
+    created = keys - set(ids)
+    if created:
+        # ignore_conflicts lets a concurrent writer win the insert; ids are
+        # read back either way since MySQL does not return them
+        Timetable.objects.bulk_create(
+            [Timetable(department=department, study_year=study_year) for department, study_year in created],
+            ignore_conflicts=True,
+        )
+        ids = timetable_ids()
+
+    current = {}
+    for pk, timetable_id, hour, staff_id in HourAssignment.objects.filter(
+        timetable_id__in=ids.values()
+    ).values_list('id', 'timetable_id', 'hour', 'staff_id'):
+        current.setdefault(timetable_id, {})[(hour, staff_id)] = pk
+
+    removed, added, changed = [], [], set()
+    for data in valid.values():
+        timetable_id = ids[(data['department'], data['study_year'])]
+        existing = current.get(timetable_id, {})
+        wanted = {(assignment['hour'], assignment['staff']) for assignment in data['assignments']}
+        stale = [pk for slot, pk in existing.items() if slot not in wanted]
+        new = [slot for slot in wanted if slot not in existing]
+        if stale or new:
+            changed.add(timetable_id)
+        removed.extend(stale)
+        added.extend(
+            HourAssignment(timetable_id=timetable_id, hour=hour, staff_id=staff_id) for hour, staff_id in sorted(new)
+        )
+
+    # One version bump for the whole write instead of one per deleted row
+    with batched_bumps(Timetable, HourAssignment):
+        if removed:
+            HourAssignment.objects.filter(id__in=removed).delete()
+        if added:
+            HourAssignment.objects.bulk_create(added, batch_size=BULK_BATCH_SIZE)
+        if changed:
+            Timetable.objects.filter(id__in=changed).update(last_updated=timezone.now())
+
+    results = {}
+    for index, data in valid.items():
+        key = (data['department'], data['study_year'])
+        if key in created:
+            results[index] = ('created', ids[key])
+        else:
+            results[index] = ('updated' if ids[key] in changed else 'unchanged', ids[key])
+    return results, clashes
+
+
+def staff_workload(staff_ids=None, only_clashes=False):
+    """
+    Per-staff teaching load across every timetable, from one query over the
+    (staff, hour) index: booked slots, period count and double-booked hours.
+    """
+    rows = HourAssignment.objects.order_by('staff_id', 'hour', 'timetable_id').values_list(
+        'staff_id', 'staff__username', 'hour', 'timetable__department', 'timetable__study_year'
+    )
+    if staff_ids:
+        rows = rows.filter(staff_id__in=staff_ids)
+
+    workload = {}
+    for staff_id, username, hour, department, study_year in rows:
+        entry = workload.setdefault(staff_id, {'staff': staff_id, 'username': username, 'periods': 0, 'slots': []})
+        entry['periods'] += 1
+        entry['slots'].append({'hour': hour, 'department': department, 'study_year': study_year})
+
+    result = []
+    for entry in workload.values():
+        hours = [slot['hour'] for slot in entry['slots']]
+        entry['clashes'] = sorted({hour for hour in hours if hours.count(hour) > 1})
+        if entry['clashes'] or not only_clashes:
+            result.append(entry)
+    return result
@@ -0,0 +1,15 @@
+from django.db import connections, router
+
+
+def upsert_options(model, unique_fields, update_fields):
+    """
+    bulk_create() keyword arguments that upsert `model` rows on `unique_fields`.
+
+    PostgreSQL and SQLite need the conflict target spelled out; MySQL rejects
+    one because ON DUPLICATE KEY UPDATE fires on any unique key, so the target
+    is only passed to backends that support it.
+    """
+    options = {'update_conflicts': True, 'update_fields': update_fields}
+    if connections[router.db_for_write(model)].features.supports_update_conflicts_with_target:
+        options['unique_fields'] = unique_fields
+    return options
@@ -1,11 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from .async_views import notification_stream, dashboard
 from .views import (
     UserViewSet, CourseViewSet, SubjectViewSet, AcademicTaskViewSet,
     AttendanceRecordViewSet, AttendanceEditRequestViewSet, MarkBatchViewSet,
     MarkRecordViewSet, LeaveRequestViewSet, TimetableViewSet,
     PortalConnectionViewSet, NotificationViewSet, CurriculumEditRequestViewSet,
-    SiteSettingsViewSet, AcademicBatchViewSet, BatchCourseCurriculumViewSet
+    SiteSettingsViewSet, AcademicBatchViewSet, BatchCourseCurriculumViewSet,
+    AnalyticsViewSet, CacheStatsViewSet, MetricsViewSet, ProfileViewSet
 )
 
 router = DefaultRouter()
@@ -25,7 +27,15 @@ router.register(r'curriculum-requests', CurriculumEditRequestViewSet)
 router.register(r'settings', SiteSettingsViewSet, basename='site-settings')
 router.register(r'batches', AcademicBatchViewSet)
 router.register(r'curriculum-status', BatchCourseCurriculumViewSet)
+router.register(r'analytics', AnalyticsViewSet, basename='analytics')
+router.register(r'cache-stats', CacheStatsViewSet, basename='cache-stats')
+router.register(r'metrics', MetricsViewSet, basename='metrics')
+router.register(r'profiles', ProfileViewSet, basename='profiles')
 
 urlpatterns = [
+    # Registered ahead of the router so 'stream' is not taken for a notification id
+    path('notifications/stream/', notification_stream, name='notification-stream'),
+    path('dashboard/', dashboard, name='dashboard'),
+    path('dashboard/<str:role>/', dashboard, name='dashboard-role'),
     path('', include(router.urls)),
 ]
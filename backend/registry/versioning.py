@@ -0,0 +1,140 @@
+import hashlib
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control
+from rest_framework.response import Response
+
+from .caching import read_cache, shared_cache
+
+VERSION_KEY = 'registry:version:{}'
+
+_batched = ContextVar('registry_batched_version_bumps', default=frozenset())
+
+
+def version_cache():
+    """Store for the counters (READ_CACHE_ALIAS), or None when it is not shared by every worker."""
+    return shared_cache(getattr(settings, 'READ_CACHE_ALIAS', 'default'))
+
+
+def _version_key(model):
+    return VERSION_KEY.format(model._meta.label_lower)
+
+
+def _seed():
+    # Counters start from the clock rather than 0 so a cache flush can never
+    # hand out a version (and ETag) that was already issued for other data
+    return time.time_ns()
+
+
+@contextmanager
+def batched_bumps(*models):
+    """Collapses the per-row bumps of `models` inside the block into one at the end."""
+    token = _batched.set(_batched.get() | set(models))
+    try:
+        yield
+    finally:
+        _batched.reset(token)
+    bump_version(*models)
+
+
+def bump_version(*models):
+    """Advances the version counter of each model once the current transaction commits."""
+    models = [model for model in models if model not in _batched.get()]
+    cache = version_cache()
+    if not models or cache is None:
+        return
+
+    def bump():
+        for model in models:
+            key = _version_key(model)
+            cache.add(key, _seed(), timeout=None)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, _seed(), timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def get_versions(models):
+    """Current counter of each model; without a shared store every call returns new versions."""
+    cache = version_cache()
+    if cache is None:
+        return [_seed() for model in models]
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _seed(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def conditional(handler):
+    """
+    Wraps a GET handler of a ConditionalGetMixin view. Versions are read before
+    the data, so a concurrent write can only make the ETag older than the body,
+    never newer.
+    """
+    @wraps(handler)
+    def wrapper(view, request, *args, **kwargs):
+        if version_cache() is None or request.query_params.get('expand'):
+            # Another worker's bump would go unseen, or the expanded objects
+            # belong to models outside version_models: no ETag could be trusted
+            return handler(view, request, *args, **kwargs)
+        etag = view.get_etag(request)
+        response = get_conditional_response(request._request, etag=etag)
+        if response is None and view.cache_reads:
+            # The ETag already names the URL, media type and data versions
+            data = read_cache.get(etag)
+            if data is not None:
+                response = Response(data)
+            else:
+                response = handler(view, request, *args, **kwargs)
+                if response.status_code == 200:
+                    read_cache.set(etag, response.data)
+        elif response is None:
+            response = handler(view, request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+    return wrapper
+
+
+class ConditionalGetMixin:
+    """
+    Strong ETags for list/retrieve built from per-model version counters, so a
+    matching If-None-Match is answered with 304 before the queryset runs.
+
+    `version_models` lists every model the serialized response depends on.
+    Counters are bumped by registry.signals on save, delete and m2m changes;
+    writes that bypass signals (`QuerySet.update`, raw SQL) must call
+    `bump_version` themselves. Views that override `list`/`retrieve` apply
+    the `conditional` decorator instead. With `cache_reads`, response data is
+    also kept in the two-tier read cache under the ETag. Counters live in
+    READ_CACHE_ALIAS; when that cache is process-local on a multi-worker
+    site (see REGISTRY_SINGLE_PROCESS), responses carry no ETag at all.
+    Neither do ?expand= reads, which embed unversioned models such as User.
+    """
+    version_models = ()
+    cache_reads = False
+
+    def get_etag(self, request):
+        # Absolute URI since pagination links in the body carry the host
+        parts = [request.build_absolute_uri(), request.accepted_media_type or '']
+        parts.extend(str(version) for version in get_versions(self.version_models))
+        return '"%s"' % hashlib.sha256('|'.join(parts).encode()).hexdigest()[:32]
+
+    @conditional
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
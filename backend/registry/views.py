@@ -1,29 +1,105 @@
 from rest_framework import viewsets, permissions, filters, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from django.db.models import Avg, Sum
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.parsers import MultiPartParser, FormParser
+from django.db import transaction
+from django.http import HttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import (
     User, Course, Subject, AcademicTask, AttendanceRecord,
     AttendanceEditRequest, MarkBatch, MarkRecord, LeaveRequest, Timetable,
     PortalConnection, Notification, CurriculumEditRequest, SiteSettings,
-    AcademicBatch, BatchCourseCurriculum
+    AcademicBatch, BatchCourseCurriculum, StudentAcademicSummary, HourAssignment
+)
+from .analytics import cohort_analytics
+from .attendance import validate_attendance_rows, upsert_attendance
+from .caching import read_cache
+from .exports import export_mark_sheet, export_attendance_register
+from .instrumentation import metrics
+from .leaves import scope_leaves, overlapping, on_leave as leaves_on
+from .marks import LOCKED_BATCH_STATUSES, validate_mark_rows, upsert_marks, import_mark_sheet
+from .notifications import broadcast_cursor, unread_count, mark_read, mark_all_read, clear_notifications
+from .permissions import IsAcademicLead
+from .profiling import list_profiles, load_profile
+from .provisioning import read_user_file, validate_user_rows, provision_users
+from .search import typeahead
+from .sparse import SparseQuerysetMixin
+from .summary import academic_figures
+from .timetables import (
+    CLASH_POLICIES, TimetableClash, find_clashes, lock_staff, replace_timetables, staff_workload,
+    validate_timetable_rows
 )
 from .serializers import (
     UserSerializer, CourseSerializer, SubjectSerializer, AcademicTaskSerializer,
     AttendanceRecordSerializer, AttendanceEditRequestSerializer, MarkBatchSerializer,
     MarkRecordSerializer, LeaveRequestSerializer, TimetableSerializer,
     PortalConnectionSerializer, NotificationSerializer, CurriculumEditRequestSerializer,
-    SiteSettingsSerializer, AcademicBatchSerializer, BatchCourseCurriculumSerializer
+    SiteSettingsSerializer, AcademicBatchSerializer, BatchCourseCurriculumSerializer,
+    CohortAnalyticsQuerySerializer, ExportQuerySerializer, AttendanceExportQuerySerializer,
+    LeaveCalendarQuerySerializer, OnLeaveQuerySerializer, UserTypeaheadQuerySerializer
 )
+from .versioning import ConditionalGetMixin, conditional
+
+def _bulk_response(total, written, errors, atomic):
+    """Per-row report for the bulk endpoints: `written` maps index -> (status, id), `errors` index -> errors."""
+    results = []
+    for index in range(total):
+        if index in errors:
+            results.append({'index': index, 'status': 'error', 'errors': errors[index]})
+        elif index in written:
+            row_status, record_id = written[index]
+            results.append({'index': index, 'status': row_status, 'id': record_id})
+        else:
+            results.append({'index': index, 'status': 'skipped'})
+
+    statuses = [row['status'] for row in results]
+    return Response({
+        'created': statuses.count('created'),
+        'updated': statuses.count('updated'),
+        'errors': len(errors),
+        'results': results,
+    }, status=status.HTTP_400_BAD_REQUEST if (atomic and errors) else status.HTTP_200_OK)
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [filters.SearchFilter, DjangoFilterBackend]
     filterset_fields = ['role', 'department']
-    search_fields = ['username', 'email', 'name', 'reg_no']
+    # ?search= scans the table; directory typeahead should use the indexed typeahead action
+    search_fields = ['username', 'email', 'first_name', 'last_name', 'reg_no']
+
+    @action(detail=False, methods=['get'])
+    def typeahead(self, request):
+        # Ranked top ?limit= matches for ?q=, optionally scoped by ?role= and ?department=
+        params = UserTypeaheadQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        options = dict(params.validated_data)
+        users = typeahead(options.pop('q'), **options)
+        return Response(self.get_serializer(users, many=True).data)
+
+    @action(detail=False, methods=['post'], permission_classes=[permissions.IsAdminUser])
+    def bulk_provision(self, request):
+        # Creates users from a JSON list or an uploaded .csv/.xlsx/.json `file`; rows without a
+        # password get an unusable one. ?atomic=true creates nothing if any row is invalid.
+        upload = request.FILES.get('file')
+        rows = request.data
+        if upload is not None:
+            try:
+                rows = read_user_file(upload)
+            except ValueError as exc:
+                return Response({'file': [str(exc)]}, status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(rows, list):
+            return Response({'non_field_errors': ['Expected a list of users.']}, status=status.HTTP_400_BAD_REQUEST)
+
+        atomic = request.query_params.get('atomic') in ('1', 'true')
+        valid, errors = validate_user_rows(rows)
+        created = {}
+        if not (atomic and errors):
+            created, conflicts = provision_users(valid, atomic=atomic)
+            errors.update(conflicts)
+        return _bulk_response(len(rows), created, errors, atomic)
 
     @action(detail=False, methods=['get'])
     def me(self, request):
@@ -54,30 +130,20 @@ class UserViewSet(viewsets.ModelViewSet):
         if user.role != 'STUDENT':
             return Response({'error': 'Not a student'}, status=status.HTTP_400_BAD_REQUEST)
         
-        records = user.attendance_records.all()
-        total_records = records.count()
-        present_records = records.filter(is_present=True).count()
-        attendance_pct = (present_records / total_records * 100) if total_records > 0 else 0
-        
-        marks = MarkRecord.objects.filter(student=user)
-        avg_pct = marks.aggregate(Avg('marks'))['marks__avg'] or 0
-        cgpa = (avg_pct / 10) 
-        
-        return Response({
-            'attendance': round(attendance_pct, 2),
-            'cgpa': round(cgpa, 2),
-            'sgpa': round(cgpa, 2),
-            'credits': marks.count() * 3,
-            'greenPoints': round(attendance_pct + (cgpa * 10), 0)
-        })
+        summary = StudentAcademicSummary.objects.filter(user=user).first() or StudentAcademicSummary(user=user)
+        return Response(academic_figures(summary))
 
-class CourseViewSet(viewsets.ModelViewSet):
-    queryset = Course.objects.all()
+class CourseViewSet(ConditionalGetMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
+    version_models = (Course, Subject, Subject.assigned_staff.through)
+    cache_reads = True
+    queryset = Course.objects.prefetch_related('subjects__assigned_staff')
     serializer_class = CourseSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class SubjectViewSet(viewsets.ModelViewSet):
-    queryset = Subject.objects.all()
+class SubjectViewSet(ConditionalGetMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
+    version_models = (Subject, Subject.assigned_staff.through)
+    cache_reads = True
+    queryset = Subject.objects.prefetch_related('assigned_staff')
     serializer_class = SubjectSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_fields = ['course', 'semester']
@@ -90,102 +156,302 @@ class SubjectViewSet(viewsets.ModelViewSet):
         subject.save()
         return Response({'status': 'materials updated'})
 
-class AcademicTaskViewSet(viewsets.ModelViewSet):
-    queryset = AcademicTask.objects.all()
+class AcademicTaskViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
+    queryset = AcademicTask.objects.select_related('staff', 'subject')
     serializer_class = AcademicTaskSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
         user = self.request.user
+        queryset = super().get_queryset()
         if user.role == 'STUDENT':
-            return AcademicTask.objects.filter(department=user.department, study_year=user.study_year)
+            return queryset.filter(department=user.department, study_year=user.study_year)
         elif user.role == 'STAFF':
-            return AcademicTask.objects.filter(staff=user)
-        return AcademicTask.objects.all()
+            return queryset.filter(staff=user)
+        return queryset
 
-class AttendanceRecordViewSet(viewsets.ModelViewSet):
-    queryset = AttendanceRecord.objects.all()
+class AttendanceRecordViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
+    queryset = AttendanceRecord.objects.prefetch_related('hours')
     serializer_class = AttendanceRecordSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_fields = ['user', 'date']
 
     @action(detail=False, methods=['post'])
     def bulk_create(self, request):
-        records_data = request.data # List of records
-        responses = []
-        for data in records_data:
-            serializer = self.get_serializer(data=data)
-            if serializer.is_valid():
-                serializer.save()
-                responses.append(serializer.data)
-            else:
-                responses.append(serializer.errors)
-        return Response(responses)
-
-class AttendanceEditRequestViewSet(viewsets.ModelViewSet):
+        # Validate everything first, then upsert valid rows in one transaction.
+        # ?atomic=true rejects the whole batch if any row is invalid.
+        valid, errors = validate_attendance_rows(request.data)
+        if None in errors:
+            return Response(errors[None], status=status.HTTP_400_BAD_REQUEST)
+
+        atomic = request.query_params.get('atomic') in ('1', 'true')
+        # Unmarked hours of students on approved leave are filled in unless ?fill_leaves=false
+        fill_leaves = request.query_params.get('fill_leaves') not in ('0', 'false')
+        written = {} if (atomic and errors) else upsert_attendance(
+            valid, marked_by=request.user, fill_leaves=fill_leaves
+        )
+        return _bulk_response(len(request.data), written, errors, atomic)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        # Streams one row per HourAttendance; ?file_type=csv|xlsx
+        params = AttendanceExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return export_attendance_register(**params.validated_data)
+
+class AttendanceEditRequestViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = AttendanceEditRequest.objects.all()
     serializer_class = AttendanceEditRequestSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class MarkBatchViewSet(viewsets.ModelViewSet):
-    queryset = MarkBatch.objects.all()
+class MarkBatchViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
+    queryset = MarkBatch.objects.prefetch_related('subjects', 'records')
     serializer_class = MarkBatchSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class MarkRecordViewSet(viewsets.ModelViewSet):
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'export':
+            # The export streams the records itself; prefetching would load the whole batch
+            queryset = queryset.prefetch_related(None)
+        return queryset
+
+    @action(detail=True, methods=['get'])
+    def export(self, request, pk=None):
+        params = ExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return export_mark_sheet(self.get_object(), **params.validated_data)
+
+class MarkRecordViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = MarkRecord.objects.all()
     serializer_class = MarkRecordSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_fields = ['batch', 'student', 'subject']
 
-class LeaveRequestViewSet(viewsets.ModelViewSet):
-    queryset = LeaveRequest.objects.all()
+    def check_batch_open(self, record):
+        # The serializer checks the target batch; a record may not leave or be removed from a locked one either
+        if record.batch.status in LOCKED_BATCH_STATUSES:
+            raise ValidationError({'batch': [f'Mark batch is {record.batch.status.lower()}; marks cannot be changed.']})
+
+    def perform_update(self, serializer):
+        self.check_batch_open(serializer.instance)
+        serializer.save()
+
+    def perform_destroy(self, instance):
+        self.check_batch_open(instance)
+        instance.delete()
+
+    @action(detail=False, methods=['post'])
+    def bulk_upsert(self, request):
+        # Upsert on (batch, student, subject); rows for FROZEN/BLOCKED batches are rejected.
+        # ?atomic=true rejects the whole batch if any row is invalid.
+        if not isinstance(request.data, list):
+            return Response({'non_field_errors': ['Expected a list of records.']}, status=status.HTTP_400_BAD_REQUEST)
+
+        atomic = request.query_params.get('atomic') in ('1', 'true')
+        valid, errors = validate_mark_rows(request.data)
+        written = {} if (atomic and errors) else upsert_marks(valid, updated_by=request.user)
+        return _bulk_response(len(request.data), written, errors, atomic)
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser, FormParser])
+    def import_sheet(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'file': ['No file was submitted.']}, status=status.HTTP_400_BAD_REQUEST)
+
+        atomic = request.data.get('atomic') in ('1', 'true') or request.query_params.get('atomic') in ('1', 'true')
+        try:
+            written, errors = import_mark_sheet(
+                upload, batch_id=request.data.get('batch'), updated_by=request.user, atomic=atomic
+            )
+        except ValueError as exc:
+            return Response({'file': [str(exc)]}, status=status.HTTP_400_BAD_REQUEST)
+
+        total = max([*written, *errors], default=-1) + 1
+        return _bulk_response(total, written, errors, atomic)
+
+class LeaveRequestViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
+    queryset = LeaveRequest.objects.select_related('student')
     serializer_class = LeaveRequestSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        user = self.request.user
-        if user.role == 'STUDENT':
-            return LeaveRequest.objects.filter(student=user)
-        elif user.role in ['STAFF', 'HOD', 'DEAN']:
-            # Staff can see leaves they are mentoring
-            return LeaveRequest.objects.filter(mentor=user) | LeaveRequest.objects.all() # Simplification
-        return LeaveRequest.objects.all()
-
-class TimetableViewSet(viewsets.ModelViewSet):
-    queryset = Timetable.objects.all()
+        return scope_leaves(super().get_queryset(), self.request.user)
+
+    @action(detail=False, methods=['get'])
+    def overlaps(self, request):
+        # Leaves sharing a day with ?date_from=&date_to= (default status APPROVED)
+        params = LeaveCalendarQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data
+        queryset = overlapping(
+            self.get_queryset().filter(status=query['status']), query['date_from'], query['date_to']
+        )
+        return Response(self.get_serializer(self._class_filter(queryset, query), many=True).data)
+
+    @action(detail=False, methods=['get'])
+    def on_leave(self, request):
+        # Approved leaves covering ?date= (and timetable ?hour=)
+        params = OnLeaveQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data
+        queryset = leaves_on(self.get_queryset(), query['date'], query.get('hour'))
+        return Response(self.get_serializer(self._class_filter(queryset, query), many=True).data)
+
+    def _class_filter(self, queryset, query):
+        if query.get('department'):
+            queryset = queryset.filter(student__department=query['department'])
+        if query.get('study_year'):
+            queryset = queryset.filter(student__study_year=query['study_year'])
+        return queryset
+
+class TimetableViewSet(ConditionalGetMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
+    version_models = (Timetable, HourAssignment)
+    queryset = Timetable.objects.prefetch_related('assignments')
     serializer_class = TimetableSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_fields = ['department', 'study_year']
 
-class PortalConnectionViewSet(viewsets.ModelViewSet):
+    def clash_policy(self):
+        # ?on_clash=flag writes double-bookings anyway and reports them under `clashes`
+        policy = self.request.query_params.get('on_clash', 'reject')
+        if policy not in CLASH_POLICIES:
+            raise ValidationError({'on_clash': [f'Expected one of: {", ".join(CLASH_POLICIES)}.']})
+        return policy
+
+    def check_clashes(self, serializer):
+        assignments = serializer.validated_data.get('assignments')
+        if assignments is None:
+            return []
+        lock_staff({assignment['staff'].pk for assignment in assignments})
+        key = (
+            serializer.validated_data.get('department', getattr(serializer.instance, 'department', None)),
+            serializer.validated_data.get('study_year', getattr(serializer.instance, 'study_year', None)),
+        )
+        clashes = find_clashes(
+            ((key, assignment['hour'], assignment['staff'].pk) for assignment in assignments),
+            replacing=[serializer.instance.pk] if serializer.instance else [],
+        )
+        if clashes and self.clash_policy() == 'reject':
+            raise ValidationError({'assignments': clashes})
+        return clashes
+
+    def save_checked(self, serializer):
+        # The staff locks taken by the check are held until the save commits
+        with transaction.atomic():
+            self.clashes = self.check_clashes(serializer)
+            serializer.save()
+
+    def perform_create(self, serializer):
+        self.save_checked(serializer)
+
+    def perform_update(self, serializer):
+        self.save_checked(serializer)
+
+    def report_clashes(self, response):
+        if self.clash_policy() == 'flag':
+            response.data['clashes'] = getattr(self, 'clashes', [])
+        return response
+
+    def create(self, request, *args, **kwargs):
+        return self.report_clashes(super().create(request, *args, **kwargs))
+
+    def update(self, request, *args, **kwargs):
+        return self.report_clashes(super().update(request, *args, **kwargs))
+
+    @action(detail=False, methods=['get'])
+    def workload(self, request):
+        # ?staff=1,2 limits the staff; ?only_clashes=true keeps double-booked staff only
+        staff_ids = [int(pk) for pk in request.query_params.get('staff', '').split(',') if pk.strip().isdigit()]
+        only_clashes = request.query_params.get('only_clashes') in ('1', 'true')
+        return Response(staff_workload(staff_ids, only_clashes=only_clashes))
+
+    @action(detail=False, methods=['post'])
+    def bulk_replace(self, request):
+        # Each row carries the complete assignment list of one class. The
+        # whole payload is written in one transaction, or not at all.
+        on_clash = self.clash_policy()
+        valid, errors = validate_timetable_rows(request.data)
+        if None in errors:
+            return Response(errors[None], status=status.HTTP_400_BAD_REQUEST)
+        if errors:
+            return Response({
+                'errors': len(errors),
+                'results': [{'index': index, 'status': 'error', 'errors': errors[index]} for index in sorted(errors)],
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            written, clashes = replace_timetables(valid, on_clash=on_clash)
+        except TimetableClash as exc:
+            return Response({'clashes': exc.clashes}, status=status.HTTP_409_CONFLICT)
+        timetables = Timetable.objects.filter(
+            id__in=[timetable_id for _, timetable_id in written.values()]
+        ).prefetch_related('assignments')
+        statuses = [row_status for row_status, _ in written.values()]
+        return Response({
+            'created': statuses.count('created'),
+            'updated': statuses.count('updated'),
+            'unchanged': statuses.count('unchanged'),
+            'results': [
+                {'index': index, 'status': row_status, 'id': timetable_id}
+                for index, (row_status, timetable_id) in sorted(written.items())
+            ],
+            'clashes': clashes,
+            'timetables': TimetableSerializer(timetables, many=True).data,
+        })
+
+class PortalConnectionViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = PortalConnection.objects.all()
     serializer_class = PortalConnectionSerializer
     permission_classes = [permissions.IsAdminUser]
 
-class NotificationViewSet(viewsets.ModelViewSet):
+class NotificationViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user) | Notification.objects.filter(user__isnull=True)
+        queryset = super().get_queryset()
+        return queryset.filter(user=self.request.user) | queryset.filter(user__isnull=True)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request is not None and self.request.user.is_authenticated:
+            context['broadcast_read_id'] = broadcast_cursor(self.request.user)
+        return context
+
+    @action(detail=False, methods=['get'])
+    def unread_count(self, request):
+        return Response({'unread': unread_count(request.user)})
+
+    @action(detail=True, methods=['post'])
+    def mark_read(self, request, pk=None):
+        mark_read(request.user, self.get_object())
+        return Response({'unread': unread_count(request.user)})
+
+    @action(detail=False, methods=['post'])
+    def mark_all_read(self, request):
+        mark_all_read(request.user)
+        return Response({'unread': 0})
 
     @action(detail=False, methods=['post'])
     def clear_all(self, request):
-        Notification.objects.filter(user=request.user).delete()
+        clear_notifications(request.user)
         return Response({'status': 'cleared'})
 
-class CurriculumEditRequestViewSet(viewsets.ModelViewSet):
+class CurriculumEditRequestViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = CurriculumEditRequest.objects.all()
     serializer_class = CurriculumEditRequestSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class SiteSettingsViewSet(viewsets.ModelViewSet):
+class SiteSettingsViewSet(ConditionalGetMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
+    version_models = (SiteSettings,)
+    cache_reads = True
     queryset = SiteSettings.objects.all()
     serializer_class = SiteSettingsSerializer
     permission_classes = [permissions.IsAuthenticated]
     
+    @conditional
     def list(self, request, *args, **kwargs):
         # Always return the first/main settings object
         obj = SiteSettings.objects.first()
@@ -194,13 +460,81 @@ class SiteSettingsViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(obj)
         return Response(serializer.data)
 
-class AcademicBatchViewSet(viewsets.ModelViewSet):
-    queryset = AcademicBatch.objects.all()
+class AcademicBatchViewSet(ConditionalGetMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
+    version_models = (AcademicBatch, AcademicBatch.departments.through)
+    queryset = AcademicBatch.objects.prefetch_related('departments')
     serializer_class = AcademicBatchSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class BatchCourseCurriculumViewSet(viewsets.ModelViewSet):
+class BatchCourseCurriculumViewSet(ConditionalGetMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
+    version_models = (BatchCourseCurriculum,)
     queryset = BatchCourseCurriculum.objects.all()
     serializer_class = BatchCourseCurriculumSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_fields = ['batch', 'course']
+
+class AnalyticsViewSet(viewsets.ViewSet):
+    permission_classes = [IsAcademicLead]
+
+    @action(detail=False, methods=['get'])
+    def cohort(self, request):
+        params = CohortAnalyticsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data
+
+        department = query.get('department')
+        if request.user.role == User.Role.HOD:
+            # HODs only see their own department; without one there is nothing to scope to
+            department = request.user.department
+            if not department:
+                raise PermissionDenied('HOD account has no department.')
+
+        return Response(cohort_analytics(
+            department=department,
+            study_year=query.get('study_year'),
+            mark_batch=query.get('batch'),
+            date_from=query.get('date_from'),
+            date_to=query.get('date_to'),
+            attendance_threshold=query['attendance_threshold'],
+            pass_mark=query['pass_mark'],
+            bucket_width=query['bucket_width'],
+        ))
+
+class CacheStatsViewSet(viewsets.ViewSet):
+    permission_classes = [permissions.IsAdminUser]
+
+    def list(self, request):
+        # Counters are per worker process
+        return Response(read_cache.stats())
+
+    @action(detail=False, methods=['post'])
+    def reset(self, request):
+        read_cache.reset_stats()
+        return Response(read_cache.stats())
+
+class MetricsViewSet(viewsets.ViewSet):
+    permission_classes = [permissions.IsAdminUser]
+
+    def list(self, request):
+        # Prometheus text exposition; counters are per worker process
+        return HttpResponse(metrics.export(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+    @action(detail=False, methods=['post'])
+    def reset(self, request):
+        metrics.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class ProfileViewSet(viewsets.ViewSet):
+    # Profiles are files on the worker's disk (PROFILE_DIR), not database rows
+    permission_classes = [permissions.IsAdminUser]
+    lookup_value_regex = r'[0-9T-]+-[0-9a-f]+'
+
+    def list(self, request):
+        return Response(list_profiles())
+
+    def retrieve(self, request, pk=None):
+        profile = load_profile(pk)
+        if profile is None:
+            return Response({'error': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(profile)
+
@@ -1,6 +1,6 @@
 import {
     User, UserRole, UserStatus, MarkBatch, MarkRecord, AttendanceRecord,
-    LeaveRequest, Timetable, AcademicTask, SiteSettings, PortalConnection
+    LeaveRequest, Timetable, AcademicTask, SiteSettings, PortalConnection, CursorPage
 } from '../types/types';
 
 const API_BASE = '/api/registry';
@@ -74,6 +74,34 @@ class BackendApiService {
         return this.request(`${API_BASE}/users/`);
     }
 
+    // Keyset pagination: pass the `next` URL of the previous page to continue
+    static async getUsersPage(pageSize = 100, next?: string | null): Promise<CursorPage<User>> {
+        return this.request(next || `${API_BASE}/users/?page_size=${pageSize}`);
+    }
+
+    // Indexed typeahead: ranked top matches on name, username, email, reg no and staff id
+    static async searchUsers(query: string, role?: UserRole, department?: string, limit = 10): Promise<User[]> {
+        const params = new URLSearchParams({ q: query, limit: String(limit) });
+        if (role) params.append('role', role);
+        if (department) params.append('department', department);
+        return this.request(`${API_BASE}/users/typeahead/?${params}`);
+    }
+
+    // Admin bulk user creation from rows or a .csv/.xlsx/.json file; returns a per-row report
+    static async provisionUsers(users: Partial<User>[] | File, atomic = false): Promise<any> {
+        const url = `${API_BASE}/users/bulk_provision/${atomic ? '?atomic=true' : ''}`;
+        if (users instanceof File) {
+            const body = new FormData();
+            body.append('file', users);
+            const token = this.getStoredToken();
+            const response = await fetch(url, {
+                method: 'POST', body, headers: token ? { 'Authorization': `Bearer ${token}` } : {}
+            });
+            return response.json();
+        }
+        return this.request(url, { method: 'POST', body: JSON.stringify(users) });
+    }
+
     static async getMarkBatches(): Promise<MarkBatch[]> {
         return this.request(`${API_BASE}/mark-batches/`);
     }
@@ -88,6 +116,11 @@ class BackendApiService {
         return this.request(url);
     }
 
+    static async getAttendancePage(pageSize = 100, next?: string | null, date?: string): Promise<CursorPage<AttendanceRecord>> {
+        const query = date ? `&date=${date}` : '';
+        return this.request(next || `${API_BASE}/attendance/?page_size=${pageSize}${query}`);
+    }
+
     static async getLeaveRequests(): Promise<LeaveRequest[]> {
         return this.request(`${API_BASE}/leaves/`);
     }
@@ -107,6 +140,23 @@ class BackendApiService {
         return this.request(`${API_BASE}/tasks/`);
     }
 
+    // One composed payload (profile, tasks, attendance, marks, notifications, ...) for the
+    // caller's dashboard; role: 'student' | 'staff' | 'hod' | 'dean', default the caller's own
+    static async getDashboard(role?: string, department?: string): Promise<any> {
+        const query = department ? `?department=${encodeURIComponent(department)}` : '';
+        return this.request(`${API_BASE}/dashboard/${role ? `${role}/` : ''}${query}`);
+    }
+
+    // Server-push notifications; EventSource cannot set headers so the token goes in the query
+    static openNotificationStream(onEvent: (data: { notification?: any; unread: number }) => void): EventSource {
+        const token = this.getStoredToken();
+        const source = new EventSource(`${API_BASE}/notifications/stream/?access_token=${encodeURIComponent(token || '')}`);
+        const handler = (event: MessageEvent) => onEvent(JSON.parse(event.data));
+        source.addEventListener('unread', handler as EventListener);
+        source.addEventListener('notification', handler as EventListener);
+        return source;
+    }
+
     // ... Add other methods as needed to match ApiService interface
 }
 
@@ -310,3 +310,10 @@ export interface LeaveRequest {
   status: LeaveStatus;
   createdAt: string;
 }
+
+export interface CursorPage<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+  count?: number;
+}